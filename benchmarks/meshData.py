@@ -0,0 +1,35 @@
+import numpy as np
+
+try:
+    from pyqtgraph.opengl import MeshData
+except ImportError:
+    MeshData = None
+
+
+class TimeSuite:
+    param_names = ["Rows"]
+    params = ([100, 300, 1000],)
+
+    def setup(self, rows):
+        if MeshData is None:
+            raise NotImplementedError("pyqtgraph.opengl is not available")
+        sphere = MeshData.sphere(rows, rows)
+        self.vertexes = sphere.vertexes().copy()
+        self.faces = sphere.faces().copy()
+        self.indexed = sphere.vertexes(indexed='faces').copy()
+
+    def time_sphere(self, rows):
+        MeshData.clearPrimitiveCache()
+        MeshData.sphere(rows, rows)
+
+    def time_sphere_cached(self, rows):
+        MeshData.sphere(rows, rows)
+
+    def time_vertexNormals(self, rows):
+        MeshData(vertexes=self.vertexes, faces=self.faces).vertexNormals()
+
+    def time_edges(self, rows):
+        MeshData(vertexes=self.vertexes, faces=self.faces).edges()
+
+    def time_unindexedVertexes(self, rows):
+        MeshData(vertexes=self.indexed).vertexes()
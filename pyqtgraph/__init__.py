@@ -142,6 +142,7 @@ from .graphicsItems.BarGraphItem import *
 from .graphicsItems.BoxplotItem import *
 from .graphicsItems.ButtonItem import *
 from .graphicsItems.ColorBarItem import *
+from .graphicsItems.ContourItem import *
 from .graphicsItems.CurvePoint import *
 from .graphicsItems.DateAxisItem import *
 from .graphicsItems.ErrorBarItem import *
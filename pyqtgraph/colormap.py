@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from collections.abc import Callable, Sequence
 from os import listdir, path
 
@@ -9,6 +10,43 @@ from .Qt import QtCore, QtGui
 __all__ = ['ColorMap']
 
 _mapCache = {}
+_builtinMapNames = None  ## names of the maps in colors/maps, listed on first use
+
+## LRU cache of lookup tables shared by all ColorMaps (and gradients) with identical
+## stops; maps {key: read-only table}. Callers receive copies of the cached tables.
+_lutCache = OrderedDict()
+_lutCacheSize = 64
+
+
+def _cachedLookupTable(key, func):
+    ## Return a copy of the table generated by func() for key, generating it only
+    ## if it is not in the cache yet. Cached tables are read-only since they are
+    ## shared; the copy belongs to the caller.
+    try:
+        _lutCache.move_to_end(key)
+        return _lutCache[key].copy()
+    except KeyError:
+        pass
+    table = func()
+    table.flags.writeable = False
+    _lutCache[key] = table
+    while len(_lutCache) > _lutCacheSize:
+        _lutCache.popitem(last=False)
+    return table.copy()
+
+
+def setLookupTableCacheSize(size):
+    """
+    Set the maximum number of lookup tables kept by the cache used by
+    :func:`ColorMap.getLookupTable() <pyqtgraph.ColorMap.getLookupTable>` and
+    :func:`GradientEditorItem.getLookupTable() <pyqtgraph.GradientEditorItem.getLookupTable>`.
+    A size of 0 disables caching.
+    """
+    global _lutCacheSize
+    _lutCacheSize = max(0, int(size))
+    while len(_lutCache) > _lutCacheSize:
+        _lutCache.popitem(last=False)
+
 
 def listMaps(source=None):
     """
@@ -30,13 +68,16 @@ def listMaps(source=None):
         Known color map names.
     """
     if source is None:
-        pathname = path.join(path.dirname(__file__), 'colors','maps')
-        files = listdir( pathname )
-        list_of_maps = []
-        for filename in files:
-            if filename[-4:] == '.csv' or filename[-4:] == '.hex':
-                list_of_maps.append(filename[:-4])
-        return list_of_maps
+        global _builtinMapNames
+        if _builtinMapNames is None:
+            pathname = path.join(path.dirname(__file__), 'colors','maps')
+            files = listdir( pathname )
+            list_of_maps = []
+            for filename in files:
+                if filename[-4:] == '.csv' or filename[-4:] == '.hex':
+                    list_of_maps.append(filename[:-4])
+            _builtinMapNames = list_of_maps
+        return list(_builtinMapNames)
     elif source.lower() == 'matplotlib':
         try:
             import matplotlib.pyplot as mpl_plt
@@ -89,6 +130,27 @@ def get(name, source=None, skipCache=False):
         return getFromColorcet(name)
     return None
 
+
+def preloadMaps(names=None):
+    """
+    .. warning:: Experimental, subject to change.
+
+    Load locally stored color maps into the cache used by :func:`get`, so that
+    later calls to :func:`get` do not access the file system.
+
+    Parameters
+    ----------
+    names: list of str, optional
+        Names of the maps to load. By default, all maps returned by
+        :func:`listMaps` are loaded.
+    """
+    if names is None:
+        names = listMaps()
+    for name in names:
+        if name not in _mapCache:
+            _getFromFile(name)
+
+
 def _getFromFile(name):
     filename = name
     if filename[0] !='.': # load from built-in directory
@@ -809,13 +871,23 @@ class ColorMap(object):
         if alpha is None:
             alpha = self.usesAlpha()
 
+        if mode == self.QCOLOR:
+            x = np.linspace(start, stop, nPts)
+            return self.map(x, mode)
+
+        ## tables are cached by the content of the map, so that all ColorMaps with the
+        ## same stops share them
+        key = (self.pos.tobytes(), self.pos.dtype.str, self.color.tobytes(), self.color.dtype.str, self.mapping_mode,
+               float(start), float(stop), int(nPts), bool(alpha), mode)
+        return _cachedLookupTable(key, lambda: self._makeLookupTable(start, stop, nPts, alpha, mode))
+
+    def _makeLookupTable(self, start, stop, nPts, alpha, mode):
         x = np.linspace(start, stop, nPts)
         table = self.map(x, mode)
 
-        if not alpha and mode != self.QCOLOR:
-            return table[:,:3]
-        else:
-            return table
+        if not alpha:
+            table = np.ascontiguousarray(table[:,:3])
+        return table
 
     def usesAlpha(self):
         """Returns `True` if any stops have assigned colors with alpha < 255."""
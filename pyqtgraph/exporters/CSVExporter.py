@@ -1,4 +1,5 @@
 import csv
+import functools
 import itertools
 
 import numpy as np
@@ -11,11 +12,13 @@ from .Exporter import Exporter
 translate = QtCore.QCoreApplication.translate
 
 __all__ = ['CSVExporter']
+
     
     
 class CSVExporter(Exporter):
     Name = "CSV of original plot data"
     windows = []
+    blockSize = 100000  ## number of rows formatted and written at once
     def __init__(self, item):
         Exporter.__init__(self, item)
         self.params = Parameter.create(name='params', type='group', children=[
@@ -113,29 +116,121 @@ class CSVExporter(Exporter):
             self.fileSaveDialog(filter=["*.csv", "*.tsv"])
             return
 
+        header, columns = self._collectColumns()
+        self._writeFile(fileName, header, columns)
+
+    def prepareExport(self, fileName):
+        """
+        Copy the data of all curves and return a function that writes it to
+        *fileName*. The returned function does not access the plot, so it may be
+        called from any thread.
+        """
+        if not isinstance(self.item, PlotItem):
+            raise TypeError("Must have a PlotItem selected for CSV export.")
+        header, columns = self._collectColumns()
+        columns = [column.copy() for column in columns]
+        return functools.partial(self._writeFile, fileName, header, columns)
+
+    def _collectColumns(self):
         for item in self.item.items:
             if isinstance(item, ErrorBarItem):
                 self._exportErrorBarItem(item)
             elif hasattr(item, 'implements') and item.implements('plotData'):
                 self._exportPlotDataItem(item)
 
-        sep = "," if self.params['separator'] == 'comma' else "\t"
         # we want to flatten the nested arrays of data into columns
-        columns = [column for dataset in self.data for column in dataset]
+        header = self.header[:]
+        columns = [np.asarray(column) for dataset in self.data for column in dataset]
+        self.header.clear()
+        self.data.clear()
+        return header, columns
+
+    def _writeFile(self, fileName, header, columns):
+        sep = "," if self.params['separator'] == 'comma' else "\t"
         with open(fileName, 'w', newline='') as csvfile:
             writer = csv.writer(csvfile, delimiter=sep, quoting=csv.QUOTE_MINIMAL)
-            writer.writerow(self.header)
-            for row in itertools.zip_longest(*columns, fillvalue=""):
-                row_to_write = [
-                    item if isinstance(item, str) 
-                    else np.format_float_positional(
-                        item, precision=self.params['precision']
-                    )
-                    for item in row
-                ]
-                writer.writerow(row_to_write)
+            writer.writerow(header)
+            ## the fast path formats float64 values; other float types need their own
+            ## shortest representation, e.g. float32(0.1) is written as 0.1
+            if all(column.dtype.kind in 'biu' or column.dtype == np.float64 for column in columns):
+                self._writeColumns(csvfile, columns, sep, writer.dialect.lineterminator)
+            else:
+                self._writeRows(writer, columns)
+
+    def _writeRows(self, writer, columns):
+        ## generic path for columns that are not purely numeric
+        for row in itertools.zip_longest(*columns, fillvalue=""):
+            row_to_write = [
+                item if isinstance(item, str) 
+                else np.format_float_positional(
+                    item, precision=self.params['precision']
+                )
+                for item in row
+            ]
+            writer.writerow(row_to_write)
+
+    def _writeColumns(self, fh, columns, sep, lineEnd):
+        ## Numeric columns are formatted a block of rows at a time with a few string
+        ## formatting operations instead of one call per value; the result is the
+        ## same as that of _writeRows().
+        precision = self.params['precision']
+        lengths = [len(column) for column in columns]
+        nRows = max(lengths, default=0)
+
+        ## blocks also end wherever a column ends, so that every block has a fixed
+        ## set of columns; shorter columns are left empty in the remaining rows
+        stops = sorted(set(range(self.blockSize, nRows, self.blockSize)) | set(lengths))
+        start = 0
+        for stop in stops:
+            if stop <= start:
+                continue
+            active = [column for column, n in zip(columns, lengths) if n >= stop]
+            rowFmt = sep.join('%s' if n >= stop else '' for n in lengths) + lineEnd
+            block = np.empty((stop - start, len(active)), dtype=np.float64)
+            for i, column in enumerate(active):
+                block[:, i] = column[start:stop]
+            fh.write((rowFmt * (stop - start)) % tuple(_formatPositional(block.ravel(), precision)))
+            start = stop
+
+
+def _formatPositional(values, precision):
+    ## Format float64 *values* as np.format_float_positional(value, precision=precision)
+    ## does. Values whose rounding to *precision* decimals converts back to the same
+    ## value are written with their shortest representation (as given by repr());
+    ## other values are written rounded to *precision* decimals, where digits that
+    ## become zero by rounding up are dropped.
+    fmt = '%%.%df\n' % precision
+    fixed = ((fmt * len(values)) % tuple(values.tolist())).split('\n')[:-1]
+    rounded = np.array(fixed, dtype=np.float64)
+    exact = rounded == values
+    out = np.array(fixed, dtype=object)
+
+    idx = np.flatnonzero(exact)
+    if len(idx) > 0:
+        reprs = (('%r\n' * len(idx)) % tuple(values[idx].tolist())).split('\n')[:-1]
+        out[idx] = [_expandExponent(r) if 'e' in r else r.rstrip('0') for r in reprs]
+    if precision == 0:
+        idx = np.flatnonzero(~exact & np.isfinite(values))
+        out[idx] = [s + '.' for s in out[idx]]
+    else:
+        idx = np.flatnonzero(~exact & (np.abs(rounded) > np.abs(values)))
+        out[idx] = [s.rstrip('0') for s in out[idx]]
+    return out.tolist()
+
+
+def _expandExponent(text):
+    ## convert a float repr in exponent notation (such as '1.5e-05') to positional
+    ## notation ('0.000015')
+    mantissa, exp = text.split('e')
+    sign = '-' if mantissa.startswith('-') else ''
+    intPart, _, frac = mantissa.lstrip('-').partition('.')
+    digits = (intPart + frac).rstrip('0') or '0'
+    point = len(intPart) + int(exp)
+    if point <= 0:
+        return sign + '0.' + '0' * -point + digits
+    if point >= len(digits):
+        return sign + digits + '0' * (point - len(digits)) + '.'
+    return sign + digits[:point] + '.' + digits[point:]
 
-        self.header.clear()
-        self.data.clear()
 
 CSVExporter.register()
@@ -1,9 +1,11 @@
+import concurrent.futures
 import os
 import re
 
 from ..GraphicsScene import GraphicsScene
 from ..Qt import QtCore, QtWidgets
 from ..widgets.FileDialog import FileDialog
+from ..widgets.ProgressDialog import ProgressDialog
 
 LastExportDirectory = None
 
@@ -42,6 +44,19 @@ class Exporter(object):
         """
         raise Exception("Abstract method must be overridden in subclass.")
 
+    def prepareExport(self, fileName):
+        """
+        Capture everything needed to export the item to *fileName* and return a
+        function that completes the export without accessing the item, or None if
+        this exporter does not support it.
+
+        This is called from the GUI thread by :func:`exportMany`, which may then call
+        the returned function from a worker thread. The default implementation
+        returns None, in which case :func:`export` is called from the GUI thread
+        instead.
+        """
+        return None
+
     def fileSaveDialog(self, filter=None, opts=None):
         ## Show a file dialog, call self.export(fileName) when finished.
         if opts is None:
@@ -139,3 +154,71 @@ class Exporter(object):
 
     def render(self, painter, targetRect, sourceRect, item=None):
         self.getScene().render(painter, QtCore.QRectF(targetRect), QtCore.QRectF(sourceRect))
+
+
+def exportMany(items, fileNames, exporterClass, workers=None, progress=True, **params):
+    """
+    Export each of *items* to the corresponding file in *fileNames*, using a new
+    instance of *exporterClass* for each item. Any additional keyword arguments
+    are used to set the parameters of each exporter.
+
+    For each item, :func:`Exporter.prepareExport` is called on the GUI thread to
+    capture the item's data or graphics; the slower part of the export (such as
+    rasterizing an image and writing files) then runs in a pool of *workers* threads
+    while the next items are captured. Exporters that do not support this are run
+    on the GUI thread. Progress is reported in a :class:`ProgressDialog
+    <pyqtgraph.ProgressDialog>` unless *progress* is False; if the dialog is
+    canceled, no further items are exported.
+
+    Return the list of file names that were written. If an export fails, the
+    remaining exports are canceled and the exception is raised.
+    """
+    items = list(items)
+    fileNames = [str(f) for f in fileNames]
+    if len(fileNames) != len(items):
+        raise ValueError("Got %d file names for %d items" % (len(fileNames), len(items)))
+
+    exported = [False] * len(items)
+    pending = {}  ## maps {future: item index}
+
+    def collect(dlg, timeout):
+        done, _ = concurrent.futures.wait(pending, timeout=timeout,
+                                          return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            index = pending.pop(future)
+            if future.cancelled():
+                continue
+            future.result()
+            exported[index] = True
+            dlg += 1
+
+    with ProgressDialog("Exporting..", 0, len(items), disable=not progress) as dlg, \
+         concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='Exporter') as pool:
+        try:
+            for index, (item, fileName) in enumerate(zip(items, fileNames)):
+                if dlg.wasCanceled():
+                    break
+                exporter = exporterClass(item)
+                for name, value in params.items():
+                    exporter.parameters()[name] = value
+                job = exporter.prepareExport(fileName)
+                if job is None:
+                    exporter.export(fileName=fileName)
+                    exported[index] = True
+                    dlg += 1
+                else:
+                    pending[pool.submit(job)] = index
+                collect(dlg, timeout=0)
+
+            while len(pending) > 0:
+                if dlg.wasCanceled():
+                    for future in pending:
+                        future.cancel()
+                elif not dlg.disabled:
+                    QtWidgets.QApplication.processEvents()
+                collect(dlg, timeout=0.05)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    return [fileName for fileName, done in zip(fileNames, exported) if done]
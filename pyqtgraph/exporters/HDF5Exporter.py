@@ -2,7 +2,7 @@ import importlib.util
 
 import numpy
 
-from .. import PlotItem
+from .. import ImageItem, ImageView, PlotItem
 from ..parametertree import Parameter
 from ..Qt import QtCore
 from .Exporter import Exporter
@@ -15,6 +15,26 @@ __all__ = ['HDF5Exporter']
 
     
 class HDF5Exporter(Exporter):
+    """
+    Exports the data of a :class:`~pyqtgraph.PlotItem`, :class:`~pyqtgraph.ImageItem`
+    or :class:`~pyqtgraph.ImageView` to an HDF5 file. Requires h5py.
+
+    Plot curves are written as rows of a single 2D dataset according to
+    ``columnMode``, or as one (2, N) dataset per curve in a group if the curves
+    have different lengths. Images are written in their native dtype; for an
+    ImageView the whole image stack is exported, together with its time values.
+
+    ==============  ==================================================================
+    **Parameters:**
+    Name            Name of the dataset (or group) in the file.
+    columnMode      '(x,y) per plot' or '(x,y,y,y) for all plots'.
+    compression     'none', 'gzip' or 'lzf'. Compressed datasets are chunked.
+    append          If True, the data is appended to existing datasets instead of
+                    creating new ones: plot samples are added along the sample axis
+                    and images are added as new frames of a stack. This allows
+                    periodic exports of a streaming plot to the same file.
+    ==============  ==================================================================
+    """
     Name = "HDF5 Export: plot (x,y)"
     windows = []
     allowCopy = False
@@ -25,6 +45,9 @@ class HDF5Exporter(Exporter):
             {'name': 'Name', 'title': translate("Exporter", 'Name'), 'type': 'str', 'value': 'Export', },
             {'name': 'columnMode', 'title': translate("Exporter", 'columnMode'), 'type': 'list',
              'limits': ['(x,y) per plot', '(x,y,y,y) for all plots'], 'value': '(x,y) per plot'},
+            {'name': 'compression', 'title': translate("Exporter", 'compression'), 'type': 'list',
+             'limits': ['none', 'gzip', 'lzf'], 'value': 'none'},
+            {'name': 'append', 'title': translate("Exporter", 'append'), 'type': 'bool', 'value': False},
         ])
         
     def parameters(self):
@@ -37,39 +60,116 @@ class HDF5Exporter(Exporter):
         
         import h5py
 
-        if not isinstance(self.item, PlotItem):
-            raise Exception("Must have a PlotItem selected for HDF5 export.")
+        if not isinstance(self.item, (PlotItem, ImageItem, ImageView)):
+            raise Exception("Must have a PlotItem, ImageItem or ImageView selected for HDF5 export.")
         
         if fileName is None:
             self.fileSaveDialog(filter=["*.h5", "*.hdf", "*.hd5"])
             return
         dsname = self.params['Name']
-        fd = h5py.File(fileName, 'a')  # forces append to file... 'w' doesn't seem to "delete/overwrite"
-        data = []
+        with h5py.File(fileName, 'a') as fd:  # forces append to file... 'w' doesn't seem to "delete/overwrite"
+            if isinstance(self.item, PlotItem):
+                self._exportPlot(fd, dsname)
+            else:
+                self._exportImage(fd, dsname)
 
+    def _exportPlot(self, fd, dsname):
         appendAllX = self.params['columnMode'] == '(x,y) per plot'
+        curves = [c.getData() for c in self.item.curves]
+        curves = [d for d in curves if d[0] is not None]
+        if len(curves) == 0:
+            raise Exception("The selected PlotItem has no data to export.")
+
         # Check if the arrays are ragged
-        len_first = len(self.item.curves[0].getData()[0]) if self.item.curves[0] else None
-        ragged = any(len(i.getData()[0]) != len_first for i in self.item.curves)
+        ragged = any(len(d[0]) != len(curves[0][0]) for d in curves)
 
         if ragged:
-            dgroup = fd.create_group(dsname)
+            dgroup = fd.require_group(dsname)
             for i, c in enumerate(self.item.curves):
                 d = c.getData()
-                fdata = numpy.array([d[0], d[1]]).astype('double')
+                if d[0] is None:
+                    continue
                 cname = c.name() if c.name() is not None else str(i)
-                dgroup.create_dataset(cname, data=fdata)
+                self._writeColumns(dgroup, cname, [d[0], d[1]])
         else:
-            for i, c in enumerate(self.item.curves):
-                d = c.getData()
+            data = []
+            for i, d in enumerate(curves):
                 if appendAllX or i == 0:
                     data.append(d[0])
                 data.append(d[1])
+            self._writeColumns(fd, dsname, data)
+
+    def _exportImage(self, fd, dsname):
+        tVals = None
+        if isinstance(self.item, ImageView):
+            data = self.item.image
+            tAxis = self.item.axes.get('t') if data is not None else None
+            if tAxis is not None:
+                ## frames are stacked along the first axis of the dataset
+                data = numpy.moveaxis(data, tAxis, 0)
+                tVals = self.item.tVals
+        else:
+            data = self.item.image
+            tAxis = None
+        if data is None:
+            raise Exception("The selected item has no image data to export.")
+        data = numpy.asarray(data)
+
+        if tAxis is None:
+            if not self.params['append']:
+                fd.create_dataset(dsname, data=data, **self._datasetOptions(data.shape))
+                return
+            ## appended images are stored as frames of a stack
+            data = data[numpy.newaxis]
+
+        dset, start = self._prepareDataset(fd, dsname, data.shape, data.dtype, axis=0)
+        dset[start:] = data
+        if tVals is not None:
+            tVals = numpy.asarray(tVals)
+            tset, start = self._prepareDataset(fd, dsname + '_t', tVals.shape, tVals.dtype, axis=0)
+            tset[start:] = tVals
+            if start == 0:
+                tset.make_scale('t')
+                dset.dims[0].attach_scale(tset)
+
+    def _writeColumns(self, parent, name, columns):
+        ## Write 1D arrays as the rows of a 2D double dataset. Rows are written
+        ## one at a time, so no stacked copy of the data is created.
+        shape = (len(columns), len(columns[0]))
+        dset, start = self._prepareDataset(parent, name, shape, 'double', axis=1)
+        for i, column in enumerate(columns):
+            dset[i, start:] = column
 
-            fdata = numpy.array(data).astype('double')
-            fd.create_dataset(dsname, data=fdata)
+    def _datasetOptions(self, shape, axis=None):
+        opts = {}
+        if self.params['compression'] != 'none':
+            opts['compression'] = self.params['compression']
+            opts['chunks'] = True
+        if self.params['append'] and axis is not None:
+            opts['maxshape'] = tuple(None if i == axis else n for i, n in enumerate(shape))
+            opts['chunks'] = True
+        if 0 in shape and 'chunks' in opts:
+            ## h5py cannot guess a chunk shape for empty datasets
+            opts['chunks'] = tuple(max(n, 1) for n in shape)
+        return opts
 
-        fd.close()
+    def _prepareDataset(self, parent, name, shape, dtype, axis):
+        ## Return a dataset that can receive data of *shape*, and the index along
+        ## *axis* at which the new data starts. In append mode, an existing
+        ## dataset is extended along *axis*; otherwise a new dataset is created.
+        if self.params['append'] and name in parent:
+            dset = parent[name]
+            otherDims = shape[:axis] + shape[axis+1:]
+            if dset.ndim != len(shape) or dset.shape[:axis] + dset.shape[axis+1:] != otherDims:
+                raise ValueError("Cannot append data with shape %s to dataset '%s' with shape %s."
+                                 % (shape, name, dset.shape))
+            if dset.chunks is None:
+                raise ValueError("Dataset '%s' was not created in append mode and cannot be extended." % name)
+            start = dset.shape[axis]
+            dset.resize(start + shape[axis], axis=axis)
+            return dset, start
+        dset = parent.create_dataset(name, shape=shape, dtype=dtype, **self._datasetOptions(shape, axis))
+        return dset, 0
 
 if HAVE_HDF5:
     HDF5Exporter.register()
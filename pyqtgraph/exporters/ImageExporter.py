@@ -1,4 +1,8 @@
+import functools
+import os
+import struct
 import sys
+import zlib
 
 import numpy as np
 
@@ -58,7 +62,17 @@ class ImageExporter(Exporter):
                 'title': translate("Exporter", 'invertValue'),
                 'type': 'bool',
                 'value': False
-            }
+            },
+            {
+                'name': 'tileSize',
+                'title': translate("Exporter", 'tileSize'),
+                'type': 'int',
+                'value': 0,
+                'limits': (0, None),
+                'tip': "If nonzero, the image is rendered in tiles of this size and "
+                       "streamed to a .png, .tif or .npy file, so that very large "
+                       "images can be exported with bounded memory."
+            },
         ])
         self.params.param('width').sigValueChanged.connect(self.widthChanged)
         self.params.param('height').sigValueChanged.connect(self.heightChanged)
@@ -98,42 +112,22 @@ class ImageExporter(Exporter):
             raise Exception("Cannot export image with size=0 (requested "
                             "export size is %dx%d)" % (w, h))
 
-        targetRect = QtCore.QRect(0, 0, w, h)
-        sourceRect = self.getSourceRect()
+        if self.params['tileSize'] > 0 and fileName is not None and not toBytes and not copy:
+            return self._exportTiled(fileName, w, h, self.params['tileSize'])
 
         self.png = QtGui.QImage(w, h, QtGui.QImage.Format.Format_ARGB32)
         self.png.fill(self.params['background'])
-        
-        ## set resolution of image:
-        origTargetRect = self.getTargetRect()
-        resolutionScale = targetRect.width() / origTargetRect.width()
         #self.png.setDotsPerMeterX(self.png.dotsPerMeterX() * resolutionScale)
         #self.png.setDotsPerMeterY(self.png.dotsPerMeterY() * resolutionScale)
         
         painter = QtGui.QPainter(self.png)
-        #dtr = painter.deviceTransform()
         try:
-            self.setExportMode(True, {
-                'antialias': self.params['antialias'],
-                'background': self.params['background'],
-                'painter': painter,
-                'resolutionScale': resolutionScale})
-            painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing, self.params['antialias'])
-            self.getScene().render(painter, QtCore.QRectF(targetRect), QtCore.QRectF(sourceRect))
+            self._renderScene(painter, w, h)
         finally:
-            self.setExportMode(False)
-        painter.end()
+            painter.end()
         
         if self.params['invertValue']:
-            bg = fn.ndarray_from_qimage(self.png)
-            if sys.byteorder == 'little':
-                cv = slice(0, 3)
-            else:
-                cv = slice(1, 4)
-            mn = bg[...,cv].min(axis=2)
-            mx = bg[...,cv].max(axis=2)
-            d = (255 - mx) - mn
-            bg[...,cv] += d[...,np.newaxis]
+            _invertImage(self.png)
         
         if copy:
             QtWidgets.QApplication.clipboard().setImage(self.png)
@@ -141,5 +135,265 @@ class ImageExporter(Exporter):
             return self.png
         else:
             return self.png.save(fileName)
+
+    def _renderScene(self, painter, w, h):
+        ## paint the exported area of the scene onto *painter* at w x h pixels
+        targetRect = QtCore.QRectF(0, 0, w, h)
+        sourceRect = QtCore.QRectF(self.getSourceRect())
+        ## set resolution of image:
+        resolutionScale = w / self.getTargetRect().width()
+        try:
+            self.setExportMode(True, {
+                'antialias': self.params['antialias'],
+                'background': self.params['background'],
+                'painter': painter,
+                'resolutionScale': resolutionScale})
+            painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing, self.params['antialias'])
+            self.getScene().render(painter, targetRect, sourceRect)
+        finally:
+            self.setExportMode(False)
+
+    def prepareExport(self, fileName):
+        """
+        Record the scene into a QPicture and return a function that rasterizes the
+        picture and saves it to *fileName*. The returned function does not access
+        the scene, so it may be called from any thread.
+
+        Tiled exports are not prepared; None is returned for them.
+        """
+        w = int(self.params['width'])
+        h = int(self.params['height'])
+        if w == 0 or h == 0:
+            raise Exception("Cannot export image with size=0 (requested "
+                            "export size is %dx%d)" % (w, h))
+        if self.params['tileSize'] > 0:
+            return None
+
+        picture = QtGui.QPicture()
+        painter = QtGui.QPainter(picture)
+        try:
+            self._renderScene(painter, w, h)
+        finally:
+            painter.end()
+        background = QtGui.QColor(self.params['background'])
+        return functools.partial(_writePicture, picture, w, h, background,
+                                 self.params['invertValue'], str(fileName))
+
+    def _exportTiled(self, fileName, w, h, tileSize):
+        ext = os.path.splitext(str(fileName))[1].lower()
+        writers = {'.png': _PngWriter, '.tif': _TiffWriter, '.tiff': _TiffWriter, '.npy': _NpyWriter}
+        if ext not in writers:
+            raise ValueError("Tiled export can only write .png, .tif or .npy files "
+                             "(requested %r)" % str(fileName))
+        writer = writers[ext](fileName, w, h)
+        bands = self.renderBands(w, h, tileSize)
+        try:
+            for band in bands:
+                writer.write(band)
+        finally:
+            bands.close()
+            writer.close()
+        return True
+
+    def renderBands(self, width, height, tileSize, padding=16):
+        """
+        Render the exported item at *width* x *height* pixels in tiles of at most
+        *tileSize* x *tileSize* pixels, and yield the image as consecutive bands of
+        rows. Each band is an RGBA ubyte array of shape (rows, width, 4), which is
+        reused for the next band.
+
+        Tiles are rendered with *padding* extra pixels on each side that are then
+        discarded, so that items crossing tile borders are not cut off. Memory use
+        is bounded by the size of a band.
+
+        The result is not guaranteed to be identical to a single image: Qt clips
+        lines at the border of each tile before rasterizing them, which changes the
+        rounding along the clipped lines. Without antialiasing, individual pixels of
+        such lines may be shifted by one pixel; with antialiasing, their color values
+        may differ by a few levels.
+        """
+        sourceRect = self.getSourceRect()
+        origTargetRect = self.getTargetRect()
+        resolutionScale = width / origTargetRect.width()
+        tileSize = int(tileSize)
+        tw = min(tileSize, width) + 2 * padding
+        th = min(tileSize, height) + 2 * padding
+        tile = QtGui.QImage(tw, th, QtGui.QImage.Format.Format_RGBA8888)
+        tileData = fn.ndarray_from_qimage(tile)
+        band = np.empty((min(tileSize, height), width, 4), dtype=np.ubyte)
+
+        try:
+            for y in range(0, height, tileSize):
+                rows = min(tileSize, height - y)
+                for x in range(0, width, tileSize):
+                    cols = min(tileSize, width - x)
+                    tile.fill(self.params['background'])
+                    ## the full image is mapped onto the tile with an integer offset,
+                    ## so that every tile uses exactly the same transform
+                    target = QtCore.QRectF(padding - x, padding - y, width, height)
+                    painter = QtGui.QPainter(tile)
+                    try:
+                        self.setExportMode(True, {
+                            'antialias': self.params['antialias'],
+                            'background': self.params['background'],
+                            'painter': painter,
+                            'resolutionScale': resolutionScale})
+                        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing, self.params['antialias'])
+                        painter.setClipRect(0, 0, tw, th)
+                        self.getScene().render(painter, target, QtCore.QRectF(sourceRect))
+                    finally:
+                        painter.end()
+                    band[:rows, x:x+cols] = tileData[padding:padding+rows, padding:padding+cols]
+                if self.params['invertValue']:
+                    _invertValue(band[:rows, :, :3])
+                yield band[:rows]
+        finally:
+            self.setExportMode(False)
+
+
+def _writePicture(picture, w, h, background, invertValue, fileName):
+    ## rasterize a recorded QPicture and save it; only QImage painting is used
+    ## here, which Qt allows outside of the GUI thread
+    img = QtGui.QImage(w, h, QtGui.QImage.Format.Format_ARGB32)
+    img.fill(background)
+    painter = QtGui.QPainter(img)
+    try:
+        painter.drawPicture(0, 0, picture)
+    finally:
+        painter.end()
+    if invertValue:
+        _invertImage(img)
+    if not img.save(fileName):
+        raise IOError("Could not write image to %r" % fileName)
+
+
+def _invertImage(img):
+    ## invert the value of an ARGB32 QImage in place
+    bg = fn.ndarray_from_qimage(img)
+    if sys.byteorder == 'little':
+        cv = slice(0, 3)
+    else:
+        cv = slice(1, 4)
+    _invertValue(bg[..., cv])
+
+
+def _invertValue(rgb):
+    ## invert the value of colors in place, preserving hue and saturation
+    mn = rgb.min(axis=2)
+    mx = rgb.max(axis=2)
+    d = (255 - mx) - mn
+    rgb += d[..., np.newaxis]
+
+
+class _PngWriter(object):
+    ## Writes an RGBA PNG file one band of rows at a time.
+    def __init__(self, fileName, width, height):
+        self.fh = open(fileName, 'wb')
+        self.width = width
+        self.compressor = zlib.compressobj(6)
+        self.fh.write(b'\x89PNG\r\n\x1a\n')
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+
+    def write(self, band):
+        ## rows are filtered and compressed a few at a time to limit temporary memory;
+        ## each row is stored with the 'Sub' filter (difference to the pixel on the left)
+        pixels = band.reshape(len(band), self.width * 4)
+        for start in range(0, len(pixels), 64):
+            block = pixels[start:start+64]
+            rows = np.empty((len(block), self.width * 4 + 1), dtype=np.ubyte)
+            rows[:, 0] = 1
+            rows[:, 1:5] = block[:, :4]
+            np.subtract(block[:, 4:], block[:, :-4], out=rows[:, 5:])
+            data = self.compressor.compress(rows)
+            if data:
+                self._chunk(b'IDAT', data)
+
+    def close(self):
+        self._chunk(b'IDAT', self.compressor.flush())
+        self._chunk(b'IEND', b'')
+        self.fh.close()
+
+    def _chunk(self, tag, data):
+        self.fh.write(struct.pack('>I', len(data)) + tag + data)
+        self.fh.write(struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+
+
+class _TiffWriter(object):
+    ## Writes an uncompressed RGBA TIFF file, storing each band as one strip.
+    def __init__(self, fileName, width, height):
+        if width * height * 4 > 0xffffffff - 4096:
+            raise ValueError("Image is too large for a TIFF file; use .png or .npy instead.")
+        self.fh = open(fileName, 'wb')
+        self.width = width
+        self.height = height
+        self.strips = []  ## (offset, byteCount)
+        self.rowsPerStrip = None
+        self.fh.write(b'II*\x00\x00\x00\x00\x00')  ## IFD offset is written on close
+
+    def write(self, band):
+        if self.rowsPerStrip is None:
+            self.rowsPerStrip = len(band)
+        data = np.ascontiguousarray(band).tobytes()
+        self.strips.append((self.fh.tell(), len(data)))
+        self.fh.write(data)
+
+    def close(self):
+        fh = self.fh
+        nStrips = len(self.strips)
+        ## values that do not fit into a tag are stored ahead of the IFD
+        bitsOffset = fh.tell()
+        fh.write(struct.pack('<4H', 8, 8, 8, 8))
+        offsetsOffset = fh.tell()
+        fh.write(struct.pack('<%dI' % nStrips, *[s[0] for s in self.strips]))
+        countsOffset = fh.tell()
+        fh.write(struct.pack('<%dI' % nStrips, *[s[1] for s in self.strips]))
+        if fh.tell() % 2:
+            fh.write(b'\x00')
+        ifdOffset = fh.tell()
+
+        SHORT, LONG = 3, 4
+        def stripTag(tag, offset, index):
+            if nStrips == 1:
+                return (tag, LONG, 1, self.strips[0][index])
+            return (tag, LONG, nStrips, offset)
+        tags = [
+            (256, LONG, 1, self.width),         ## ImageWidth
+            (257, LONG, 1, self.height),        ## ImageLength
+            (258, SHORT, 4, bitsOffset),        ## BitsPerSample
+            (259, SHORT, 1, 1),                 ## Compression: none
+            (262, SHORT, 1, 2),                 ## PhotometricInterpretation: RGB
+            stripTag(273, offsetsOffset, 0),    ## StripOffsets
+            (277, SHORT, 1, 4),                 ## SamplesPerPixel
+            (278, LONG, 1, self.rowsPerStrip or self.height),  ## RowsPerStrip
+            stripTag(279, countsOffset, 1),     ## StripByteCounts
+            (284, SHORT, 1, 1),                 ## PlanarConfiguration: contiguous
+            (338, SHORT, 1, 2),                 ## ExtraSamples: unassociated alpha
+        ]
+        fh.write(struct.pack('<H', len(tags)))
+        for tag, typ, count, value in tags:
+            if typ == SHORT and count == 1:
+                fh.write(struct.pack('<HHIHH', tag, typ, count, value, 0))
+            else:
+                fh.write(struct.pack('<HHII', tag, typ, count, value))
+        fh.write(struct.pack('<I', 0))
+        fh.seek(4)
+        fh.write(struct.pack('<I', ifdOffset))
+        fh.close()
+
+
+class _NpyWriter(object):
+    ## Writes the image to a memory-mapped .npy file of shape (height, width, 4).
+    def __init__(self, fileName, width, height):
+        self.out = np.lib.format.open_memmap(fileName, mode='w+', dtype=np.ubyte, shape=(height, width, 4))
+        self.row = 0
+
+    def write(self, band):
+        self.out[self.row:self.row+len(band)] = band
+        self.row += len(band)
+
+    def close(self):
+        self.out.flush()
+        del self.out
+
         
 ImageExporter.register()
@@ -0,0 +1,155 @@
+import functools
+import json
+import os
+import zipfile
+
+import numpy as np
+
+from .. import PlotItem
+from ..parametertree import Parameter
+from ..Qt import QtCore
+from .Exporter import Exporter
+
+translate = QtCore.QCoreApplication.translate
+
+__all__ = ['NumpyExporter']
+
+
+class NumpyExporter(Exporter):
+    """
+    Exports the original data of all curves in a :class:`~pyqtgraph.PlotItem` in
+    numpy's binary format.
+
+    The x and y arrays of each curve are written in their native dtype, without
+    being converted or stacked together. With the 'npz' format, all arrays are
+    stored in a single uncompressed (or optionally compressed) ``.npz`` archive.
+    With the 'npy' format, *fileName* is a directory which receives one ``.npy``
+    file per array; these files are written through memory maps and can be loaded
+    with ``numpy.load(..., mmap_mode='r')``.
+
+    Arrays are named ``<key>_x`` and ``<key>_y``, where *key* is derived from the
+    curve name (or ``curveNNNN`` for unnamed curves). A JSON description of the
+    curves, including their names and the parameters stored in
+    ``PlotItem.itemMeta``, is saved as the ``metadata`` entry of the archive, or as
+    ``metadata.json`` in the directory. It can be read with
+    ``json.loads(str(npz['metadata']))``; no pickled objects are written.
+    """
+    Name = "Numpy binary: plot (x,y)"
+    windows = []
+    allowCopy = False
+
+    def __init__(self, item):
+        Exporter.__init__(self, item)
+        self.params = Parameter.create(name='params', type='group', children=[
+            {'name': 'format', 'title': translate("Exporter", 'format'), 'type': 'list',
+             'limits': ['npz', 'npy'], 'value': 'npz'},
+            {'name': 'compress', 'title': translate("Exporter", 'compress'), 'type': 'bool',
+             'value': False},
+        ])
+
+    def parameters(self):
+        return self.params
+
+    def export(self, fileName=None):
+        if not isinstance(self.item, PlotItem):
+            raise TypeError("Must have a PlotItem selected for numpy export.")
+
+        if fileName is None:
+            if self.params['format'] == 'npz':
+                self.fileSaveDialog(filter=["*.npz"])
+            else:
+                self.fileSaveDialog()
+            return
+
+        arrays, metadata = self._collectData()
+        if self.params['format'] == 'npz':
+            self._writeNpz(fileName, arrays, metadata)
+        else:
+            self._writeNpy(fileName, arrays, metadata)
+
+    def prepareExport(self, fileName):
+        """
+        Copy the data of all curves and return a function that writes it to
+        *fileName*. The returned function does not access the plot, so it may be
+        called from any thread.
+        """
+        if not isinstance(self.item, PlotItem):
+            raise TypeError("Must have a PlotItem selected for numpy export.")
+        arrays, metadata = self._collectData()
+        arrays = [(name, data.copy()) for name, data in arrays]
+        if self.params['format'] == 'npz':
+            return functools.partial(self._writeNpz, fileName, arrays, metadata)
+        return functools.partial(self._writeNpy, fileName, arrays, metadata)
+
+    def _collectData(self):
+        ## Returns a list of (name, array) and a JSON-serializable description of
+        ## all curves. Arrays are not copied.
+        arrays = []
+        curves = []
+        keys = set(['metadata'])
+        for index, item in enumerate(self.item.dataItems):
+            if hasattr(item, 'getOriginalDataset'):
+                x, y = item.getOriginalDataset()
+            else:
+                x, y = item.getData()
+            if y is None:
+                continue
+            name = item.name()
+            key = self._arrayKey(name, index)
+            while key in keys:
+                key = key + '_'
+            keys.add(key)
+
+            curve = {'key': key, 'name': name, 'index': index}
+            for axis, data in (('x', x), ('y', y)):
+                if data is None:
+                    continue
+                data = np.asarray(data)
+                arrays.append((key + '_' + axis, data))
+                curve[axis] = {'dtype': data.dtype.str, 'shape': list(data.shape)}
+            curve['meta'] = self._itemMeta(item)
+            curves.append(curve)
+        return arrays, {'curves': curves}
+
+    @staticmethod
+    def _arrayKey(name, index):
+        if name is None:
+            return 'curve%04d' % index
+        key = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in str(name))
+        return key.strip('.') or 'curve%04d' % index
+
+    def _itemMeta(self, item):
+        meta = {}
+        for k, v in self.item.itemMeta.get(item, {}).items():
+            if isinstance(k, tuple):
+                k = '.'.join(map(str, k))
+            meta[str(k)] = v
+        ## round-trip so that values json cannot represent become strings
+        return json.loads(json.dumps(meta, default=str))
+
+    def _writeNpz(self, fileName, arrays, metadata):
+        compression = zipfile.ZIP_DEFLATED if self.params['compress'] else zipfile.ZIP_STORED
+        with zipfile.ZipFile(fileName, mode='w', compression=compression, allowZip64=True) as zf:
+            for name, data in arrays:
+                ## arrays are streamed into the archive without an intermediate copy
+                with zf.open(name + '.npy', mode='w', force_zip64=True) as fh:
+                    np.lib.format.write_array(fh, data, allow_pickle=False)
+            with zf.open('metadata.npy', mode='w') as fh:
+                np.lib.format.write_array(fh, np.array(json.dumps(metadata)), allow_pickle=False)
+
+    def _writeNpy(self, dirName, arrays, metadata):
+        os.makedirs(dirName, exist_ok=True)
+        for name, data in arrays:
+            fileName = os.path.join(dirName, name + '.npy')
+            if data.size == 0:
+                np.save(fileName, data, allow_pickle=False)
+                continue
+            out = np.lib.format.open_memmap(fileName, mode='w+', dtype=data.dtype, shape=data.shape)
+            out[...] = data
+            out.flush()
+            del out
+        with open(os.path.join(dirName, 'metadata.json'), 'w') as fh:
+            json.dump(metadata, fh)
+
+
+NumpyExporter.register()
@@ -0,0 +1,206 @@
+from .. import functions as fn
+from .. import getConfigOption, mkQApp
+from ..graphicsItems.GraphicsLayout import GraphicsLayout
+from ..Qt import QtCore, QtGui
+from ..widgets.GraphicsView import GraphicsView
+
+__all__ = ['PlotRenderer', 'renderMany']
+
+
+class PlotRenderer(object):
+    """
+    Renders plots to images without creating any widget.
+
+    The renderer owns a :class:`GraphicsView <pyqtgraph.GraphicsView>` that is never
+    shown, containing a single :class:`~pyqtgraph.GraphicsLayout` that is filled in once by
+    a *template* function. Each render only rebinds new data to the existing items
+    and paints the scene into a reused QImage, so that rendering many plots of the
+    same kind avoids the cost of creating widgets, items and layouts for each of
+    them::
+
+        def template(layout):
+            plt = layout.addPlot(title='Signal')
+            curve = plt.plot(pen='y')
+            return curve.setData
+
+        renderer = PlotRenderer(template, size=(800, 600))
+        for data in datasets:
+            rgba = renderer.render(data)
+            renderer.renderToFile('plot.png')
+
+    The template is called with the layout and returns a function that is called
+    with the data passed to :func:`render`. It may return None if data is bound
+    some other way.
+
+    A QApplication is created if none exists yet. On machines without a display,
+    use the ``offscreen`` Qt platform (set ``QT_QPA_PLATFORM=offscreen``).
+
+    ==============  ================================================================
+    **Arguments:**
+    template        Function ``template(layout)`` that adds items to the layout and
+                    returns a data binding function (or None).
+    size            (width, height) of the rendered images in pixels.
+    background      Background color; any argument accepted by
+                    :func:`mkColor <pyqtgraph.mkColor>`. By default, the
+                    ``background`` :ref:`configuration option <apiref_config>` is
+                    used.
+    antialias       If True, the scene is rendered with antialiasing.
+    ==============  ================================================================
+    """
+    def __init__(self, template=None, size=(640, 480), background='default', antialias=True):
+        mkQApp()
+        ## items such as axes need a view to map their coordinates to pixels,
+        ## so the scene is attached to a view that is never shown
+        self.view = GraphicsView(background=None)
+        self.scene = self.view.scene()
+        self.layout = GraphicsLayout()
+        self.view.setCentralItem(self.layout)
+        self.antialias = antialias
+        self.setBackground(background)
+        self._image = None
+        self._array = None
+        self.setSize(*size)
+        self.binder = None if template is None else template(self.layout)
+
+    def setSize(self, width, height):
+        """Set the size of the rendered images in pixels."""
+        width, height = int(width), int(height)
+        if width <= 0 or height <= 0:
+            raise ValueError("Cannot render image with size=0 (requested %dx%d)" % (width, height))
+        self.size = (width, height)
+        oldSize = self.view.size()
+        self.view.resize(width, height)
+        ## the view is not shown, so it does not receive resize events
+        self.view.resizeEvent(QtGui.QResizeEvent(QtCore.QSize(width, height), oldSize))
+        self._image = QtGui.QImage(width, height, QtGui.QImage.Format.Format_RGBA8888)
+        ## the array is a view of the image buffer; the image must be kept alive with it
+        self._array = fn.ndarray_from_qimage(self._image)
+
+    def setBackground(self, background):
+        """Set the background color of the rendered images."""
+        if isinstance(background, str) and background == 'default':
+            background = getConfigOption('background')
+        self.background = fn.mkColor(background)
+
+    def setData(self, *args, **kwargs):
+        """Pass all arguments to the data binding function returned by the template."""
+        if self.binder is None:
+            raise TypeError("This renderer's template did not return a data binding function.")
+        self.binder(*args, **kwargs)
+
+    def render(self, data=None, copy=True):
+        """
+        Render the scene and return it as an RGBA ubyte array of shape (height, width, 4).
+
+        If *data* is given, it is first passed to :func:`setData`. If *copy* is False,
+        the returned array is a view of the internal image, which is overwritten by
+        the next render.
+        """
+        self._render(data)
+        return self._array.copy() if copy else self._array
+
+    def renderToImage(self, data=None):
+        """Render the scene and return a copy of the resulting QImage."""
+        self._render(data)
+        return self._image.copy()
+
+    def renderToBytes(self, data=None, format='PNG'):
+        """Render the scene and return the image encoded in *format*, as bytes."""
+        self._render(data)
+        buf = QtCore.QBuffer()
+        buf.open(QtCore.QIODevice.OpenModeFlag.WriteOnly)
+        if not self._image.save(buf, format):
+            raise ValueError("Could not encode image as %r" % format)
+        return bytes(buf.data())
+
+    def renderToFile(self, fileName, data=None):
+        """Render the scene and save it to *fileName*. The image format is determined
+        by the file extension."""
+        self._render(data)
+        if not self._image.save(str(fileName)):
+            raise IOError("Could not write image to %r" % str(fileName))
+
+    def _render(self, data):
+        if data is not None:
+            self.setData(data)
+        ## no event loop is running, so pending layout requests of the layout and
+        ## its nested items are delivered explicitly before painting
+        QtCore.QCoreApplication.sendPostedEvents(None, QtCore.QEvent.Type.LayoutRequest)
+        self.layout.layout.activate()
+        width, height = self.size
+        rect = QtCore.QRectF(0, 0, width, height)
+        self._image.fill(self.background)
+        painter = QtGui.QPainter(self._image)
+        try:
+            painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing, self.antialias)
+            self.scene.render(painter, rect, rect)
+        finally:
+            painter.end()
+
+
+## renderers created in this process by _renderTask, keyed by template and options
+_renderers = {}
+
+
+def _renderTask(task):
+    key, data, fileName = task
+    renderer = _renderers.get(key)
+    if renderer is None:
+        template, size, background, antialias = key
+        renderer = PlotRenderer(template, size=size, background=background, antialias=antialias)
+        _renderers[key] = renderer
+    if fileName is None:
+        return renderer.render(data)
+    renderer.renderToFile(fileName, data)
+    return fileName
+
+
+def renderMany(template, datasets, fileNames=None, size=(640, 480), background='default',
+               antialias=True, workers=None, pool=None, chunkSize=None):
+    """
+    Render one image for each item of *datasets* using a :class:`PlotRenderer`
+    built from *template*.
+
+    If *fileNames* is given, each image is saved to the corresponding file and the
+    list of file names is returned; otherwise a list of RGBA arrays is returned.
+
+    Images are rendered in this process unless *workers* or *pool* is given. With
+    *workers*, a :class:`WorkerPool <pyqtgraph.multiprocess.WorkerPool>` with that
+    many processes is used for this call only. With *pool*, the given pool is used;
+    each of its workers keeps its renderers between calls, so that a long-lived pool
+    pays the cost of building the plot only once per worker. Because tasks are sent
+    to the workers by pickling, *template* must then be defined at module level, and
+    the data and *background* must be picklable.
+    """
+    datasets = list(datasets)
+    if fileNames is None:
+        fileNames = [None] * len(datasets)
+    else:
+        fileNames = [None if f is None else str(f) for f in fileNames]
+        if len(fileNames) != len(datasets):
+            raise ValueError("Got %d file names for %d datasets" % (len(fileNames), len(datasets)))
+    size = (int(size[0]), int(size[1]))
+    ## the options are used as a dictionary key in the workers
+    if isinstance(background, QtGui.QColor):
+        background = background.getRgb()
+    elif isinstance(background, list):
+        background = tuple(background)
+
+    if pool is None and workers is None:
+        renderer = PlotRenderer(template, size=size, background=background, antialias=antialias)
+        results = []
+        for data, fileName in zip(datasets, fileNames):
+            if fileName is None:
+                results.append(renderer.render(data))
+            else:
+                renderer.renderToFile(fileName, data)
+                results.append(fileName)
+        return results
+
+    key = (template, size, background, antialias)
+    tasks = [(key, data, fileName) for data, fileName in zip(datasets, fileNames)]
+    if pool is not None:
+        return pool.map(_renderTask, tasks, chunkSize=chunkSize)
+    from ..multiprocess import WorkerPool
+    with WorkerPool(workers=workers) as ownPool:
+        return ownPool.map(_renderTask, tasks, chunkSize=chunkSize)
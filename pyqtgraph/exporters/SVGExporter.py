@@ -59,6 +59,32 @@ class SVGExporter(Exporter):
                        "they appear the same width on screen regardless of "
                        "how they are scaled or how the view is zoomed."
             },
+            {
+                'name': 'decimate',
+                'title': translate("Exporter", 'decimate'),
+                'type': 'bool',
+                'value': False,
+                'tip': "If True, curves are reduced to the points needed to draw "
+                       "them at the export resolution before they are written."
+            },
+            {
+                'name': 'tolerance',
+                'title': translate("Exporter", 'tolerance'),
+                'type': 'float',
+                'value': 0.1,
+                'limits': (0, None),
+                'suffix': 'px',
+                'tip': "Maximum distance, in pixels, by which decimated curves "
+                       "may deviate from the original data."
+            },
+            {
+                'name': 'compact',
+                'title': translate("Exporter", 'compact'),
+                'type': 'bool',
+                'value': False,
+                'tip': "If True, the XML is written without indentation and "
+                       "coordinates are rounded to 1/1000 pixel."
+            },
         ])
         self.params.param('width').sigValueChanged.connect(self.widthChanged)
         self.params.param('height').sigValueChanged.connect(self.heightChanged)
@@ -132,15 +158,16 @@ def generateSvg(item, options=None):
             if hasattr(i, 'setExportMode'):
                 i.setExportMode(False)
     cleanXml(node)
-    
-    defsXml = "<defs>\n"
-    for d in defs:
-        defsXml += d.toprettyxml(indent='    ')
-    defsXml += "</defs>\n"
+
+    if options.get('compact', False):
+        toXml = lambda n: n.toxml()
+    else:
+        toXml = lambda n: n.toprettyxml(indent='    ')
+    defsXml = "<defs>\n" + "".join(toXml(d) for d in defs) + "</defs>\n"
     svgAttributes = f' viewBox ="0 0 {int(options["width"])} {int(options["height"])}"'
     c = options['background']
     backgroundtag = f'<rect width="100%" height="100%" fill="{c.name()}" fill-opacity="{c.alphaF()}" />\n'
-    return (xmlHeader % svgAttributes) + backgroundtag + defsXml + node.toprettyxml(indent='    ') + "\n</svg>\n"
+    return (xmlHeader % svgAttributes) + backgroundtag + defsXml + toXml(node) + "\n</svg>\n"
 
 def _generateItemSvg(item, nodes=None, root=None, options=None):
     """This function is intended to work around some issues with Qt's SVG generator
@@ -258,7 +285,11 @@ def _generateItemSvg(item, nodes=None, root=None, options=None):
         p = QtGui.QPainter()
         p.begin(svg)
         if hasattr(item, 'setExportMode'):
-            item.setExportMode(True, {'painter': p})
+            item.setExportMode(True, {
+                'painter': p,
+                'decimate': options.get('decimate', False),
+                'tolerance': options.get('tolerance', 0.1),
+            })
         try:
             p.setTransform(tr)
             opt = QtWidgets.QStyleOptionGraphicsItem()
@@ -399,6 +430,9 @@ def correctCoordinates(node, defs, item, options):
         node.removeChild(grp)
     groups = groups2
 
+    ## compact output rounds coordinates to 1/1000 of the output resolution
+    digits = 3 if options.get('compact', False) else None
+
     for grp in groups:
         matrix = grp.getAttribute('transform')
         match = re.match(r'matrix\((.*)\)', matrix)
@@ -414,24 +448,33 @@ def correctCoordinates(node, defs, item, options):
                 continue
             if ch.tagName == 'polyline':
                 removeTransform = True
-                coords = np.array([[float(a) for a in c.split(',')] for c in ch.getAttribute('points').strip().split(' ')])
-                coords = fn.transformCoordinates(tr, coords, transpose=True)
-                ch.setAttribute('points', ' '.join([','.join([str(a) for a in c]) for c in coords]))
+                points = ch.getAttribute('points').strip().replace(',', ' ').split()
+                coords = np.array(points, dtype=float).reshape(-1, 2)
+                coords = _formatCoords(fn.transformCoordinates(tr, coords, transpose=True), digits)
+                ch.setAttribute('points', ' '.join([f'{x},{y}' for x, y in coords]))
             elif ch.tagName == 'path':
                 removeTransform = True
-                newCoords = ''
                 oldCoords = ch.getAttribute('d').strip()
                 if oldCoords == '':
                     continue
-                for c in oldCoords.split(' '):
-                    x,y = c.split(',')
-                    if x[0].isalpha():
-                        t = x[0]
-                        x = x[1:]
+                ## transform all coordinates at once; commands are kept as prefixes
+                tokens = oldCoords.split()
+                cmds = []
+                points = []
+                for c in tokens:
+                    if c[0].isalpha():
+                        cmds.append(c[0])
+                        c = c[1:]
                     else:
-                        t = ''
-                    nc = fn.transformCoordinates(tr, np.array([[float(x),float(y)]]), transpose=True)
-                    newCoords += t+str(nc[0,0])+','+str(nc[0,1])+' '
+                        cmds.append('')
+                    if c != '':  ## commands such as Z have no coordinates
+                        points.extend(c.split(','))
+                coords = np.array(points, dtype=float).reshape(-1, 2)
+                coords = iter(_formatCoords(fn.transformCoordinates(tr, coords, transpose=True), digits))
+                newCoords = ''.join([
+                    t + ' ' if len(c) == len(t) else '%s%s,%s ' % ((t,) + tuple(next(coords)))
+                    for t, c in zip(cmds, tokens)
+                ])
                 # If coords start with L instead of M, then the entire path will not be rendered.
                 # (This can happen if the first point had nan values in it--Qt will skip it on export)
                 if newCoords[0] != 'M':
@@ -478,6 +521,14 @@ def correctCoordinates(node, defs, item, options):
             grp.removeAttribute('transform')
 
 
+def _formatCoords(coords, digits=None):
+    ## Return transformed coordinates as nested lists of python floats (which
+    ## format as the shortest repr), optionally rounded to *digits* decimals.
+    if digits is not None:
+        coords = np.round(coords, digits) + 0.0  ## +0.0 turns -0.0 into 0.0
+    return coords.tolist()
+
+
 SVGExporter.register()        
 
 
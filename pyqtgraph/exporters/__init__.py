@@ -1,8 +1,10 @@
 from .CSVExporter import *
-from .Exporter import Exporter
+from .Exporter import Exporter, exportMany
 from .HDF5Exporter import *
 from .ImageExporter import *
 from .Matplotlib import *
+from .NumpyExporter import *
+from .PlotRenderer import *
 from .PrintExporter import *
 from .SVGExporter import *
 
@@ -1,8 +1,11 @@
 __init__ = ["Flowchart", "FlowchartGraphicsItem", "FlowchartNode"]
 
+import heapq
 import importlib
 import os
+import time
 from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 from numpy import ndarray
 
@@ -25,6 +28,8 @@ def strDict(d):
 
 
 class Flowchart(Node):
+    supportsChunks = True
+    
     sigFileLoaded = QtCore.Signal(object)
     sigFileSaved = QtCore.Signal(object)
     
@@ -53,6 +58,9 @@ class Flowchart(Node):
         self._widget = None
         self._scene = None
         self.processing = False ## flag that prevents recursive node updates
+        self._processOpts = {'cache': False, 'workers': 1}
+        self._processCache = {}   ## {node: ((version, bypassed, args), result)}; see setProcessOptions
+        self._processPool = None
         
         self.widget()
         
@@ -193,6 +201,8 @@ class Flowchart(Node):
         node.sigClosed.connect(self.nodeClosed)
         node.sigRenamed.connect(self.nodeRenamed)
         node.sigOutputChanged.connect(self.nodeOutputChanged)
+        if self._profiling and not node.isProfiling():
+            node.setProfiling(True, self._profileBadge)
         self.sigChartChanged.emit(self, 'add', node)
         
     def removeNode(self, node):
@@ -202,6 +212,7 @@ class Flowchart(Node):
         
     def nodeClosed(self, node):
         del self._nodes[node.name()]
+        self._processCache.pop(node, None)
         self.widget().removeNode(node)
         for signal, slot in [('sigClosed', self.nodeClosed),
                              ('sigRenamed', self.nodeRenamed),
@@ -238,6 +249,56 @@ class Flowchart(Node):
         term2 = self.internalTerminal(term2)
         term1.connectTo(term2)
         
+    def setProcessOptions(self, cache=None, workers=None):
+        """
+        Set options that determine how :func:`process() <pyqtgraph.flowchart.Flowchart.process>`
+        executes the nodes in this flowchart.
+        
+        ==============  ============================================================
+        **Arguments:**
+        cache           bool; if True, the output of each node is remembered
+                        together with the input values it was computed from. On the
+                        next call to process(), a node whose inputs are the same
+                        objects (or equal scalars) and that has not been updated in
+                        the meantime returns its remembered output instead of
+                        processing again, so branches of the chart that do not
+                        depend on a changed input are skipped. Arrays modified
+                        in-place are not detected; call
+                        :func:`clearProcessCache() <pyqtgraph.flowchart.Flowchart.clearProcessCache>`
+                        after doing so. Note that the cache keeps the last output of
+                        every node alive.
+        workers         int; number of threads used to process nodes. With more than
+                        one worker, nodes whose inputs are ready are processed
+                        concurrently, so independent branches of the chart run in
+                        parallel. This only speeds up nodes that release the GIL
+                        (most numpy and scipy operations do). Only nodes whose class
+                        sets ``threadSafe = True`` are processed in worker threads;
+                        all other nodes, including nodes that read their control
+                        widgets, are processed in the calling thread.
+        ==============  ============================================================
+        
+        By default, results are not cached and nodes are processed one at a time in
+        the calling thread.
+        """
+        if cache is not None:
+            self._processOpts['cache'] = cache
+            if not cache:
+                self.clearProcessCache()
+        if workers is not None:
+            workers = max(1, int(workers))
+            if workers != self._processOpts['workers'] and self._processPool is not None:
+                self._processPool.shutdown(wait=True)
+                self._processPool = None
+            self._processOpts['workers'] = workers
+    
+    def processOptions(self):
+        """Return a dict of the options set by setProcessOptions()."""
+        return dict(self._processOpts)
+    
+    def clearProcessCache(self):
+        """Discard all node outputs cached by process()."""
+        self._processCache = {}
+    
     def process(self, **args):
         """
         Process data through the flowchart, returning the output.
@@ -245,7 +306,94 @@ class Flowchart(Node):
         Keyword arguments must be the names of input terminals. 
         The return value is a dict with one key per output terminal.
         
+        See :func:`setProcessOptions() <pyqtgraph.flowchart.Flowchart.setProcessOptions>`
+        for caching of node outputs and parallel processing of independent nodes.
+        """
+        return self._process(args, chunked=False)
+    
+    def processChunk(self, **args):
+        """
+        Process one chunk of a data stream through the flowchart, returning the
+        output generated for this chunk.
+        
+        Arguments and return value are the same as for
+        :func:`process() <pyqtgraph.flowchart.Flowchart.process>`, but each input
+        holds only the next part of the data and nodes are processed with
+        :func:`Node.processChunk() <pyqtgraph.flowchart.Node.processChunk>`, so
+        filters carry their state over from the previous chunk. Only temporary
+        arrays the size of a chunk are allocated, which makes it possible to process
+        recordings too large to hold in memory several times, or live data as it is
+        acquired.
+        
+        All nodes that are not bypassed must support chunked processing. Call
+        :func:`resetChunks() <pyqtgraph.flowchart.Flowchart.resetChunks>` before
+        starting a new stream, or use
+        :func:`processStream() <pyqtgraph.flowchart.Flowchart.processStream>`.
+        Nodes with a sliding window emit their output delayed by part of the window
+        length, so an output chunk may be shorter than its input chunk. The delayed
+        output is emitted when the last chunk of the stream is processed with
+        :func:`processLastChunk() <pyqtgraph.flowchart.Flowchart.processLastChunk>`.
+        """
+        return self._process(args, chunked=True)
+    
+    def processLastChunk(self, **args):
+        """
+        Process the last chunk of a data stream, as
+        :func:`processChunk() <pyqtgraph.flowchart.Flowchart.processChunk>` does, and
+        emit any output still delayed by nodes with a sliding window. The end of the
+        stream is padded the same way as by
+        :func:`process() <pyqtgraph.flowchart.Flowchart.process>`, so that the
+        concatenated output of all chunks matches the output for the whole data.
+        """
+        self.lastChunk = True
+        try:
+            return self.processChunk(**args)
+        finally:
+            self.lastChunk = False
+    
+    def processStream(self, chunks):
+        """
+        Generator that processes a stream of data through the flowchart.
+        
+        *chunks* is an iterable of dicts, each giving the next chunk for one or more
+        input terminals (as the keyword arguments of
+        :func:`processChunk() <pyqtgraph.flowchart.Flowchart.processChunk>`). The
+        state of all nodes is reset before the first chunk, and the output for each
+        chunk is yielded as soon as it has been processed. The last chunk is
+        processed with
+        :func:`processLastChunk() <pyqtgraph.flowchart.Flowchart.processLastChunk>`::
+        
+            chunks = ({'dataIn': data[i:i+100000]} for i in range(0, len(data), 100000))
+            for out in chart.processStream(chunks):
+                store(out['dataOut'])
         """
+        self.resetChunks()
+        chunks = iter(chunks)
+        chunk = next(chunks, None)
+        while chunk is not None:
+            nextChunk = next(chunks, None)
+            if nextChunk is None:
+                yield self.processLastChunk(**chunk)
+            else:
+                yield self.processChunk(**chunk)
+            chunk = nextChunk
+    
+    def resetChunks(self):
+        """Reset the chunk state of all nodes so that the next call to
+        processChunk() starts a new stream."""
+        Node.resetChunks(self)
+        for node in self._nodes.values():
+            node.resetChunks()
+    
+    def _process(self, args, chunked):
+        try:
+            return self._processNodes(args, chunked)
+        finally:
+            if self._profileBadge:
+                for node in self._nodes.values():
+                    node.updateProfileBadge()
+    
+    def _processNodes(self, args, chunked):
         data = {}  ## Stores terminal:value pairs
         
         ## determine order of operations
@@ -254,6 +402,15 @@ class Flowchart(Node):
         order = self.processOrder()
         #print "ORDER:", order
         
+        if chunked:
+            unsupported = [arg.name() for c, arg in order if c == 'p' and arg is not self.inputNode and 
+                           arg is not self.outputNode and not arg.supportsChunks and not arg.isBypassed()]
+            if len(unsupported) > 0:
+                raise Exception("Nodes %s do not support chunked processing." % ", ".join(unsupported))
+            ## nested flowcharts pass the flag on to their own nodes
+            for node in self._nodes.values():
+                node.lastChunk = self.lastChunk
+        
         ## Record inputs given to process()
         for n, t in self.inputNode.outputs().items():
             # if n not in args:
@@ -261,6 +418,9 @@ class Flowchart(Node):
             if n in args:
                 data[t] = args[n]
         
+        if self._processOpts['workers'] > 1:
+            return self._processConcurrent(order, data, chunked)
+        
         ret = {}
             
         ## process all in order
@@ -272,47 +432,221 @@ class Flowchart(Node):
                 if node is self.inputNode:
                     continue  ## input node has already been processed.
                 
-                            
-                ## get input and output terminals for this node
-                outs = list(node.outputs().values())
-                ins = list(node.inputs().values())
-                
-                ## construct input value dictionary
-                args = {}
-                for inp in ins:
-                    inputs = inp.inputTerminals()
-                    if len(inputs) == 0:
-                        continue
-                    if inp.isMultiValue():  ## multi-input terminals require a dict of all inputs
-                        args[inp.name()] = dict([(i, data[i]) for i in inputs if i in data])
-                    else:                   ## single-inputs terminals only need the single input value available
-                        args[inp.name()] = data[inputs[0]]  
-                        
+                args = self._nodeArgs(node, data)
                 if node is self.outputNode:
                     ret = args  ## we now have the return value, but must keep processing in case there are other endpoint nodes in the chart
                 else:
-                    try:
-                        if node.isBypassed():
-                            result = node.processBypassed(args)
-                        else:
-                            result = node.process(display=False, **args)
-                    except:
-                        print("Error processing node %s. Args are: %s" % (str(node), str(args)))
-                        raise
-                    for out in outs:
-                        #print "    Output:", out, out.name()
-                        #print out.name()
-                        try:
-                            data[out] = result[out.name()]
-                        except KeyError:
-                            pass
+                    self._storeResult(node, self._processNode(node, args, chunked), data)
             elif c == 'd':   ## delete a terminal result (no longer needed; may be holding a lot of memory)
                 #print "===> delete", arg
                 if arg in data:
                     del data[arg]
 
         return ret
+    
+    def _nodeArgs(self, node, data):
+        ## construct input value dictionary for node from the terminal values in data
+        args = {}
+        for inp in node.inputs().values():
+            inputs = inp.inputTerminals()
+            if len(inputs) == 0:
+                continue
+            if inp.isMultiValue():  ## multi-input terminals require a dict of all inputs
+                args[inp.name()] = dict([(i, data[i]) for i in inputs if i in data])
+            else:                   ## single-inputs terminals only need the single input value available
+                args[inp.name()] = data[inputs[0]]  
+        return args
+    
+    def _storeResult(self, node, result, data):
+        for out in node.outputs().values():
+            try:
+                data[out] = result[out.name()]
+            except KeyError:
+                pass
+    
+    def _processNode(self, node, args, chunked=False):
+        ## process a single node, reusing its cached result if the inputs are unchanged.
+        ## May be called from worker threads.
+        useCache = self._processOpts['cache'] and not chunked
+        if useCache:
+            key = (node._processVersion, node.isBypassed(), args)
+            cached = self._processCache.get(node)
+            if cached is not None and self._sameProcessKey(cached[0], key):
+                if node._profiling:
+                    node.recordProfile(0.0, cached[1], cached=True)
+                return cached[1]
+        try:
+            start = time.perf_counter()
+            if node.isBypassed():
+                result = node.processBypassed(args)
+            elif chunked:
+                result = node.processChunk(display=False, **args)
+            else:
+                result = node.process(display=False, **args)
+        except:
+            print("Error processing node %s. Args are: %s" % (str(node), str(args)))
+            raise
+        if node._profiling:
+            node.recordProfile(time.perf_counter() - start, result)
+        if useCache:
+            self._processCache[node] = (key, result)
+        return result
+    
+    @staticmethod
+    def _sameProcessKey(key1, key2):
+        if key1[:2] != key2[:2]:
+            return False
+        args1, args2 = key1[2], key2[2]
+        if args1.keys() != args2.keys():
+            return False
+        for name, v1 in args1.items():
+            v2 = args2[name]
+            if isinstance(v1, dict) and isinstance(v2, dict):  ## multi-value terminal
+                if v1.keys() != v2.keys():
+                    return False
+                if not all(Flowchart._sameValue(v1[k], v2[k]) for k in v1):
+                    return False
+            elif not Flowchart._sameValue(v1, v2):
+                return False
+        return True
+    
+    @staticmethod
+    def _sameValue(v1, v2):
+        ## inputs are compared by identity; scalars are often re-created with the
+        ## same value, so these are compared by value instead.
+        if v1 is v2:
+            return True
+        if type(v1) is type(v2) and isinstance(v1, (bool, int, float, complex, str, bytes)):
+            return v1 == v2
+        return False
+    
+    def _processConcurrent(self, order, data, chunked):
+        ## Process nodes in a thread pool. A node is submitted as soon as all nodes
+        ## it depends on have finished; when several nodes are ready, the one that
+        ## comes first in processOrder() is submitted first. Terminal values that
+        ## processOrder() deletes are dropped once all of their dependent nodes have
+        ## finished, so memory use stays close to that of serial processing.
+        workers = self._processOpts['workers']
+        if self._processPool is None:
+            self._processPool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='Flowchart')
+        pool = self._processPool
+        
+        nodes = [arg for c, arg in order if c == 'p']
+        index = dict([(node, i) for i, node in enumerate(nodes)])
+        deletable = set([arg for c, arg in order if c == 'd'])
+        
+        waiting = {}      ## {node: number of upstream nodes not yet finished}
+        downstream = {}   ## {node: [nodes that depend on node]}
+        for node in nodes:
+            downstream[node] = []
+        for node in nodes:
+            deps = [n for n in node.dependentNodes() if n in index]
+            waiting[node] = len(deps)
+            for n in deps:
+                downstream[n].append(node)
+        consumers = {}    ## {terminal: number of dependent nodes not yet finished}
+        for t in deletable:
+            consumers[t] = len([n for n in t.dependentNodes() if n in index])
+        
+        ready = [(index[n], n) for n in nodes if waiting[n] == 0]
+        heapq.heapify(ready)
+        running = {}      ## {future: node}
+        ret = {}
         
+        def finish(node, result):
+            if result is not None:
+                self._storeResult(node, result, data)
+            for inp in node.inputs().values():
+                for t in inp.inputTerminals():
+                    if t not in consumers:
+                        continue
+                    consumers[t] -= 1
+                    if consumers[t] == 0 and t in data:
+                        del data[t]
+            for n in downstream[node]:
+                waiting[n] -= 1
+                if waiting[n] == 0:
+                    heapq.heappush(ready, (index[n], n))
+        
+        try:
+            while len(ready) > 0 or len(running) > 0:
+                while len(ready) > 0 and len(running) < workers:
+                    i, node = heapq.heappop(ready)
+                    if node is self.inputNode:  ## input node has already been processed.
+                        finish(node, None)
+                        continue
+                    args = self._nodeArgs(node, data)
+                    if node is self.outputNode:
+                        ret = args
+                        finish(node, None)
+                    elif not node.threadSafe:
+                        finish(node, self._processNode(node, args, chunked))
+                    else:
+                        running[pool.submit(self._processNode, node, args, chunked)] = node
+                if len(running) == 0:
+                    continue
+                done, _ = wait(list(running.keys()), return_when=FIRST_COMPLETED)
+                for fut in sorted(done, key=lambda f: index[running[f]]):
+                    node = running.pop(fut)
+                    finish(node, fut.result())
+        finally:
+            ## on error, let nodes that are already running finish before returning
+            for fut in running:
+                fut.cancel()
+            wait(list(running.keys()))
+        
+        return ret
+        
+    def setProfiling(self, enable, badge=False):
+        """Enable or disable recording of processing statistics for all nodes in
+        this flowchart, including nodes added later.
+        
+        While enabled, each node records the wall time, number of calls and size of
+        its output arrays whenever it is processed, either by
+        :func:`process() <pyqtgraph.flowchart.Flowchart.process>` or when it updates
+        in response to changed inputs or controls. If *badge* is True, the
+        statistics are displayed below each node in the flowchart. The recorded
+        statistics are returned by
+        :func:`profileReport() <pyqtgraph.flowchart.Flowchart.profileReport>`.
+        """
+        Node.setProfiling(self, enable, badge)
+        for node in self._nodes.values():
+            node.setProfiling(enable, badge)
+            if enable:
+                node.updateProfileBadge()
+    
+    def resetProfile(self):
+        """Discard the processing statistics recorded for all nodes."""
+        Node.resetProfile(self)
+        for node in self._nodes.values():
+            node.resetProfile()
+            node.updateProfileBadge()
+    
+    def profileReport(self, sortBy='totalTime'):
+        """
+        Return the processing statistics recorded for the nodes in this flowchart
+        since profiling was enabled with
+        :func:`setProfiling() <pyqtgraph.flowchart.Flowchart.setProfiling>`.
+        
+        The return value is a list with one dict per node, sorted by the statistic
+        *sortBy* in descending order. Each dict contains the node's name, the
+        statistics listed in :func:`Node.profileStats() <pyqtgraph.flowchart.Node.profileStats>`
+        and 'timeFraction', the fraction of the processing time of all nodes that
+        was spent in this node.
+        """
+        report = []
+        for name, node in self._nodes.items():
+            if node is self.inputNode or node is self.outputNode:
+                continue
+            stats = node.profileStats()
+            stats['name'] = name
+            report.append(stats)
+        total = sum([stats['totalTime'] for stats in report])
+        for stats in report:
+            stats['timeFraction'] = stats['totalTime'] / total if total > 0 else 0.0
+        report.sort(key=lambda stats: stats[sortBy], reverse=True)
+        return report
+    
     def processOrder(self):
         """Return the order of operations required to process this chart.
         The order returned should look like [('p', node1), ('p', node2), ('d', terminal1), ...] 
@@ -1,6 +1,7 @@
 __all__ = ["Node", "NodeGraphicsItem"]
 
 import sys
+import time
 from collections import OrderedDict
 
 from .. import functions as fn
@@ -35,6 +36,15 @@ class Node(QtCore.QObject):
     sigTerminalAdded = QtCore.Signal(object, object)  # self, term
     sigTerminalRemoved = QtCore.Signal(object, object)  # self, term
 
+    ## Whether Flowchart.process() may call process() for this node from a worker
+    ## thread (see Flowchart.setProcessOptions). Nodes may only set this to True if
+    ## they do not access GUI objects (including their control widgets) while
+    ## processing with display=False, and do not modify their input values.
+    threadSafe = False
+    
+    ## Whether this node can process a data stream one chunk at a time (see
+    ## processChunk() and Flowchart.processChunk()).
+    supportsChunks = False
     
     def __init__(self, name, terminals=None, allowAddInput=False, allowAddOutput=False, allowRemove=True):
         """
@@ -73,6 +83,12 @@ class Node(QtCore.QObject):
         self._allowAddInput = allowAddInput   ## flags to allow the user to add/remove terminals
         self._allowAddOutput = allowAddOutput
         self._allowRemove = allowRemove
+        self._processVersion = 0  ## incremented whenever update() is called; invalidates cached results
+        self.chunkState = {}  ## state carried over between chunks of a stream; see processChunk()
+        self.lastChunk = False  ## True while the last chunk of a stream is processed
+        self._profiling = False
+        self._profileBadge = False
+        Node.resetProfile(self)
         
         self.exception = None
         if terminals is None:
@@ -182,6 +198,28 @@ class Node(QtCore.QObject):
         """
         return {}
     
+    def processChunk(self, **kargs):
+        """Process one chunk of a data stream through this node. This method is
+        called by Flowchart.processChunk() instead of process() for nodes whose
+        class sets ``supportsChunks = True``. Arguments and return value are the
+        same as for process(), except that each input holds only the next part
+        of the data (chunks are taken along the first axis of arrays).
+        
+        The default implementation calls process(), which is correct for nodes
+        that treat every sample independently. Nodes whose output depends on
+        earlier samples (filters, windowed operations) must reimplement this
+        method and keep the data they need from previous chunks in
+        ``self.chunkState``, which is cleared by resetChunks(). Nodes that delay
+        their output must emit the remaining output when ``self.lastChunk`` is
+        True, which is the case for the last chunk of a stream.
+        """
+        return self.process(**kargs)
+    
+    def resetChunks(self):
+        """Discard the state carried over from previous chunks so that the next
+        call to processChunk() starts a new stream."""
+        self.chunkState = {}
+    
     def graphicsItem(self):
         """Return the GraphicsItem for this node. Subclasses may re-implement
         this method to customize their appearance in the flowchart."""
@@ -286,14 +324,22 @@ class Node(QtCore.QObject):
         Subclasses should call update() whenever thir internal state has changed
         (such as when the user interacts with the Node's control widget). Update
         is automatically called when the inputs to the node are changed.
+        
+        Calling update() also invalidates any result of this node cached by
+        Flowchart.process().
         """
+        self._processVersion += 1
         vals = self.inputValues()
         #print "  inputs:", vals
         try:
+            start = time.perf_counter()
             if self.isBypassed():
                 out = self.processBypassed(vals)
             else:
                 out = self.process(**strDict(vals))
+            if self._profiling:
+                self.recordProfile(time.perf_counter() - start, out)
+                self.updateProfileBadge()
             #print "  output:", out
             if out is not None:
                 if signal:
@@ -342,6 +388,79 @@ class Node(QtCore.QObject):
                 #t.inputChanged(term)
             term.setValueAcceptable(True)
 
+    def setProfiling(self, enable, badge=False):
+        """Enable or disable recording of processing statistics for this node.
+        
+        While enabled, the wall time, number of calls and size of the output arrays
+        are recorded each time the node is processed by update() or by
+        Flowchart.process(). If *badge* is True, the statistics are also displayed
+        below the node in the flowchart.
+        """
+        self._profiling = enable
+        self._profileBadge = enable and badge
+        if not self._profileBadge and self._graphicsItem is not None:
+            self._graphicsItem.setProfileText(None)
+        
+    def isProfiling(self):
+        """Return True if processing statistics are being recorded for this node."""
+        return self._profiling
+        
+    def resetProfile(self):
+        """Discard all recorded processing statistics."""
+        self._profileStats = {'calls': 0, 'cacheHits': 0, 'totalTime': 0.0, 'maxTime': 0.0, 
+                              'lastTime': None, 'outputBytes': 0, 'maxOutputBytes': 0}
+        
+    def profileStats(self):
+        """Return a dict of the processing statistics recorded for this node:
+        
+        ==============  ============================================================
+        calls           Number of times the node was processed
+        cacheHits       Number of times Flowchart.process() reused a cached result
+                        instead of processing
+        totalTime       Total wall time spent processing (seconds)
+        meanTime        Average wall time per call (seconds)
+        maxTime         Longest wall time of a single call (seconds)
+        lastTime        Wall time of the most recent call (seconds)
+        outputBytes     Total size of the arrays output by the most recent call
+        maxOutputBytes  Largest total size of the output arrays of a single call
+        ==============  ============================================================
+        """
+        stats = dict(self._profileStats)
+        stats['meanTime'] = stats['totalTime'] / stats['calls'] if stats['calls'] > 0 else 0.0
+        return stats
+        
+    def recordProfile(self, dt, output, cached=False):
+        """Add one call taking *dt* seconds and returning the dict *output* to the
+        processing statistics. This may be called from worker threads, so it does
+        not update the display; see updateProfileBadge()."""
+        stats = self._profileStats
+        if cached:
+            stats['cacheHits'] += 1
+            return
+        nbytes = 0
+        if output is not None:
+            for v in output.values():
+                nbytes += getattr(v, 'nbytes', 0)
+        stats['calls'] += 1
+        stats['totalTime'] += dt
+        stats['maxTime'] = max(stats['maxTime'], dt)
+        stats['lastTime'] = dt
+        stats['outputBytes'] = nbytes
+        stats['maxOutputBytes'] = max(stats['maxOutputBytes'], nbytes)
+        
+    def updateProfileBadge(self):
+        """Update the statistics displayed below this node, if enabled by setProfiling()."""
+        if not self._profileBadge:
+            return
+        stats = self.profileStats()
+        if stats['calls'] == 0:
+            text = "not processed"
+        else:
+            text = "%s \u00d7%d" % (fn.siFormat(stats['meanTime'], suffix='s'), stats['calls'])
+            if stats['outputBytes'] > 0:
+                text += ", %s" % fn.siFormat(stats['outputBytes'], suffix='B')
+        self.graphicsItem().setProfileText(text)
+    
     def setException(self, exc):
         self.exception = exc
         self.recolor()
@@ -484,6 +603,7 @@ class NodeGraphicsItem(GraphicsObject):
         self.nameItem.moveBy(self.bounds.width()/2. - self.nameItem.boundingRect().width()/2., 0)
         self._titleOffset = 25
         self._nodeOffset = 12
+        self.profileItem = None
         self.updateTerminals()
         #self.setZValue(10)
 
@@ -550,6 +670,25 @@ class NodeGraphicsItem(GraphicsObject):
         self.brush = brush
         self.update()
         
+    def setProfileText(self, text):
+        """Display *text* (usually processing statistics) in a small label below
+        the node, or remove the label if *text* is None."""
+        if text is None:
+            if self.profileItem is not None:
+                self.profileItem.setParentItem(None)
+                if self.profileItem.scene() is not None:
+                    self.profileItem.scene().removeItem(self.profileItem)
+                self.profileItem = None
+            return
+        if self.profileItem is None:
+            self.profileItem = QtWidgets.QGraphicsSimpleTextItem(self)
+            font = self.profileItem.font()
+            font.setPointSizeF(font.pointSizeF() * 0.8)
+            self.profileItem.setFont(font)
+            self.profileItem.setBrush(fn.mkBrush(150, 0, 0))
+        self.profileItem.setText(text)
+        self.profileItem.setPos(0, self.bounds.bottom() + 2)
+        
         
     def updateTerminals(self):
         self.terminals = {}
@@ -565,6 +704,8 @@ class NodeGraphicsItem(GraphicsObject):
         if not self.bounds.height() == newHeight:
             self.bounds.setHeight(newHeight)
             self.update()
+            if self.profileItem is not None:
+                self.profileItem.setPos(0, self.bounds.bottom() + 2)
 
         # Populate inputs
         y = self._titleOffset
@@ -12,6 +12,8 @@ from .common import CtrlNode
 class ColumnSelectNode(Node):
     """Select named columns from a record array."""
     nodeName = "ColumnSelect"
+    supportsChunks = True
+    
     def __init__(self, name):
         Node.__init__(self, name, terminals={'In': {'io': 'in'}})
         self.columns = set()
@@ -354,6 +356,7 @@ class Mean(CtrlNode):
     """Calculate the mean of an array across an axis.
     """
     nodeName = 'Mean'
+    supportsChunks = True
     uiTemplate = [
         ('axis', 'intSpin', {'value': 0, 'min': -1, 'max': 1000000}),
     ]
@@ -363,11 +366,17 @@ class Mean(CtrlNode):
         ax = None if s['axis'] == -1 else s['axis']
         return data.mean(axis=ax)
 
+    def processDataChunk(self, data):
+        if self.stateGroup.state()['axis'] in (0, -1):
+            raise Exception("Mean can not process chunks when reducing across axis 0.")
+        return self.processData(data)
+
 
 class Max(CtrlNode):
     """Calculate the maximum of an array across an axis.
     """
     nodeName = 'Max'
+    supportsChunks = True
     uiTemplate = [
         ('axis', 'intSpin', {'value': 0, 'min': -1, 'max': 1000000}),
     ]
@@ -377,11 +386,17 @@ class Max(CtrlNode):
         ax = None if s['axis'] == -1 else s['axis']
         return data.max(axis=ax)
 
+    def processDataChunk(self, data):
+        if self.stateGroup.state()['axis'] in (0, -1):
+            raise Exception("Max can not process chunks when reducing across axis 0.")
+        return self.processData(data)
+
 
 class Min(CtrlNode):
     """Calculate the minimum of an array across an axis.
     """
     nodeName = 'Min'
+    supportsChunks = True
     uiTemplate = [
         ('axis', 'intSpin', {'value': 0, 'min': -1, 'max': 1000000}),
     ]
@@ -391,11 +406,17 @@ class Min(CtrlNode):
         ax = None if s['axis'] == -1 else s['axis']
         return data.min(axis=ax)
 
+    def processDataChunk(self, data):
+        if self.stateGroup.state()['axis'] in (0, -1):
+            raise Exception("Min can not process chunks when reducing across axis 0.")
+        return self.processData(data)
+
 
 class Stdev(CtrlNode):
     """Calculate the standard deviation of an array across an axis.
     """
     nodeName = 'Stdev'
+    supportsChunks = True
     uiTemplate = [
         ('axis', 'intSpin', {'value': -0, 'min': -1, 'max': 1000000}),
     ]
@@ -405,11 +426,17 @@ class Stdev(CtrlNode):
         ax = None if s['axis'] == -1 else s['axis']
         return data.std(axis=ax)
 
+    def processDataChunk(self, data):
+        if self.stateGroup.state()['axis'] in (0, -1):
+            raise Exception("Stdev can not process chunks when reducing across axis 0.")
+        return self.processData(data)
+
 
 class Index(CtrlNode):
     """Select an index from an array axis.
     """
     nodeName = 'Index'
+    supportsChunks = True
     uiTemplate = [
         ('axis', 'intSpin', {'value': 0, 'min': 0, 'max': 1000000}),
         ('index', 'intSpin', {'value': 0, 'min': 0, 'max': 1000000}),
@@ -424,12 +451,18 @@ class Index(CtrlNode):
             return data[ind]
         else:
             return data.take(ind, axis=ax)
+
+    def processDataChunk(self, data):
+        if self.stateGroup.state()['axis'] == 0:
+            raise Exception("Index can not process chunks when indexing axis 0.")
+        return self.processData(data)
         
 
 class Slice(CtrlNode):
     """Select a slice from an array axis.
     """
     nodeName = 'Slice'
+    supportsChunks = True
     uiTemplate = [
         ('axis', 'intSpin', {'value': 0, 'min': 0, 'max': 1000000}),
         ('start', 'intSpin', {'value': 0, 'min': -1000000, 'max': 1000000}),
@@ -450,12 +483,18 @@ class Slice(CtrlNode):
             sl = [slice(None) for i in range(data.ndim)]
             sl[ax] = slice(start, stop, step)
             return data[sl]
+
+    def processDataChunk(self, data):
+        if self.stateGroup.state()['axis'] == 0:
+            raise Exception("Slice can not process chunks when slicing axis 0.")
+        return self.processData(data)
         
 
 class AsType(CtrlNode):
     """Convert an array to a different dtype.
     """
     nodeName = 'AsType'
+    supportsChunks = True
     uiTemplate = [
         ('dtype', 'combo', {'values': ['float', 'int', 'float32', 'float64', 'float128', 'int8', 'int16', 'int32', 'int64', 'uint8', 'uint16', 'uint32', 'uint64'], 'index': 0}),
     ]
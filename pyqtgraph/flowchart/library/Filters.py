@@ -6,6 +6,27 @@ from . import functions
 from .common import CtrlNode, PlottingCtrlNode
 
 
+def _filterNodeChunk(node, key, b, a, data):
+    """Filter one chunk of data for *node* with coefficients b, a, carrying the
+    filter state over in node.chunkState[key]. The filter restarts when its
+    coefficients change between chunks."""
+    prev = node.chunkState.get(key)
+    zi = None
+    if prev is not None and np.array_equal(prev[0], b) and np.array_equal(prev[1], a):
+        zi = prev[2]
+    out, zi = functions.filterChunk(data, b, a, zi)
+    node.chunkState[key] = (b, a, zi)
+    return out
+
+
+def _chunkSampleInterval(node, data):
+    """Return the sample interval of the stream processed by *node*, as determined
+    from its first chunk."""
+    if 'dt' not in node.chunkState:
+        node.chunkState['dt'] = functions.sampleInterval(data)
+    return node.chunkState['dt']
+
+
 class Downsample(CtrlNode):
     """Downsample by averaging samples together."""
     nodeName = 'Downsample'
@@ -13,9 +34,21 @@ class Downsample(CtrlNode):
         ('n', 'intSpin', {'min': 1, 'max': 1000000})
     ]
     
+    supportsChunks = True
+    
     def processData(self, data):
         return functions.downsample(data, self.ctrls['n'].value(), axis=0)
 
+    def processDataChunk(self, data):
+        ## samples that do not fill a complete group are kept for the next chunk
+        n = self.ctrls['n'].value()
+        rem = self.chunkState.get('remainder')
+        if rem is not None and len(rem) > 0:
+            data = np.concatenate([rem, data])
+        nUsed = (len(data) // n) * n
+        self.chunkState['remainder'] = np.array(data[nUsed:])
+        return functions.downsample(np.ascontiguousarray(data[:nUsed]), n, axis=0)
+
 
 class Subsample(CtrlNode):
     """Downsample by selecting every Nth sample."""
@@ -24,9 +57,17 @@ class Subsample(CtrlNode):
         ('n', 'intSpin', {'min': 1, 'max': 1000000})
     ]
     
+    supportsChunks = True
+    
     def processData(self, data):
         return data[::self.ctrls['n'].value()]
 
+    def processDataChunk(self, data):
+        n = self.ctrls['n'].value()
+        start = self.chunkState.get('start', 0)
+        self.chunkState['start'] = (start - len(data)) % n
+        return data[start::n]
+
 
 class Bessel(CtrlNode):
     """Bessel filter. Input data must have time values."""
@@ -37,6 +78,7 @@ class Bessel(CtrlNode):
         ('order', 'intSpin', {'value': 4, 'min': 1, 'max': 16}),
         ('bidir', 'check', {'checked': True})
     ]
+    supportsChunks = True
     
     def processData(self, data):
         s = self.stateGroup.state()
@@ -46,6 +88,14 @@ class Bessel(CtrlNode):
             mode = 'high'
         return functions.besselFilter(data, bidir=s['bidir'], btype=mode, cutoff=s['cutoff'], order=s['order'])
 
+    def processDataChunk(self, data):
+        s = self.stateGroup.state()
+        if s['bidir']:
+            raise Exception("BesselFilter can only process chunks when bidirectional filtering is disabled.")
+        mode = 'low' if s['band'] == 'lowpass' else 'high'
+        b, a = functions.besselCoefficients(s['cutoff'], _chunkSampleInterval(self, data), order=s['order'], btype=mode)
+        return _filterNodeChunk(self, 'filter', b, a, data)
+
 
 class Butterworth(CtrlNode):
     """Butterworth filter"""
@@ -58,6 +108,7 @@ class Butterworth(CtrlNode):
         ('gStop', 'spin', {'value': 20.0, 'step': 1, 'dec': True, 'bounds': [0.0, None], 'suffix': 'dB', 'siPrefix': True}),
         ('bidir', 'check', {'checked': True})
     ]
+    supportsChunks = True
     
     def processData(self, data):
         s = self.stateGroup.state()
@@ -68,6 +119,14 @@ class Butterworth(CtrlNode):
         ret = functions.butterworthFilter(data, bidir=s['bidir'], btype=mode, wPass=s['wPass'], wStop=s['wStop'], gPass=s['gPass'], gStop=s['gStop'])
         return ret
 
+    def processDataChunk(self, data):
+        s = self.stateGroup.state()
+        if s['bidir']:
+            raise Exception("ButterworthFilter can only process chunks when bidirectional filtering is disabled.")
+        mode = 'low' if s['band'] == 'lowpass' else 'high'
+        b, a = functions.butterworthCoefficients(s['wPass'], _chunkSampleInterval(self, data), wStop=s['wStop'], gPass=s['gPass'], gStop=s['gStop'], btype=mode)
+        return _filterNodeChunk(self, 'filter', b, a, data)
+
         
 class ButterworthNotch(CtrlNode):
     """Butterworth notch filter"""
@@ -83,6 +142,7 @@ class ButterworthNotch(CtrlNode):
         ('high_gStop', 'spin', {'value': 20.0, 'step': 1, 'dec': True, 'bounds': [0.0, None], 'suffix': 'dB', 'siPrefix': True}),
         ('bidir', 'check', {'checked': True})
     ]
+    supportsChunks = True
     
     def processData(self, data):
         s = self.stateGroup.state()
@@ -90,6 +150,18 @@ class ButterworthNotch(CtrlNode):
         low = functions.butterworthFilter(data, bidir=s['bidir'], btype='low', wPass=s['low_wPass'], wStop=s['low_wStop'], gPass=s['low_gPass'], gStop=s['low_gStop'])
         high = functions.butterworthFilter(data, bidir=s['bidir'], btype='high', wPass=s['high_wPass'], wStop=s['high_wStop'], gPass=s['high_gPass'], gStop=s['high_gStop'])
         return low + high
+
+    def processDataChunk(self, data):
+        s = self.stateGroup.state()
+        if s['bidir']:
+            raise Exception("ButterworthNotchFilter can only process chunks when bidirectional filtering is disabled.")
+        dt = _chunkSampleInterval(self, data)
+        out = None
+        for band, mode in [('low', 'low'), ('high', 'high')]:
+            b, a = functions.butterworthCoefficients(s[band+'_wPass'], dt, wStop=s[band+'_wStop'], gPass=s[band+'_gPass'], gStop=s[band+'_gStop'], btype=mode)
+            filtered = _filterNodeChunk(self, band, b, a, data)
+            out = filtered if out is None else out + filtered
+        return out
     
 
 class Mean(CtrlNode):
@@ -99,10 +171,23 @@ class Mean(CtrlNode):
         ('n', 'intSpin', {'min': 1, 'max': 1000000})
     ]
     
+    supportsChunks = True
+    
     def processData(self, data):
         n = self.ctrls['n'].value()
         return functions.rollingSum(data, n) / n
 
+    def processDataChunk(self, data):
+        ## the last n-1 samples are kept to complete the windows of the next chunk
+        n = self.ctrls['n'].value()
+        hist = self.chunkState.get('history')
+        if hist is not None:
+            data = np.concatenate([hist, data])
+        self.chunkState['history'] = np.array(data[max(0, len(data)-n+1):])
+        if len(data) < n:
+            return np.empty((0,) + data.shape[1:], dtype=float)
+        return functions.rollingSum(data, n) / n
+
 
 class Median(CtrlNode):
     """Filters data by taking the median of a sliding window"""
@@ -111,6 +196,8 @@ class Median(CtrlNode):
         ('n', 'intSpin', {'min': 1, 'max': 1000000})
     ]
     
+    supportsChunks = True
+    
     def processData(self, data):
         try:
             import scipy.ndimage
@@ -118,6 +205,32 @@ class Median(CtrlNode):
             raise Exception("MedianFilter node requires the package scipy.ndimage.")
         return scipy.ndimage.median_filter(data, self.ctrls['n'].value())
 
+    def processDataChunk(self, data):
+        ## Each output sample needs the samples that follow it, so output is delayed
+        ## by n-1-n//2 samples until the last chunk. The start and end of the stream
+        ## are padded the same way median_filter pads the ends of an array.
+        try:
+            import scipy.ndimage
+        except ImportError:
+            raise Exception("MedianFilter node requires the package scipy.ndimage.")
+        data = np.asarray(data)
+        if data.ndim != 1:
+            raise Exception("MedianFilter can only process chunks of 1D data.")
+        n = self.ctrls['n'].value()
+        hist = self.chunkState.get('history')
+        if hist is None:
+            if len(data) == 0:
+                return data
+            hist = np.pad(data, (n//2, 0), mode='symmetric')[:n//2]
+        data = np.concatenate([hist, data])
+        if self.lastChunk:
+            data = np.pad(data, (0, n - 1 - n//2), mode='symmetric')
+        nOut = max(0, len(data) - n + 1)
+        self.chunkState['history'] = data[nOut:]
+        if nOut == 0:
+            return data[:0]
+        return scipy.ndimage.median_filter(data, n)[n//2:n//2+nOut]
+
 class Mode(CtrlNode):
     """Filters data by taking the mode (histogram-based) of a sliding window"""
     nodeName = 'ModeFilter'
@@ -162,18 +275,40 @@ class Gaussian(CtrlNode):
 class Derivative(CtrlNode):
     """Returns the pointwise derivative of the input"""
     nodeName = 'DerivativeFilter'
+    supportsChunks = True
     
     def processData(self, data):
         return data[1:] - data[:-1]
 
+    def processDataChunk(self, data):
+        last = self.chunkState.get('last')
+        if len(data) > 0:
+            self.chunkState['last'] = np.array(data[-1:])
+        if last is not None:
+            data = np.concatenate([last, data])
+        return data[1:] - data[:-1]
+
 
 class Integral(CtrlNode):
     """Returns the pointwise integral of the input"""
     nodeName = 'IntegralFilter'
+    supportsChunks = True
     
     def processData(self, data):
-        data[1:] += data[:-1]
-        return data
+        ## the input may be shared with other nodes, so it is not modified
+        out = np.array(data)
+        out[1:] += data[:-1]
+        return out
+
+    def processDataChunk(self, data):
+        last = self.chunkState.get('last')
+        if len(data) > 0:
+            self.chunkState['last'] = np.array(data[-1])
+        out = np.array(data)
+        out[1:] += data[:-1]
+        if last is not None and len(out) > 0:
+            out[0] += last
+        return out
 
 
 class Detrend(CtrlNode):
@@ -4,6 +4,9 @@ from .common import CtrlNode
 
 class UniOpNode(Node):
     """Generic node for performing any operation like Out = In.fn()"""
+    supportsChunks = True
+    threadSafe = True
+    
     def __init__(self, name, fn):
         self.fn = fn
         Node.__init__(self, name, terminals={
@@ -26,6 +29,7 @@ class BinOpNode(CtrlNode):
     uiTemplate = [
         ('outputType', 'combo', {'values': ['no change', 'input A', 'input B'] + _dtypes , 'index': 0})
     ]
+    supportsChunks = True
 
     def __init__(self, name, fn):
         self.fn = fn
@@ -65,6 +69,9 @@ class BinOpNode(CtrlNode):
         #print "     ", fn, out
         return {'Out': out}
 
+    def processChunk(self, **args):
+        return self.process(**args)
+
 
 class AbsNode(UniOpNode):
     """Returns abs(Inp). Does not check input types."""
@@ -113,6 +113,15 @@ class CtrlNode(Node):
         out = self.processData(In)
         return {'Out': out}
     
+    def processChunk(self, In, display=True):
+        out = self.processDataChunk(In)
+        return {'Out': out}
+    
+    def processDataChunk(self, data):
+        """Process one chunk of a data stream. The default implementation calls
+        processData(); see Node.processChunk()."""
+        return self.processData(data)
+    
     def saveState(self):
         state = Node.saveState(self)
         state['ctrl'] = self.stateGroup.state()
@@ -47,51 +47,83 @@ def applyFilter(data, b, a, padding=100, bidir=True):
         d1 = d1[padding:-padding]
     return d1
     
-def besselFilter(data, cutoff, order=1, dt=None, btype='low', bidir=True):
-    """return data passed through bessel filter"""
+def filterChunk(data, b, a, zi=None):
+    """Apply a causal linear filter with coefficients a, b to one chunk of a stream,
+    filtering along the first axis.
+    
+    *zi* is the filter state returned for the previous chunk, or None for the first
+    chunk of the stream, in which case the filter starts in the steady state for the
+    first sample. Returns the filtered chunk and the state to pass with the next chunk.
+    """
     try:
         import scipy.signal
     except ImportError:
-        raise Exception("besselFilter() requires the package scipy.signal.")
+        raise Exception("filterChunk() requires the package scipy.signal.")
     
+    d1 = data.view(np.ndarray)
+    if len(d1) == 0:
+        return d1.astype(float), zi
+    if zi is None:
+        zi = np.multiply.outer(scipy.signal.lfilter_zi(b, a), d1[0])
+    return scipy.signal.lfilter(b, a, d1, axis=0, zi=zi)
+
+
+def sampleInterval(data):
+    """Return the time between samples of *data*, as given by its 'Time' axis values,
+    or 1.0 if these are not available."""
+    try:
+        tvals = data.xvals('Time')
+        return (tvals[-1]-tvals[0]) / (len(tvals)-1)
+    except:
+        return 1.0
+
+
+def besselCoefficients(cutoff, dt, order=1, btype='low'):
+    """Return the coefficients (b, a) of a bessel filter."""
+    try:
+        import scipy.signal
+    except ImportError:
+        raise Exception("besselCoefficients() requires the package scipy.signal.")
+    return scipy.signal.bessel(order, cutoff * dt, btype=btype)
+
+
+def besselFilter(data, cutoff, order=1, dt=None, btype='low', bidir=True):
+    """return data passed through bessel filter"""
     if dt is None:
-        try:
-            tvals = data.xvals('Time')
-            dt = (tvals[-1]-tvals[0]) / (len(tvals)-1)
-        except:
-            dt = 1.0
+        dt = sampleInterval(data)
     
-    b,a = scipy.signal.bessel(order, cutoff * dt, btype=btype) 
+    b,a = besselCoefficients(cutoff, dt, order=order, btype=btype)
     
     return applyFilter(data, b, a, bidir=bidir)
 
 
-def butterworthFilter(data, wPass, wStop=None, gPass=2.0, gStop=20.0, order=1, dt=None, btype='low', bidir=True):
-    """return data passed through bessel filter"""
+def butterworthCoefficients(wPass, dt, wStop=None, gPass=2.0, gStop=20.0, btype='low'):
+    """Return the coefficients (b, a) of the lowest order butterworth filter that
+    meets the given pass and stop band specifications."""
     try:
         import scipy.signal
     except ImportError:
-        raise Exception("butterworthFilter() requires the package scipy.signal.")
-    
-    if dt is None:
-        try:
-            tvals = data.xvals('Time')
-            dt = (tvals[-1]-tvals[0]) / (len(tvals)-1)
-        except:
-            dt = 1.0
+        raise Exception("butterworthCoefficients() requires the package scipy.signal.")
     
     if wStop is None:
         wStop = wPass * 2.0
     ord, Wn = scipy.signal.buttord(wPass*dt*2., wStop*dt*2., gPass, gStop)
     #print "butterworth ord %f   Wn %f   c %f   sc %f" % (ord, Wn, cutoff, stopCutoff)
-    b,a = scipy.signal.butter(ord, Wn, btype=btype) 
+    return scipy.signal.butter(ord, Wn, btype=btype) 
+
+
+def butterworthFilter(data, wPass, wStop=None, gPass=2.0, gStop=20.0, order=1, dt=None, btype='low', bidir=True):
+    """return data passed through bessel filter"""
+    if dt is None:
+        dt = sampleInterval(data)
+    
+    b,a = butterworthCoefficients(wPass, dt, wStop=wStop, gPass=gPass, gStop=gStop, btype=btype)
     
     return applyFilter(data, b, a, bidir=bidir)
 
 
 def rollingSum(data, n):
-    d1 = data.copy()
-    d1[1:] += d1[:-1]  # integrate
+    d1 = np.cumsum(data, axis=0)  # integrate
     d2 = np.empty(len(d1) - n + 1, dtype=data.dtype)
     d2[0] = d1[n-1]  # copy first point
     d2[1:] = d1[n:] - d1[:-n]  # subtract
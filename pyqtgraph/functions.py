@@ -4,11 +4,14 @@ Copyright 2010  Luke Campagnola
 Distributed under MIT/X11 license. See license.txt for more information.
 """
 
+import collections
+import concurrent.futures
 import decimal
 import math
 import re
 import struct
 import sys
+import threading
 import warnings
 from collections import OrderedDict
 
@@ -38,9 +41,9 @@ __all__ = [
     'makeQImage',
     # 'ndarray_from_qimage',
     'imageToArray', 'colorToAlpha',
-    'gaussianFilter', 'downsample', 'arrayToQPath',
+    'gaussianFilter', 'downsample', 'arrayToQPath', 'simplifyPolyline',
     # 'ndarray_from_qpolygonf', 'create_qpolygonf', 'arrayToQPolygonF',
-    'isocurve', 'traceImage', 'isosurface',
+    'isocurve', 'isocurves', 'traceImage', 'isosurface',
     'invertQTransform',
     'pseudoScatter', 'toposort', 'disconnect', 'SignalBlock']
 
@@ -786,6 +789,32 @@ def eq(a, b):
         raise TypeError("== operator returned type %s" % str(type(e)))
 
 
+_affineGridCache = collections.OrderedDict()  ## maps {(shape, vectors): grid}, most recently used last
+_affineGridCacheSize = 4
+_affineGridCacheLock = threading.Lock()  ## affineSlice() is also called from worker threads
+
+
+def _affineSliceGrid(shape, vectors):
+    ## Return the sample locations of affineSliceCoords() relative to the origin.
+    ## Grids are cached because an ROI that is moved keeps its shape and vectors;
+    ## only the origin changes.
+    key = (tuple(shape), vectors.shape, vectors.tobytes())
+    with _affineGridCacheLock:
+        grid = _affineGridCache.get(key)
+        if grid is not None:
+            _affineGridCache.move_to_end(key)
+            return grid
+    
+    grid = np.mgrid[tuple([slice(0,x) for x in shape])].astype(float)  ## mesh grid of indexes
+    grid = (grid[np.newaxis,...] * vectors.transpose()[(Ellipsis,) + (np.newaxis,)*len(shape)]).sum(axis=1)  ## magic
+    grid.flags.writeable = False
+    with _affineGridCacheLock:
+        _affineGridCache[key] = grid
+        while len(_affineGridCache) > _affineGridCacheSize:
+            _affineGridCache.popitem(last=False)
+    return grid
+
+
 def affineSliceCoords(shape, origin, vectors, axes):
     """Return the array of coordinates used to sample data arrays in affineSlice().
     """
@@ -798,21 +827,123 @@ def affineSliceCoords(shape, origin, vectors, axes):
         if len(v) != len(axes):
             raise Exception("each vector must be same length as axes.")
         
-    shape = list(map(np.ceil, shape))
+    shape = [int(np.ceil(x)) for x in shape]
 
     ## make sure vectors are arrays
-    if not isinstance(vectors, np.ndarray):
-        vectors = np.array(vectors)
-    if not isinstance(origin, np.ndarray):
-        origin = np.array(origin)
-    origin.shape = (len(axes),) + (1,)*len(shape)
+    vectors = np.asarray(vectors, dtype=float)
+    origin = np.asarray(origin, dtype=float).reshape((len(axes),) + (1,)*len(shape))
 
     ## Build array of sample locations. 
-    grid = np.mgrid[tuple([slice(0,x) for x in shape])]  ## mesh grid of indexes
-    x = (grid[np.newaxis,...] * vectors.transpose()[(Ellipsis,) + (np.newaxis,)*len(shape)]).sum(axis=1)  ## magic
-    x += origin
-
-    return x
+    return _affineSliceGrid(shape, vectors) + origin
+
+
+def _sampleAxis(data, inds, axis):
+    ## Select *inds* along *axis*, returning a view if the indexes are evenly spaced.
+    step = inds[1] - inds[0] if len(inds) > 1 else 1
+    if step != 0 and np.all(np.diff(inds) == step):
+        stop = inds[-1] + step
+        index = (slice(None),) * axis + (slice(inds[0], stop if stop >= 0 else None, step),)
+        return data[index]
+    return data.take(inds, axis=axis)
+
+
+def _affineSliceAligned(data, shape, origin, vectors, axes, order):
+    ## Fast path for affineSlice() when each vector is parallel to one of the data
+    ## axes. Sampling is then separable, so the result is interpolated from one array
+    ## of indexes per axis rather than from a full grid of coordinates. When all
+    ## samples fall on data points inside the array, a strided view of *data* is
+    ## returned. Returns None if the vectors are not aligned with the data axes.
+    shape = [int(np.ceil(x)) for x in shape]
+    vectors = np.asarray(vectors, dtype=float)
+    origin = np.asarray(origin, dtype=float)
+    if vectors.shape != (len(shape), len(axes)) or origin.shape != (len(axes),):
+        return None  ## let affineSliceCoords() report the error
+    if len(shape) == 0 or min(shape) < 1:
+        return None
+    
+    ## find the data axis that each vector runs along
+    sliceAxes = []
+    steps = []
+    for v in vectors:
+        big = np.abs(v) > 1e-9 * np.abs(v).max()
+        if big.sum() != 1:
+            return None
+        i = int(np.argmax(big))
+        if axes[i] in sliceAxes:
+            return None
+        sliceAxes.append(axes[i])
+        steps.append(v[i])
+    
+    ## 1D sample locations along each of the ROI axes; axes that no vector runs
+    ## along are sampled at a single location
+    coords = {}
+    for i, ax in enumerate(axes):
+        if ax in sliceAxes:
+            m = sliceAxes.index(ax)
+            coords[ax] = origin[i] + np.arange(shape[m]) * steps[m]
+        else:
+            coords[ax] = origin[i:i+1]
+    inds = {ax: np.round(c) for ax, c in coords.items()}
+    ## nearest-neighbor sampling checks bounds after rounding, as in interpolateArray
+    valid = {ax: (c >= 0) & (c <= data.shape[ax]-1) for ax, c in (inds if order == 0 else coords).items()}
+    onGrid = all(np.allclose(c, inds[ax], rtol=0, atol=1e-9) for ax, c in coords.items())
+    inBounds = all(v.all() for v in valid.values())
+    dtype = data.dtype if order == 0 else np.result_type(data.dtype, float)
+    
+    if onGrid and inBounds:
+        ## samples are evenly spaced data points: slice without copying
+        index = [slice(None)] * data.ndim
+        for ax in axes:
+            first = int(inds[ax][0])
+            step = int(inds[ax][1] - first) if len(inds[ax]) > 1 else 1
+            if step == 0:
+                return None
+            stop = first + step * len(inds[ax])
+            index[ax] = slice(first, stop if stop >= 0 else None, step)
+        output = data[tuple(index)]
+        if output.dtype != dtype:
+            output = output.astype(dtype)
+    else:
+        ## crop to the sampled region, then sample one axis at a time
+        index = [slice(None)] * data.ndim
+        sampleInds = {}
+        for ax in axes:
+            if order == 0 or onGrid:
+                i0 = np.clip(inds[ax], 0, data.shape[ax]-1).astype(int)
+                i1 = None
+            else:
+                i0 = np.clip(np.floor(coords[ax]), 0, data.shape[ax]-1).astype(int)
+                i1 = np.minimum(i0 + 1, data.shape[ax]-1)
+            start = i0.min()
+            stop = (i0 if i1 is None else i1).max() + 1
+            index[ax] = slice(start, stop)
+            sampleInds[ax] = (i0 - start, None if i1 is None else i1 - start)
+        output = data[tuple(index)].astype(dtype)
+        
+        for ax in axes:
+            i0, i1 = sampleInds[ax]
+            if i1 is None:
+                output = _sampleAxis(output, i0, ax)
+                continue
+            f = coords[ax] - np.floor(coords[ax])
+            if np.ptp(f) == 0:
+                f = f[0]
+            else:
+                f = f.reshape((-1,) + (1,)*(data.ndim-ax-1))
+            output = _sampleAxis(output, i0, ax) * (1-f) + _sampleAxis(output, i1, ax) * f
+        ## locations outside the data are set to 0, as in interpolateArray
+        for ax in axes:
+            if not valid[ax].all():
+                index = (slice(None),) * ax + (~valid[ax],)
+                output[index] = 0
+    
+    ## drop the axes sampled at a single location and order the remaining axes
+    ## as affineSlice does
+    output = output[tuple(0 if ax in axes and ax not in sliceAxes else slice(None) for ax in range(data.ndim))]
+    dims = [ax for ax in range(data.ndim) if ax not in axes or ax in sliceAxes]
+    others = [ax for ax in range(data.ndim) if ax not in axes]
+    outAxes = [ax for ax in others if ax < min(axes)] + sliceAxes + [ax for ax in others if ax > min(axes)]
+    return output.transpose([dims.index(ax) for ax in outAxes])
 
     
 def affineSlice(data, shape, origin, vectors, axes, order=1, returnCoords=False, **kargs):
@@ -861,7 +992,21 @@ def affineSlice(data, shape, origin, vectors, axes, order=1, returnCoords=False,
         
         affineSlice(data, shape=(20,20), origin=(40,0,0), vectors=((-1, 1, 0), (-1, 0, 1)), axes=(1,2,3))
     
+    When *order* < 2 and each vector is parallel to one of the data axes (for example, a slice through an
+    unrotated ROI), the values are interpolated one axis at a time without building the array of coordinates.
+    If, in addition, the origin and vectors are integers and the slice lies inside *data*, the returned array is
+    a strided view of *data* (when its dtype allows) rather than a copy.
+    
+    The coordinates of rotated slices are cached by shape and vectors, so moving the same slice only requires
+    the data to be sampled again.
     """
+    if order < 2:
+        output = _affineSliceAligned(data, shape, origin, vectors, axes, order)
+        if output is not None:
+            if returnCoords:
+                return (output, affineSliceCoords(shape, origin, vectors, axes))
+            return output
+
     x = affineSliceCoords(shape, origin, vectors, axes)
 
     ## transpose data so slice axes come first
@@ -2170,6 +2315,103 @@ def arrayToQPath(x, y, connect='all', finiteCheck=True):
         ds >> path
     return path
 
+def simplifyPolyline(x, y, tolerance=0.5, xRange=None):
+    """
+    Return the indices of the points needed to draw the polyline (*x*, *y*) at
+    display resolution. *x* and *y* must be given in pixel (device) coordinates.
+
+    Consecutive points that fall into the same pixel column are first reduced to
+    the first, last, lowest and highest of them, which does not change the
+    rasterized line. The remaining points are then simplified with the
+    Ramer-Douglas-Peucker algorithm, removing points that lie within *tolerance*
+    pixels of the simplified line. Non-finite points are kept so that gaps in the
+    line are preserved.
+
+    If *xRange* = (left, right) is given and *x* is monotonic, points outside of
+    that range are dropped, except for the closest point on either side.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    inds = np.arange(n)
+    if n < 3:
+        return inds
+    finite = np.isfinite(x) & np.isfinite(y)
+
+    if xRange is not None and np.isfinite(x).all():
+        dx = np.diff(x)
+        xs = None
+        if np.all(dx >= 0):
+            xs, left, right = x, xRange[0], xRange[1]
+        elif np.all(dx <= 0):
+            xs, left, right = -x, -xRange[1], -xRange[0]
+        if xs is not None:
+            start = max(np.searchsorted(xs, left, side='left') - 1, 0)
+            stop = min(np.searchsorted(xs, right, side='right') + 1, n)
+            inds = inds[start:stop]
+            if len(inds) < 3:
+                return inds
+
+    ## reduce each run of points within one pixel column to its extremes
+    px, py, fin = x[inds], y[inds], finite[inds]
+    m = len(inds)
+    col = np.floor(px)
+    starts = np.flatnonzero(np.concatenate([[True], (col[1:] != col[:-1]) | ~fin[1:] | ~fin[:-1]]))
+    if len(starts) < m:
+        ends = np.append(starts[1:], m) - 1
+        lengths = ends - starts + 1
+        yf = np.where(fin, py, 0)  ## runs containing non-finite points have a single point
+        pos = np.arange(m)
+        iMin = np.minimum.reduceat(
+            np.where(yf == np.repeat(np.minimum.reduceat(yf, starts), lengths), pos, m), starts)
+        iMax = np.minimum.reduceat(
+            np.where(yf == np.repeat(np.maximum.reduceat(yf, starts), lengths), pos, m), starts)
+        keep = np.unique(np.concatenate([starts, ends, iMin, iMax]))
+        inds = inds[keep]
+        px, py, fin = px[keep], py[keep], fin[keep]
+
+    if tolerance <= 0:
+        return inds
+
+    ## simplify each run of finite points separately
+    keep = np.ones(len(inds), dtype=bool)
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], fin.view(np.int8), [0]])))
+    for start, stop in zip(edges[::2], edges[1::2]):
+        if stop - start > 2:
+            keep[start:stop] = _simplifyRun(px[start:stop], py[start:stop], tolerance)
+    return inds[keep]
+
+
+def _simplifyRun(x, y, tolerance):
+    ## Ramer-Douglas-Peucker simplification; returns a mask of the points to keep.
+    ## Distances are measured to the line segment, so that points beyond the ends
+    ## of a segment (such as a line doubling back on itself) are not lost.
+    mask = np.zeros(len(x), dtype=bool)
+    mask[[0, -1]] = True
+    stack = [(0, len(x) - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        dx = x[b] - x[a]
+        dy = y[b] - y[a]
+        px = x[a+1:b] - x[a]
+        py = y[a+1:b] - y[a]
+        norm2 = dx * dx + dy * dy
+        if norm2 > 0:
+            t = np.clip((px * dx + py * dy) / norm2, 0, 1)
+            px = px - t * dx
+            py = py - t * dy
+        dist = np.hypot(px, py)
+        i = np.argmax(dist)
+        if dist[i] > tolerance:
+            i += a + 1
+            mask[i] = True
+            stack.append((a, i))
+            stack.append((i, b))
+    return mask
+
+
 def ndarray_from_qpolygonf(polyline):
     # polyline.data() will be None if the pointer was null.
     # voidptr(None) is the same as voidptr(0).
@@ -2328,12 +2570,70 @@ def isocurve(data, level, connected=False, extendToEdge=False, path=False):
                    vertex coordinates. This forces connected=True.
     ============== =========================================================
     
-    This function is SLOW; plenty of room for optimization here.
-    """    
+    To generate curves for several levels of the same data, use
+    :func:`isocurves`, which classifies the grid cells only once.
+    """
+    return isocurves(data, [level], connected=connected, extendToEdge=extendToEdge, path=path)[0]
+
+
+## Edges crossed by the isocurve for each of the 16 marching squares cell
+## configurations; each row holds up to two segments of (edge, edge), -1 if unused.
+## Corner k of a cell is at offset (k & 1, k >> 1); edge n runs between the corners
+## in _isoEdgeCorners[n].
+_isoSegmentEdges = np.array([
+    [[-1,-1], [-1,-1]],
+    [[ 0, 1], [-1,-1]],
+    [[ 1, 2], [-1,-1]],
+    [[ 0, 2], [-1,-1]],
+    [[ 0, 3], [-1,-1]],
+    [[ 1, 3], [-1,-1]],
+    [[ 0, 1], [ 2, 3]],
+    [[ 2, 3], [-1,-1]],
+    [[ 2, 3], [-1,-1]],
+    [[ 0, 1], [ 2, 3]],
+    [[ 1, 3], [-1,-1]],
+    [[ 0, 3], [-1,-1]],
+    [[ 0, 2], [-1,-1]],
+    [[ 1, 2], [-1,-1]],
+    [[ 0, 1], [-1,-1]],
+    [[-1,-1], [-1,-1]],
+], dtype=np.intp)
+_isoEdgeCorners = np.array([[2, 0], [0, 1], [1, 3], [3, 2]], dtype=np.intp)
+_isoCornerOffsets = np.array([[0, 0], [1, 0], [0, 1], [1, 1]], dtype=np.intp)
+
+
+def isocurves(data, levels, connected=False, extendToEdge=False, path=False):
+    """
+    Generate isocurves at several levels from 2D data using the marching squares
+    algorithm.
     
+    ============== =========================================================
+    **Arguments:**
+    data           2D numpy array of scalar values
+    levels         Sequence of levels at which to generate isocurves
+    connected      If False, return a single long list of point pairs for
+                   each level.
+                   If True, return multiple long lists of connected point 
+                   locations for each level.
+    extendToEdge   If True, extend the curves to reach the exact edges of 
+                   the data. 
+    path           if True, return a QPainterPath for each level rather 
+                   than a list of vertex coordinates. This forces 
+                   connected=True.
+    ============== =========================================================
+    
+    Returns a list with one item per level, each in the format returned by
+    :func:`isocurve`.
+    
+    The minimum and maximum of each grid cell are computed once; for each level
+    only the cells that the curve crosses are visited. Segments are joined into
+    connected lines by sorting their grid edge keys rather than by walking a
+    dictionary, so all of the work is done with array operations.
+    """
     if path is True:
         connected = True
     
+    data = np.asarray(data)
     if extendToEdge:
         d2 = np.empty((data.shape[0]+2, data.shape[1]+2), dtype=data.dtype)
         d2[1:-1, 1:-1] = data
@@ -2347,151 +2647,135 @@ def isocurve(data, level, connected=False, extendToEdge=False, path=False):
         d2[-1,-1] = d2[-1,-2]
         data = d2
     
-    sideTable = [
-        [],
-        [0,1],
-        [1,2],
-        [0,2],
-        [0,3],
-        [1,3],
-        [0,1,2,3],
-        [2,3],
-        [2,3],
-        [0,1,2,3],
-        [1,3],
-        [0,3],
-        [0,2],
-        [1,2],
-        [0,1],
-        []
-        ]
-    
-    edgeKey=[
-        [(0,1), (0,0)],
-        [(0,0), (1,0)],
-        [(1,0), (1,1)],
-        [(1,1), (0,1)]
-        ]
-    
-    
-    lines = []
-    
-    ## mark everything below the isosurface level
-    mask = data < level
-    
-    ### make four sub-fields and compute indexes for grid cells
-    index = np.zeros([x-1 for x in data.shape], dtype=np.ubyte)
-    fields = np.empty((2,2), dtype=object)
-    slices = [slice(0,-1), slice(1,None)]
-    for i in [0,1]:
-        for j in [0,1]:
-            fields[i,j] = mask[slices[i], slices[j]]
-            #vertIndex = i - 2*j*i + 3*j + 4*k  ## this is just to match Bourk's vertex numbering scheme
-            vertIndex = i+2*j
-            #print i,j,k," : ", fields[i,j,k], 2**vertIndex
-            np.add(index, fields[i,j] * 2**vertIndex, out=index, casting='unsafe')
-            #print index
-    #print index
-    
-    ## add lines
-    for i in range(index.shape[0]):                 # data x-axis
-        for j in range(index.shape[1]):             # data y-axis     
-            sides = sideTable[index[i,j]]
-            for l in range(0, len(sides), 2):     ## faces for this grid cell
-                edges = sides[l:l+2]
-                pts = []
-                for m in [0,1]:      # points in this face
-                    p1 = edgeKey[edges[m]][0] # p1, p2 are points at either side of an edge
-                    p2 = edgeKey[edges[m]][1]
-                    v1 = data[i+p1[0], j+p1[1]] # v1 and v2 are the values at p1 and p2
-                    v2 = data[i+p2[0], j+p2[1]]
-                    f = (level-v1) / (v2-v1)
-                    fi = 1.0 - f
-                    p = (    ## interpolate between corners
-                        p1[0]*fi + p2[0]*f + i + 0.5, 
-                        p1[1]*fi + p2[1]*f + j + 0.5
-                        )
-                    if extendToEdge:
-                        ## check bounds
-                        p = (
-                            min(data.shape[0]-2, max(0, p[0]-1)),
-                            min(data.shape[1]-2, max(0, p[1]-1)),                        
-                        )
-                    if connected:
-                        gridKey = i + (1 if edges[m]==2 else 0), j + (1 if edges[m]==3 else 0), edges[m]%2
-                        pts.append((p, gridKey))  ## give the actual position and a key identifying the grid location (for connecting segments)
-                    else:
-                        pts.append(p)
-                
-                lines.append(pts)
-
-    if not connected:
-        return lines
-                
-    ## turn disjoint list of segments into continuous lines
-
-    #lines = [[2,5], [5,4], [3,4], [1,3], [6,7], [7,8], [8,6], [11,12], [12,15], [11,13], [13,14]]
-    #lines = [[(float(a), a), (float(b), b)] for a,b in lines]
-    points = {}  ## maps each point to its connections
-    for a,b in lines:
-        if a[1] not in points:
-            points[a[1]] = []
-        points[a[1]].append([a,b])
-        if b[1] not in points:
-            points[b[1]] = []
-        points[b[1]].append([b,a])
-
-    ## rearrange into chains
-    for k in list(points.keys()):
-        try:
-            chains = points[k]
-        except KeyError:   ## already used this point elsewhere
+    ## classify grid cells: the curve at *level* crosses a cell only if
+    ## cellMin < level <= cellMax
+    corners = [data[:-1, :-1], data[1:, :-1], data[:-1, 1:], data[1:, 1:]]
+    cellMin = np.minimum(np.minimum(corners[0], corners[1]), np.minimum(corners[2], corners[3])).ravel()
+    cellMax = np.maximum(np.maximum(corners[0], corners[1]), np.maximum(corners[2], corners[3])).ravel()
+    del corners
+    
+    flat = data.ravel()
+    width = data.shape[1]
+    ncols = width - 1
+    cornerOffsets = _isoCornerOffsets[:, 0] * width + _isoCornerOffsets[:, 1]
+    
+    results = []
+    for level in levels:
+        cells = np.flatnonzero((cellMin < level) & (cellMax >= level))
+        i, j = np.divmod(cells, ncols)
+        vals = flat[(i * width + j)[:, np.newaxis] + cornerOffsets].astype(np.float64)
+        index = (vals < level).dot(1 << np.arange(4))
+        
+        ## one row per segment, ordered by cell and then by segment within the cell
+        segEdges = _isoSegmentEdges[index]
+        cellInd, segInd = np.nonzero(segEdges[:, :, 0] >= 0)
+        edges = segEdges[cellInd, segInd]    # (nSegments, 2)
+        
+        ## interpolate the position of both end points of each segment
+        c1 = _isoEdgeCorners[edges, 0]
+        c2 = _isoEdgeCorners[edges, 1]
+        v1 = vals[cellInd[:, np.newaxis], c1]
+        v2 = vals[cellInd[:, np.newaxis], c2]
+        f = ((level - v1) / (v2 - v1))[..., np.newaxis]
+        ij = np.stack([i[cellInd], j[cellInd]], axis=-1)[:, np.newaxis, :]
+        pts = _isoCornerOffsets[c1] * (1.0 - f) + _isoCornerOffsets[c2] * f + ij + 0.5
+        if extendToEdge:
+            ## check bounds
+            pts -= 1
+            np.clip(pts, 0, np.array(data.shape) - 2, out=pts)
+        
+        if not connected:
+            results.append([[(x1, y1), (x2, y2)] for x1, y1, x2, y2 in pts.reshape(-1, 4).tolist()])
             continue
-        #print "===========", k
-        for chain in chains:
-            #print "  chain:", chain
-            x = None
-            while True:
-                if x == chain[-1][1]:
-                    break ## nothing left to do on this chain
-                    
-                x = chain[-1][1]
-                if x == k:  
-                    break ## chain has looped; we're done and can ignore the opposite chain
-                y = chain[-2][1]
-                connects = points[x]
-                for conn in connects[:]:
-                    if conn[1][1] != y:
-                        #print "    ext:", conn
-                        chain.extend(conn[1:])
-                #print "    del:", x
-                del points[x]
-            if chain[0][1] == chain[-1][1]:  # looped chain; no need to continue the other direction
-                chains.pop()
-                break
-                
+        
+        ## a key identifying the grid edge on which each end point lies
+        gi = ij[..., 0] + (edges == 2)
+        gj = ij[..., 1] + (edges == 3)
+        keys = (gi * width + gj) * 2 + (edges % 2)
+        lines = _joinIsocurveSegments(pts.reshape(-1, 2), keys.ravel())
+        
+        if not path:
+            results.append([[tuple(p) for p in line.tolist()] for line in lines])
+            continue
+        
+        if len(lines) == 0:
+            results.append(QtGui.QPainterPath())
+            continue
+        linePts = np.concatenate(lines)
+        connect = np.ones(len(linePts), dtype=bool)
+        connect[np.cumsum([len(line) for line in lines]) - 1] = False
+        results.append(arrayToQPath(linePts[:, 0], linePts[:, 1], connect=connect, finiteCheck=False))
+    
+    return results
+
+
+def _joinIsocurveSegments(pts, keys):
+    ## Join line segments into connected lines. Segment s runs from pts[2*s] to
+    ## pts[2*s+1]; segments meet where their end points share a key, and each key is
+    ## shared by at most two end points, so the lines are simple chains and loops.
+    ##
+    ## Every segment is traversed in both directions ("darts"); dart 2*s+k starts at
+    ## end point 2*s+k and ends at end point 2*s+(1-k). The successor of a dart is the
+    ## dart leaving its end point through the other segment at that key. The chains of
+    ## darts are then ordered by pointer jumping.
+    n = len(keys)
+    if n == 0:
+        return []
+    end = n
+    
+    order = np.argsort(keys, kind='stable')
+    shared = keys[order[1:]] == keys[order[:-1]]
+    partner = np.full(n + 1, end, dtype=np.intp)
+    partner[order[:-1][shared]] = order[1:][shared]
+    partner[order[1:][shared]] = order[:-1][shared]
+    
+    darts = np.arange(n + 1)
+    succ = np.append(partner[darts[:n] ^ 1], end)
+    
+    ## For each dart, find the last dart of its chain and the number of darts
+    ## remaining until then. Darts in loops never reach the end; for those find the
+    ## smallest dart of the loop and the distance to it instead. A loop has been
+    ## covered once the two halves of a jump reach the same smallest dart.
+    nxt = succ.copy()
+    last = np.where(succ == end, darts, -1)
+    remaining = (succ != end).astype(np.intp)
+    remaining[end] = 0
+    label = darts.copy()
+    toLabel = np.zeros(n + 1, dtype=np.intp)
+    done = last >= 0
+    jump = 1
+    while not done[:n].all():
+        nextLabel = label[nxt]
+        done |= nextLabel == label
+        toLabel = np.where(nextLabel < label, toLabel[nxt] + jump, toLabel)
+        label = np.minimum(label, nextLabel)
+        last = np.where(last < 0, last[nxt], last)
+        remaining += remaining[nxt]
+        nxt = nxt[nxt]
+        done |= last >= 0
+        jump *= 2
+    inLoop = last[:n] < 0
+    
+    ## chains are ordered by the number of darts remaining; loops start at their
+    ## smallest dart
+    chain = np.where(inLoop, label[:n], last[:n])
+    loopLen = np.maximum(np.bincount(label[:n][inLoop], minlength=n)[label[:n]], 1)
+    position = np.where(inLoop, -toLabel[:n] % loopLen, -remaining[:n])
+    
+    ## every chain is found once in each direction; keep only one of them
+    rev = darts[:n] ^ 1
+    keep = np.where(inLoop, label[:n] < label[rev], last[:n] > last[rev])
+    kept = np.flatnonzero(keep)
+    kept = kept[np.lexsort((position[kept], chain[kept]))]
+    
+    ## each line is the start of its first dart followed by the ends of all darts;
+    ## loops end where they started
+    chain = chain[kept]
+    starts = np.flatnonzero(np.r_[True, chain[1:] != chain[:-1]])
+    linePts = np.insert(pts[kept ^ 1], starts, pts[kept[starts]], axis=0)
+    return np.split(linePts, starts[1:] + np.arange(1, len(starts)))
+
 
-    ## extract point locations 
-    lines = []
-    for chain in points.values():
-        if len(chain) == 2:
-            chain = chain[1][1:][::-1] + chain[0]  # join together ends of chain
-        else:
-            chain = chain[0]
-        lines.append([p[0] for p in chain])
-    
-    if not path:
-        return lines ## a list of pairs of points
-    
-    path = QtGui.QPainterPath()
-    for line in lines:
-        path.moveTo(*line[0])
-        for p in line[1:]:
-            path.lineTo(*p)
-    
-    return path
-    
-    
 def traceImage(image, values, smooth=0.5):
     """
     Convert an image to a set of QPainterPath curves.
@@ -2528,18 +2812,114 @@ def traceImage(image, values, smooth=0.5):
     
     
 IsosurfaceDataCache = None
-def isosurface(data, level):
+def isosurface(data, level, chunkSize=None, workers=None, executor=None):
     """
     Generate isosurface from volumetric data using marching cubes algorithm.
     See Paul Bourke, "Polygonising a Scalar Field"  
     (http://paulbourke.net/geometry/polygonise/)
     
-    *data*   3D numpy array of scalar values. Must be contiguous.
-    *level*  The level at which to generate an isosurface
+    ============== ==========================================================
+    **Arguments:**
+    data           3D numpy array of scalar values. Must be contiguous unless
+                   the volume is processed in chunks.
+    level          The level at which to generate an isosurface
+    chunkSize      If given, the volume is processed in slabs of *chunkSize*
+                   cells along the first axis. Each slab only allocates
+                   intermediate arrays for its own cells, so memory use is
+                   bounded by the slab size rather than the volume size.
+                   Vertices on the boundaries between slabs are merged.
+    workers        Number of threads used to process slabs concurrently.
+                   Implies chunked processing (with *chunkSize* defaulting
+                   to 64).
+    executor       Optional :class:`concurrent.futures.Executor` (for example a
+                   ProcessPoolExecutor) used to process slabs instead of a
+                   thread pool. Implies chunked processing.
+    ============== ==========================================================
     
     Returns an array of vertex coordinates (Nv, 3) and an array of 
-    per-face vertex indexes (Nf, 3)    
+    per-face vertex indexes (Nf, 3). Chunked processing returns the same
+    surface, but the vertexes may be ordered differently.
     """
+    if chunkSize is None and workers is None and executor is None:
+        return _isosurface(data, level)[:2]
+    if chunkSize is None:
+        chunkSize = 64
+    return _isosurfaceChunked(data, level, int(chunkSize), workers, executor)
+
+
+def _isosurfaceSlab(slab, level):
+    return _isosurface(np.ascontiguousarray(slab), level)
+
+
+def _isosurfaceChunked(data, level, chunkSize, workers, executor):
+    ## Process the volume in slabs along axis 0; adjacent slabs share one plane of data.
+    nCells = data.shape[0] - 1
+    starts = list(range(0, max(nCells, 0), max(chunkSize, 1)))
+    seamShape = tuple(data.shape[1:]) + (3,)
+    
+    def seamKeys(vertexInds, sel):
+        ## vertexes on a seam plane are identified by their (y, z, edge direction)
+        return np.ravel_multi_index((vertexInds[sel, 1], vertexInds[sel, 2], vertexInds[sel, 3]), seamShape)
+    
+    ownExecutor = executor is None
+    if ownExecutor:
+        executor = concurrent.futures.ThreadPoolExecutor(workers)
+    maxPending = 2 * getattr(executor, '_max_workers', workers or 1)
+    
+    allVerts = []
+    allFaces = []
+    nVerts = 0
+    prevKeys = prevIds = None
+    try:
+        ## submit slabs gradually so that no more than maxPending are in flight
+        pending = collections.deque()
+        startIter = iter(starts)
+        for start in startIter:
+            pending.append((start, executor.submit(_isosurfaceSlab, data[start:start+chunkSize+1], level)))
+            if len(pending) >= maxPending:
+                break
+        while pending:
+            start, future = pending.popleft()
+            for nextStart in startIter:
+                pending.append((nextStart, executor.submit(_isosurfaceSlab, data[nextStart:nextStart+chunkSize+1], level)))
+                break
+            verts, faces, vertexInds = future.result()
+            
+            ## vertexes on the first plane of this slab were already generated by the 
+            ## previous slab (edges along axis 0 are never on the plane)
+            onEdge = vertexInds[:, 3] != 0
+            seam = onEdge & (vertexInds[:, 0] == 0) if start > 0 else np.zeros(len(verts), dtype=bool)
+            newVerts = ~seam
+            nNew = int(newVerts.sum())
+            
+            remap = np.empty(len(verts), dtype=np.uint32)
+            remap[newVerts] = np.arange(nVerts, nVerts + nNew, dtype=np.uint32)
+            if seam.any():
+                remap[seam] = prevIds[np.searchsorted(prevKeys, seamKeys(vertexInds, seam))]
+            
+            verts = verts[newVerts]
+            verts[:, 0] += start
+            allVerts.append(verts)
+            allFaces.append(remap[faces])
+            nVerts += nNew
+            
+            last = onEdge & (vertexInds[:, 0] == min(chunkSize, nCells - start))
+            keys = seamKeys(vertexInds, last)
+            order = np.argsort(keys)
+            prevKeys = keys[order]
+            prevIds = remap[last][order]
+    finally:
+        if ownExecutor:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    if len(allVerts) == 0:
+        return np.empty((0, 3), dtype=np.float32), np.empty((0, 3), dtype=np.uint32)
+    return np.concatenate(allVerts), np.concatenate(allFaces)
+
+
+def _isosurface(data, level):
+    ## Returns vertexes, faces, and the (x, y, z, edge direction) grid edge of each vertex
+    
     ## For improvement, see:
     ## 
     ## Efficient implementation of Marching Cubes' cases with topological guarantees.
@@ -2986,7 +3366,7 @@ def isosurface(data, level):
         #profiler()
         ptr += nv
         
-    return vertexes, faces
+    return vertexes, faces, vertexInds
 
     
 def _pinv_fallback(tr):
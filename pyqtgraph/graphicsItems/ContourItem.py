@@ -0,0 +1,144 @@
+from .. import functions as fn
+from .. import getConfigOption
+from ..Qt import QtCore
+from .GraphicsObject import GraphicsObject
+
+__all__ = ['ContourItem']
+
+class ContourItem(GraphicsObject):
+    """
+    **Bases:** :class:`GraphicsObject <pyqtgraph.GraphicsObject>`
+
+    Item displaying isocurves of a 2D array at several levels. To align this item
+    correctly with an ImageItem, call ``contour.setParentItem(image)``.
+
+    The curve for each level is cached. Changing the levels only generates curves
+    for the levels that were added, and all missing levels are generated together
+    using :func:`isocurves <pyqtgraph.functions.isocurves>`. Setting new data
+    discards the cache.
+    """
+    def __init__(self, data=None, levels=(), pen='w', axisOrder=None):
+        """
+        Create a new contour item.
+
+        ==============  ===============================================================
+        **Arguments:**
+        data            A 2-dimensional ndarray. Can be initialized as None, and set
+                        later using :func:`setData <pyqtgraph.ContourItem.setData>`
+        levels          Sequence of values at which to draw isocurves.
+        pen             The default color of the curves. Can be anything valid for
+                        :func:`mkPen <pyqtgraph.mkPen>`. Pens for individual levels
+                        are set with :func:`setLevelPen <pyqtgraph.ContourItem.setLevelPen>`
+        axisOrder       May be either 'row-major' or 'col-major'. By default this uses
+                        the ``imageAxisOrder``
+                        :ref:`global configuration option <apiref_config>`.
+        ==============  ===============================================================
+        """
+        GraphicsObject.__init__(self)
+
+        self.data = None
+        self._levels = []
+        self._paths = {}       ## maps {level: QPainterPath}
+        self._levelPens = {}   ## maps {level: QPen}
+        self._boundingRect = None
+        self.axisOrder = getConfigOption('imageAxisOrder') if axisOrder is None else axisOrder
+        self.setPen(pen)
+        self.setData(data, levels)
+
+    def setData(self, data, levels=None):
+        """
+        Set the data/image to draw isocurves for.
+
+        ==============  ========================================================================
+        **Arguments:**
+        data            A 2-dimensional ndarray.
+        levels          The values at which to draw isocurves. If levels is not specified,
+                        the previously set levels are used.
+        ==============  ========================================================================
+        """
+        self.prepareGeometryChange()
+        self.data = data
+        self._paths = {}
+        if levels is not None:
+            self._levels = [float(lv) for lv in levels]
+        self._invalidate()
+
+    def setLevels(self, levels):
+        """
+        Set the values at which isocurves are drawn. Curves already generated for
+        levels that are still present are reused.
+        """
+        self.prepareGeometryChange()
+        self._levels = [float(lv) for lv in levels]
+        self._paths = {lv: path for lv, path in self._paths.items() if lv in self._levels}
+        self._invalidate()
+
+    def levels(self):
+        """Return the list of values at which isocurves are drawn."""
+        return list(self._levels)
+
+    def setPen(self, *args, **kwargs):
+        """Set the default pen used to draw the isocurves. Arguments can be any that are
+        valid for :func:`mkPen <pyqtgraph.mkPen>`"""
+        self.pen = fn.mkPen(*args, **kwargs)
+        self.update()
+
+    def setLevelPen(self, level, *args, **kwargs):
+        """Set the pen used to draw the isocurve at *level*. Arguments after *level* can
+        be any that are valid for :func:`mkPen <pyqtgraph.mkPen>`; if none are given, the
+        default pen is used for this level."""
+        if len(args) == 0 and len(kwargs) == 0:
+            self._levelPens.pop(float(level), None)
+        else:
+            self._levelPens[float(level)] = fn.mkPen(*args, **kwargs)
+        self.update()
+
+    def path(self, level):
+        """Return the QPainterPath of the isocurve drawn at *level*."""
+        level = float(level)
+        if level not in self._levels:
+            raise ValueError("No isocurve is drawn at level %g" % level)
+        self.generatePaths()
+        return self._paths[level]
+
+    def _invalidate(self):
+        ## prepareGeometryChange() must already have been called, before the
+        ## data or levels were replaced, so the scene can still query the old bounds
+        self._boundingRect = None
+        self.update()
+
+    def generatePaths(self):
+        """Generate the curves for all levels that are not yet cached."""
+        if self.data is None:
+            return
+        missing = [lv for lv in self._levels if lv not in self._paths]
+        if len(missing) == 0:
+            return
+
+        if self.axisOrder == 'row-major':
+            data = self.data.T
+        else:
+            data = self.data
+
+        paths = fn.isocurves(data, missing, extendToEdge=True, path=True)
+        self._paths.update(zip(missing, paths))
+        self._boundingRect = None
+
+    def boundingRect(self):
+        if self.data is None:
+            return QtCore.QRectF()
+        self.generatePaths()
+        if self._boundingRect is None:
+            rect = QtCore.QRectF()
+            for lv in self._levels:
+                rect = rect.united(self._paths[lv].boundingRect())
+            self._boundingRect = rect
+        return self._boundingRect
+
+    def paint(self, p, *args):
+        if self.data is None:
+            return
+        self.generatePaths()
+        for lv in self._levels:
+            p.setPen(self._levelPens.get(lv, self.pen))
+            p.drawPath(self._paths[lv])
@@ -4,7 +4,7 @@ import weakref
 import numpy as np
 
 from .. import functions as fn
-from ..colormap import ColorMap
+from ..colormap import ColorMap, _cachedLookupTable
 from ..Qt import QtCore, QtGui, QtWidgets
 from ..widgets.SpinBox import SpinBox
 from ..widgets.ColorMapMenu import ColorMapMenu
@@ -700,17 +700,35 @@ class GradientEditorItem(TickSliderItem):
         """
         if alpha is None:
             alpha = self.usesAlpha()
-        if alpha:
-            table = np.empty((nPts,4), dtype=np.ubyte)
-        else:
-            table = np.empty((nPts,3), dtype=np.ubyte)
-            
-        for i in range(nPts):
-            x = float(i)/(nPts-1)
-            color = self.getColor(x, toQColor=False)
-            table[i] = color[:table.shape[1]]
-            
-        return table
+        ticks = self.listTicks()
+        pos = tuple([x for t, x in ticks])
+        colors = tuple([t.color.getRgb() for t, x in ticks])
+        ## tables are shared with all gradients (and color maps) that have the same state
+        key = ('gradient', self.colorMode, pos, colors, int(nPts), bool(alpha))
+        return _cachedLookupTable(key, lambda: self._makeLookupTable(pos, colors, nPts, alpha))
+        
+    def _makeLookupTable(self, pos, colors, nPts, alpha):
+        nColors = 4 if alpha else 3
+        if self.colorMode != 'rgb':
+            table = np.empty((nPts,nColors), dtype=np.ubyte)
+            for i in range(nPts):
+                x = float(i)/(nPts-1)
+                color = self.getColor(x, toQColor=False)
+                table[i] = color[:nColors]
+            return table
+        
+        ## same interpolation as getColor(), evaluated for all points at once
+        pos = np.array(pos)
+        colors = np.array(colors, dtype=float)
+        x = np.arange(nPts) / (nPts-1) if nPts > 1 else np.zeros(nPts)
+        i = np.clip(np.searchsorted(pos, x, side='left'), 1, len(pos)-1)
+        x1 = pos[i-1]
+        dx = pos[i] - x1
+        f = np.divide(x - x1, dx, out=np.zeros(nPts), where=dx != 0)[:, np.newaxis]
+        table = colors[i-1] * (1.-f) + colors[i] * f
+        table[x <= pos[0]] = colors[0]
+        table[x >= pos[-1]] = colors[-1]
+        return table[:, :nColors].astype(np.ubyte)
     
     def usesAlpha(self):
         """Return True if any ticks have an alpha < 255"""
@@ -89,6 +89,7 @@ class HistogramLUTItem(GraphicsWidget):
                  gradientPosition='right', orientation='vertical'):
         GraphicsWidget.__init__(self)
         self.lut = None
+        self._lutKey = None
         self.imageItem = lambda: None  # fake a dead weakref
         self.levelMode = levelMode
         self.orientation = orientation
@@ -317,8 +318,11 @@ class HistogramLUTItem(GraphicsWidget):
                 n = 256
             else:
                 n = 512
-        if self.lut is None:
+        if self.lut is None or self._lutKey != (n, alpha):
+            ## generated tables are cached by the gradient, so this is cheap when
+            ## several items share the same gradient
             self.lut = self.gradient.getLookupTable(n, alpha=alpha)
+            self._lutKey = (n, alpha)
         return self.lut
 
     @QtCore.Slot()
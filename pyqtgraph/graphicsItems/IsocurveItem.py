@@ -1,6 +1,6 @@
 from .. import functions as fn
 from .. import getConfigOption
-from ..Qt import QtCore, QtGui
+from ..Qt import QtCore
 from .GraphicsObject import GraphicsObject
 
 __all__ = ['IsocurveItem']
@@ -95,12 +95,7 @@ class IsocurveItem(GraphicsObject):
         else:
             data = self.data
         
-        lines = fn.isocurve(data, self.level, connected=True, extendToEdge=True)
-        self.path = QtGui.QPainterPath()
-        for line in lines:
-            self.path.moveTo(*line[0])
-            for p in line[1:]:
-                self.path.lineTo(*p)
+        self.path = fn.isocurve(data, self.level, extendToEdge=True, path=True)
     
     def paint(self, p, *args):
         if self.data is None:
@@ -833,13 +833,16 @@ class PlotCurveItem(GraphicsObject):
         if self.fillPath is not None:
             return self.fillPath
 
-        path = QtGui.QPainterPath(self.getPath())
-        self.fillPath = path
+        x, y = self.getData()
+        self.fillPath = self._makeFillPath(self.getPath(), x, y)
+        return self.fillPath
+
+    def _makeFillPath(self, curvePath, x, y):
+        path = QtGui.QPainterPath(curvePath)
         if self.opts['fillLevel'] == 'enclosed':
             return path
 
         baseline = self.opts['fillLevel']
-        x, y = self.getData()
         lx, rx = x[[0, -1]]
         ly, ry = y[[0, -1]]
 
@@ -851,6 +854,30 @@ class PlotCurveItem(GraphicsObject):
 
         return path
 
+    def _getDecimatedPath(self, tr):
+        ## When exporting with the 'decimate' option, the curve is reduced to the
+        ## points that are needed to draw it at the output resolution, as given by
+        ## the painter transform *tr*. Returns (path, x, y), or None if the curve
+        ## cannot be decimated.
+        connect = self.opts['connect']
+        if (
+            self.opts['stepMode']
+            or not (isinstance(connect, str) and connect in ['all', 'finite'])
+        ):
+            return None
+        x, y = self.getData()
+        px = tr.m11() * x + tr.m21() * y + tr.dx()
+        py = tr.m12() * x + tr.m22() * y + tr.dy()
+        xRange = None
+        viewRect = self.viewRect()
+        if viewRect is not None and tr.m12() == 0 and tr.m21() == 0:
+            viewRect = tr.mapRect(viewRect)
+            xRange = (viewRect.left(), viewRect.right())
+        inds = fn.simplifyPolyline(px, py, self._exportOpts.get('tolerance', 0.1), xRange=xRange)
+        x = x[inds]
+        y = y[inds]
+        return self.generatePath(x, y), x, y
+
     def _shouldUseFillPathList(self):
         connect = self.opts['connect']
         return (
@@ -990,8 +1017,17 @@ class PlotCurveItem(GraphicsObject):
         )
         do_fill_outline = do_fill and self.opts['fillOutline']
 
+        decimated = None
+        if self._exportOpts is not False and self._exportOpts.get('decimate', False):
+            decimated = self._getDecimatedPath(p.transform())
+        if decimated is not None:
+            exportPath, x, y = decimated
+            exportFillPath = self._makeFillPath(exportPath, x, y) if do_fill else None
+
         if do_fill:
-            if self._shouldUseFillPathList():
+            if decimated is not None:
+                paths = [exportFillPath]
+            elif self._shouldUseFillPathList():
                 paths = self._getFillPathList(widget)
             else:
                 paths = [self._getFillPath()]
@@ -1007,7 +1043,9 @@ class PlotCurveItem(GraphicsObject):
                 continue
             p.setPen(pen)
 
-            if self._shouldUseDrawLineSegments(pen):
+            if decimated is not None:
+                p.drawPath(exportFillPath if do_fill_outline else exportPath)
+            elif self._shouldUseDrawLineSegments(pen):
                 p.drawLines(*self._getLineSegments())
                 if do_fill_outline:
                     p.drawLines(self._getClosingSegments())
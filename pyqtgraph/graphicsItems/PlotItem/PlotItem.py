@@ -29,6 +29,91 @@ from . import plotConfigTemplate_generic as ui_template
 __all__ = ['PlotItem']
 
 
+class _RunningAverage:
+    """
+    Accumulates the curves that are averaged into a single average curve.
+
+    All buffers are allocated once per curve shape and updated in place, so adding
+    a curve only costs a few vectorized operations on existing arrays. Non-finite
+    samples are excluded from the average on a per-sample basis.
+
+    ``mode`` is one of ``'mean'`` (average of all curves added), ``'window'``
+    (average of the last `window` curves) or ``'ema'`` (exponential moving average
+    in which each new curve has weight `alpha`).
+    """
+    def __init__(self, plot, mode='mean', window=None, alpha=None):
+        self.plot = plot
+        self.mode = mode
+        self.window = window
+        self.alpha = alpha
+        self.count = 0
+        self.x = None
+        self.y = None  # the average; passed to plot.setData and updated in place
+        self._sum = None
+        self._counts = None
+        self._history = None
+        self._historyMask = None
+        self._tmp = None
+        self._mask = None
+        self._mask2 = None
+
+    def __getitem__(self, index):
+        # backwards compatibility with the former ``[count, plot]`` entries
+        return (self.count, self.plot)[index]
+
+    def _reset(self, x, y):
+        shape = y.shape
+        self.count = 0
+        self.x = np.array(x, copy=True)
+        self.y = np.full(shape, np.nan)
+        self._sum = np.zeros(shape)
+        self._counts = np.zeros(shape, dtype=np.intp)
+        self._tmp = np.empty(shape)
+        self._mask = np.empty(shape, dtype=bool)
+        self._mask2 = np.empty(shape, dtype=bool)
+        if self.mode == 'window':
+            self._history = np.zeros((self.window,) + shape)
+            self._historyMask = np.zeros((self.window,) + shape, dtype=bool)
+
+    def add(self, x, y, stepMode=None):
+        """Add curve data `y` to the average and update the average curve."""
+        y = np.asarray(y)
+        if self.y is None or y.shape != self.y.shape:
+            # note that if shapes do not match, then the average resets.
+            self._reset(x, y)
+
+        mask = self._mask
+        np.isfinite(y, out=mask)
+        if self.mode == 'ema':
+            # y_avg += alpha * (y - y_avg), seeding samples that have no value yet
+            avg = self.y
+            np.subtract(y, avg, out=self._tmp, where=mask)
+            self._tmp *= self.alpha
+            np.add(avg, self._tmp, out=avg, where=mask)
+            np.isnan(avg, out=self._mask2)
+            np.logical_and(self._mask2, mask, out=self._mask2)
+            np.copyto(avg, y, where=self._mask2, casting='unsafe')
+        else:
+            # non-finite samples contribute 0 to the sum and are not counted
+            self._tmp.fill(0.0)
+            np.copyto(self._tmp, y, where=mask, casting='unsafe')
+            if self.mode == 'window':
+                slot = self.count % self.window
+                if self.count >= self.window:
+                    self._sum -= self._history[slot]
+                    self._counts -= self._historyMask[slot]
+                self._history[slot] = self._tmp
+                self._historyMask[slot] = mask
+            self._sum += self._tmp
+            self._counts += mask
+            np.greater(self._counts, 0, out=mask)
+            self.y.fill(np.nan)
+            np.divide(self._sum, self._counts, out=self.y, where=mask)
+        self.count += 1
+
+        self.plot.setData(self.x, self.y, stepMode=stepMode)
+
+
 class PlotItem(GraphicsWidget):
     """
     GraphicsWidget implementing a standard 2D plotting area with axes.
@@ -209,6 +294,7 @@ class PlotItem(GraphicsWidget):
         self.dataItems = []
         self.paramList = {}
         self.avgCurves = {}
+        self._avgOpts = {'mode': 'mean', 'window': None, 'alpha': None}
         # Change these properties to adjust the appearance of the averaged curve:
         self.avgPen = fn.mkPen((0, 200, 0))
         self.avgShadowPen = fn.mkPen((0, 0, 0), width=4)
@@ -493,7 +579,7 @@ class PlotItem(GraphicsWidget):
         if b:
             self.recomputeAverages()
         for k in self.avgCurves:
-            self.avgCurves[k][1].setVisible(b)
+            self.avgCurves[k].plot.setVisible(b)
         
     @QtCore.Slot(QtWidgets.QListWidgetItem)
     def avgParamListClicked(self, item):
@@ -505,9 +591,10 @@ class PlotItem(GraphicsWidget):
         if not self.ctrl.averageGroup.isChecked():
             return
         for k in self.avgCurves:
-            self.removeItem(self.avgCurves[k][1])
+            self.removeItem(self.avgCurves[k].plot)
         self.avgCurves = {}
-        for c in self.curves:
+        # iterate over a copy; the new average curves are appended to self.curves
+        for c in self.curves[:]:
             self.addAvgCurve(c)
         self.replot()
         
@@ -552,19 +639,66 @@ class PlotItem(GraphicsWidget):
             plot.setAlpha(1.0, False)
             plot.setZValue(100)
             self.addItem(plot, skipAverage=True)
-            self.avgCurves[key] = [0, plot]
-        self.avgCurves[key][0] += 1
-        (n, plot) = self.avgCurves[key]
+            self.avgCurves[key] = _RunningAverage(plot, **self._avgOpts)
 
         ### Average data together
         (x, y) = curve.getData()
-        stepMode = curve.opts['stepMode']
-        if plot.yData is not None and y.shape == plot.yData.shape:
-            # note that if shapes do not match, then the average resets.
-            newData = plot.yData * (n-1) / float(n) + y * 1.0 / float(n)
-            plot.setData(plot.xData, newData, stepMode=stepMode)
+        if y is None:
+            return
+        self.avgCurves[key].add(x, y, stepMode=curve.opts['stepMode'])
+
+    def setAverageMode(self, mode='mean', window=None, alpha=None):
+        """
+        Set how curves are combined into the average curves.
+
+        The averages are accumulated in place, so adding a curve does not
+        reallocate the average curve's data. Changing the mode recomputes the
+        averages from the curves currently in the plot.
+
+        Parameters
+        ----------
+        mode : {'mean', 'window', 'ema'}, optional
+            ``'mean'`` averages all curves, ``'window'`` averages only the last
+            `window` curves and ``'ema'`` computes an exponential moving average.
+            Default is ``'mean'``.
+        window : int or None, optional
+            Number of curves averaged in ``'window'`` mode.
+        alpha : float or None, optional
+            Weight of each new curve in ``'ema'`` mode, in the range ``(0, 1]``.
+
+        Raises
+        ------
+        ValueError
+            Raised if `mode` is not recognized, or if the `window` or `alpha`
+            required by `mode` is missing or out of range.
+        """
+        if mode == 'mean':
+            window = alpha = None
+        elif mode == 'window':
+            if window is None or int(window) < 1:
+                raise ValueError("window mode requires a window of at least 1 curve.")
+            window = int(window)
+            alpha = None
+        elif mode == 'ema':
+            if alpha is None or not 0 < alpha <= 1:
+                raise ValueError("ema mode requires alpha in the range (0, 1].")
+            window = None
         else:
-            plot.setData(x, y, stepMode=stepMode)
+            raise ValueError("mode argument must be 'mean', 'window', or 'ema'.")
+        self._avgOpts = {'mode': mode, 'window': window, 'alpha': alpha}
+        self.recomputeAverages()
+
+    def averageMode(self) -> dict:
+        """
+        Return the current averaging options.
+
+        Returns
+        -------
+        dict
+            Dictionary with keys ``'mode'``, ``'window'`` and ``'alpha'``, as
+            accepted by :meth:`setAverageMode`.
+        """
+        return self._avgOpts.copy()
         
     @QtCore.Slot()
     def autoBtnClicked(self):
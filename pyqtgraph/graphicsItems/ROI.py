@@ -31,7 +31,7 @@ __all__ = [
     'ROI', 
     'TestROI', 'RectROI', 'EllipseROI', 'CircleROI', 
     'LineROI', 'MultiLineROI', 'MultiRectROI', 'LineSegmentROI', 'PolyLineROI', 
-    'CrosshairROI','TriangleROI'
+    'CrosshairROI','TriangleROI', 'ROIStatistics', 'roiStatistics'
 ]
 
 
@@ -1168,6 +1168,10 @@ class ROI(GraphicsObject):
         data from images that have been transformed, for determining the location of each value
         in the sliced data.
         
+        If the ROI is not rotated relative to the image and lies on whole pixels, the
+        region may be returned as a view of *data* rather than a copy; see
+        :func:`affineSlice <pyqtgraph.affineSlice>`.
+        
         All extra keyword arguments are passed to :func:`affineSlice <pyqtgraph.affineSlice>`.
         """
         # this is a hidden argument for internal use
@@ -2382,3 +2386,204 @@ class TriangleROI(ROI):
 
     def getArrayRegion(self, *args, **kwds):
         return self._getArrayRegionForArbitraryShape(*args, **kwds)
+
+
+class ROIStatistics(object):
+    """
+    Computes statistics of image data inside many ROIs at once.
+
+    For each ROI, the indexes of the data pixels whose centers lie inside the
+    ROI shape are computed once and cached. The values of all ROIs are then
+    gathered with a single indexing operation and reduced per ROI, so computing
+    statistics of a new frame does not require any per-ROI work on the data.
+    Index lists are only recomputed for ROIs whose shape, mapped into data
+    coordinates, has changed since the previous call (this includes changes to
+    the transform of *img*).
+
+    Overlapping ROIs are supported; a pixel contributes to every ROI that
+    contains it.
+
+    ==============  ==============================================================
+    **Arguments:**
+    rois            Sequence of ROIs.
+    img             (ImageItem or other suitable QGraphicsItem) Used to determine
+                    the relationship between the ROIs and the boundaries of the
+                    data, as in :func:`ROI.getArrayRegion <pyqtgraph.ROI.getArrayRegion>`.
+                    If None, the scene coordinates of the ROIs are taken to be
+                    data coordinates (x along *axes[0]*, y along *axes[1]*).
+    axes            (length-2 tuple) The axes in the data that correspond to the
+                    (x, y) axes of *img* ((y, x) for row-major images).
+    ==============  ==============================================================
+
+    Example::
+
+        stats = pg.ROIStatistics(rois, img=imageItem)
+        for frame in frames:
+            result = stats.compute(frame, stats=('mean', 'max'))
+            means = result['mean']   # one value per ROI
+    """
+
+    statNames = ('mean', 'sum', 'min', 'max', 'std', 'count')
+
+    def __init__(self, rois=(), img=None, axes=(0, 1)):
+        self.img = img
+        self.axes = tuple(axes)
+        self.rois = []
+        self._indexes = {}  ## maps {roi: (key, flat data indexes)}
+        self._concat = None  ## (all indexes, segment offsets, counts) for self.rois
+        self.setROIs(rois)
+
+    def setROIs(self, rois):
+        """Set the list of ROIs for which statistics are computed. Cached
+        indexes of ROIs that remain in the list are kept."""
+        self.rois = list(rois)
+        self._indexes = {roi: v for roi, v in self._indexes.items() if roi in self.rois}
+        self._concat = None
+
+    def addROI(self, roi):
+        """Add *roi* to the end of the list of ROIs."""
+        self.setROIs(self.rois + [roi])
+
+    def removeROI(self, roi):
+        """Remove *roi* from the list of ROIs."""
+        self.setROIs([r for r in self.rois if r is not roi])
+
+    def indexes(self, data, roi):
+        """Return the flat indexes, into the two ROI axes of *data*, of the
+        pixels covered by *roi*."""
+        self._update(data.shape)
+        return self._indexes[roi][1]
+
+    def compute(self, data, stats=('mean',)):
+        """
+        Return a dict mapping each of *stats* to an array of values with one item
+        per ROI. The statistics available are 'mean', 'sum', 'min', 'max', 'std'
+        and 'count'.
+
+        If *data* has more axes than the two ROI axes, the remaining axes are kept
+        and follow the ROI axis in each result. ROIs that do not cover any pixels
+        give NaN (0 for 'sum' and 'count').
+        """
+        for name in stats:
+            if name not in self.statNames:
+                raise ValueError("Unknown statistic %r; must be one of %s" % (name, self.statNames))
+        data = np.asarray(data)
+        inds, offsets, counts = self._update(data.shape)
+        nRois = len(self.rois)
+
+        ## move the ROI axes to the end and flatten them
+        ax0, ax1 = self.axes
+        data = np.moveaxis(data, (ax0, ax1), (-2, -1))
+        data = data.reshape(data.shape[:-2] + (-1,))
+        values = data[..., inds]
+
+        empty = counts == 0
+        nonEmpty = ~empty
+        ## np.*.reduceat() needs valid offsets; reduce only the non-empty segments
+        segOffsets = offsets[nonEmpty]
+
+        def reduce(ufunc, vals, **kwds):
+            out = np.full(data.shape[:-1] + (nRois,), np.nan, dtype=float)
+            if len(segOffsets) > 0:
+                out[..., nonEmpty] = ufunc.reduceat(vals, segOffsets, axis=-1, **kwds)
+            return out
+
+        result = {}
+        if 'sum' in stats or 'mean' in stats or 'std' in stats:
+            total = reduce(np.add, values, dtype=float)
+            total[..., empty] = 0
+            if 'sum' in stats:
+                result['sum'] = total
+            if 'mean' in stats or 'std' in stats:
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    mean = total / counts
+                if 'mean' in stats:
+                    result['mean'] = mean
+                if 'std' in stats:
+                    dev = values - np.repeat(mean[..., nonEmpty], counts[nonEmpty], axis=-1)
+                    with np.errstate(invalid='ignore', divide='ignore'):
+                        result['std'] = np.sqrt(reduce(np.add, dev * dev) / counts)
+        if 'min' in stats:
+            result['min'] = reduce(np.minimum, values)
+        if 'max' in stats:
+            result['max'] = reduce(np.maximum, values)
+        if 'count' in stats:
+            result['count'] = counts.copy()
+
+        ## put the ROI axis first
+        return {k: np.moveaxis(v, -1, 0) for k, v in result.items()}
+
+    def _update(self, shape):
+        ## recompute the indexes of changed ROIs and return the concatenated indexes
+        ax0, ax1 = self.axes
+        dShape = (shape[ax0], shape[ax1])
+        sceneToData = self._sceneToData(dShape)
+        for roi in self.rois:
+            path = None if sceneToData is None else (roi.sceneTransform() * sceneToData).map(roi.shape())
+            cached = self._indexes.get(roi)
+            if cached is None or cached[0][0] != dShape or cached[0][1] != path:
+                self._indexes[roi] = ((dShape, path), self._computeIndexes(path, dShape))
+                self._concat = None
+
+        if self._concat is None:
+            indexes = [self._indexes[roi][1] for roi in self.rois]
+            counts = np.array([len(i) for i in indexes], dtype=np.intp)
+            offsets = np.zeros(len(indexes), dtype=np.intp)
+            np.cumsum(counts[:-1], out=offsets[1:])
+            inds = np.concatenate(indexes) if len(indexes) > 0 else np.zeros(0, dtype=np.intp)
+            self._concat = (inds, offsets, counts)
+        return self._concat
+
+    def _sceneToData(self, dShape):
+        ## transform mapping scene coordinates to (x, y) data coordinates
+        if self.img is None:
+            return QtGui.QTransform()
+        try:
+            tr = fn.invertQTransform(self.img.sceneTransform())
+        except np.linalg.LinAlgError:
+            return None
+        if self.img.axisOrder == 'row-major':
+            scale = QtGui.QTransform.fromScale(dShape[1] / self.img.width(), dShape[0] / self.img.height())
+        else:
+            scale = QtGui.QTransform.fromScale(dShape[0] / self.img.width(), dShape[1] / self.img.height())
+        return tr * scale
+
+    def _computeIndexes(self, path, dShape):
+        ## render the ROI shape (in data coordinates) into a mask covering its bounding box
+        empty = np.zeros(0, dtype=np.intp)
+        if path is None:
+            return empty
+        rowMajor = self.img is not None and self.img.axisOrder == 'row-major'
+        nx, ny = (dShape[1], dShape[0]) if rowMajor else dShape
+        bounds = path.boundingRect().intersected(QtCore.QRectF(0, 0, nx, ny))
+        if bounds.isEmpty():
+            return empty
+        x0 = int(np.floor(bounds.left()))
+        y0 = int(np.floor(bounds.top()))
+        w = int(np.ceil(bounds.right())) - x0
+        h = int(np.ceil(bounds.bottom())) - y0
+
+        im = QtGui.QImage(w, h, QtGui.QImage.Format.Format_ARGB32)
+        im.fill(QtCore.Qt.GlobalColor.transparent)
+        p = QtGui.QPainter(im)
+        p.translate(-x0, -y0)
+        p.fillPath(path, fn.mkBrush('w'))
+        p.end()
+        cidx = 0 if sys.byteorder == 'little' else 3
+        iy, ix = np.nonzero(fn.ndarray_from_qimage(im)[..., cidx])
+        ix += x0
+        iy += y0
+        if rowMajor:
+            return (iy * dShape[1] + ix).astype(np.intp)
+        return (ix * dShape[1] + iy).astype(np.intp)
+
+
+def roiStatistics(data, rois, img=None, stats=('mean',), axes=(0, 1)):
+    """
+    Return statistics of *data* inside each of *rois*, computed in a single
+    pass over the data. See :class:`ROIStatistics <pyqtgraph.ROIStatistics>`
+    for a description of the arguments; to compute statistics of many frames
+    with the same ROIs, create a ROIStatistics object once and call its
+    :func:`compute <pyqtgraph.ROIStatistics.compute>` method for each frame.
+    """
+    return ROIStatistics(rois, img=img, axes=axes).compute(data, stats=stats)
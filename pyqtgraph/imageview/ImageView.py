@@ -12,6 +12,7 @@ Widget used for displaying 2D or 3D data. Features:
   - Image normalization through a variety of methods
 """
 import os
+import threading
 from math import log10
 from time import perf_counter
 
@@ -46,6 +47,80 @@ class PlotROI(ROI):
         self.addRotateHandle([0, 0], [0.5, 0.5])
 
 
+class _RoiTimeCourseWorker(QtCore.QObject):
+    ## Computes ROI time courses in a background thread. A new request supersedes
+    ## the one being processed, which is abandoned at the next chunk boundary.
+    ## Results are delivered in chunks of frames through sigChunkReady, which is
+    ## received in the GUI thread.
+    sigChunkReady = QtCore.Signal(object, object, object)  ## request id, frame indexes, values
+    _STOP = object()  ## request that makes the thread exit
+
+    def __init__(self):
+        QtCore.QObject.__init__(self)
+        self._cond = threading.Condition()
+        self._request = None   ## next request to process
+        self._current = None   ## id of the request being processed
+        self._thread = None
+
+    def submit(self, requestId, func, frames, chunkSize):
+        ## Compute func(frames[i:i+chunkSize]) for consecutive chunks of *frames*
+        with self._cond:
+            self._request = (requestId, func, frames, chunkSize)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='ImageViewROI', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def cancel(self):
+        with self._cond:
+            self._request = None
+            self._current = None
+
+    def stop(self):
+        ## Abandon any request and wait for the thread to exit
+        with self._cond:
+            self._request = self._STOP
+            self._current = None
+            thread = self._thread
+            self._thread = None
+            self._cond.notify()
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._request is None:
+                    self._cond.wait()
+                request = self._request
+                if request is self._STOP:
+                    return
+                self._request = None
+                self._current = request[0]
+            if not self._process(*request):
+                return
+            ## do not keep the image data referenced by the request while waiting
+            del request
+
+    def _process(self, requestId, func, frames, chunkSize):
+        ## Return False if the worker object has been deleted
+        for start in range(0, len(frames), chunkSize):
+            with self._cond:
+                if self._current != requestId or self._request is not None:
+                    break
+            chunk = frames[start:start+chunkSize]
+            try:
+                values = func(chunk)
+            except Exception:
+                debug.printExc('Error computing ROI time course:')
+                break
+            try:
+                self.sigChunkReady.emit(requestId, chunk, values)
+            except RuntimeError:  ## worker object has been deleted
+                return False
+        return True
+
+
 class ImageView(QtWidgets.QWidget):
     """
     Widget used for display and analysis of image data.
@@ -167,6 +242,11 @@ class ImageView(QtWidgets.QWidget):
         self.view.addItem(self.normRoi)
         self.normRoi.hide()
         self.roiCurves = []
+        self._roiOpts = {'threaded': True, 'chunkSize': None, 'dragStride': 1}
+        self._roiWorker = None
+        self._roiRequest = None  ## id, stride, values and mask of the time course being computed
+        self._roiRequestCount = 0
+        self._roiChanging = False  ## True while the ROI is changing, until sigRegionChangeFinished
         self.timeLine = InfiniteLine(0, movable=True)
         if getConfigOption('background')=='w':
             self.timeLine.setPen((20, 80,80, 200))
@@ -220,7 +300,8 @@ class ImageView(QtWidgets.QWidget):
 
         self.timeLine.sigPositionChanged.connect(self.timeLineChanged)
         self.ui.roiBtn.clicked.connect(self.roiClicked)
-        self.roi.sigRegionChanged.connect(self.roiChanged)
+        self.roi.sigRegionChanged.connect(self._roiRegionChanged)
+        self.roi.sigRegionChangeFinished.connect(self.roiChangeFinished)
         #self.ui.normBtn.toggled.connect(self.normToggled)
         self.ui.menuBtn.clicked.connect(self.menuClicked)
         self.ui.normDivideRadio.clicked.connect(self.normRadioChanged)
@@ -498,6 +579,10 @@ class ImageView(QtWidgets.QWidget):
         
     def close(self):
         """Closes the widget nicely, making sure to clear the graphics scene and release memory."""
+        self._cancelRoiTimeCourse()
+        if self._roiWorker is not None:
+            self._roiWorker.stop()
+            self._roiWorker = None
         self.clear()
         self.imageDisp = None
         self.imageItem.setParent(None)
@@ -649,6 +734,7 @@ class ImageView(QtWidgets.QWidget):
                 c.show()
             self.ui.roiPlot.showAxis('left')
         else:
+            self._cancelRoiTimeCourse()
             self.roi.hide()
             self.ui.roiPlot.setMouseEnabled(False, False)
             for c in self.roiCurves:
@@ -670,6 +756,33 @@ class ImageView(QtWidgets.QWidget):
             
         self.ui.roiPlot.setVisible(showRoiPlot)
 
+    def setRoiTimeCourseOptions(self, threaded=None, chunkSize=None, dragStride=None):
+        """
+        Set how the ROI plot is computed for image data with a time axis.
+
+        Parameters
+        ----------
+        threaded : bool
+            If True (default), the mean of the ROI in each frame is computed in a background thread and the ROI
+            plot is updated as chunks of frames complete. A new ROI position supersedes any computation still in
+            progress. ROI types that do not use :func:`ROI.getArrayRegion <pyqtgraph.ROI.getArrayRegion>` are
+            always computed in the GUI thread.
+        chunkSize : int
+            Number of frames computed between updates of the ROI plot. By default, this is chosen such that each
+            chunk samples a few million values.
+        dragStride : int
+            While the ROI is being changed, only every *dragStride*-th frame is computed; the full time course is
+            computed when the change is finished. The default of 1 computes all frames.
+        """
+        if threaded is not None:
+            self._roiOpts['threaded'] = threaded
+        if chunkSize is not None:
+            self._roiOpts['chunkSize'] = max(1, int(chunkSize))
+        if dragStride is not None:
+            self._roiOpts['dragStride'] = max(1, int(dragStride))
+        if self.ui.roiBtn.isChecked():
+            self.roiChanged()
+
     @QtCore.Slot()
     def roiChanged(self):
         # Extract image data from ROI
@@ -687,6 +800,14 @@ class ImageView(QtWidgets.QWidget):
         else:
             axes = (self.axes['y'], self.axes['x'])
 
+        if self.axes['t'] is not None and self._roiOpts['threaded']:
+            func = self._roiTimeCourseFunc(image.view(np.ndarray), axes)
+            if func is not None:
+                stride = self._roiOpts['dragStride'] if self._roiChanging else 1
+                self._requestRoiTimeCourse(func, stride)
+                return
+        self._cancelRoiTimeCourse()
+
         data, coords = self.roi.getArrayRegion(
             image.view(np.ndarray), img=self.imageItem, axes=axes,
             returnMappedCoords=True)
@@ -710,6 +831,83 @@ class ImageView(QtWidgets.QWidget):
             data = data.mean(axis=axes)
             xvals = self.tVals
 
+        self._setRoiPlotData(xvals, data)
+
+    @QtCore.Slot()
+    def _roiRegionChanged(self):
+        # Only changes of the ROI itself are followed by sigRegionChangeFinished, so
+        # only these may compute a subsampled time course
+        self._roiChanging = True
+        self.roiChanged()
+
+    @QtCore.Slot()
+    def roiChangeFinished(self):
+        # Replace a subsampled time course computed while the ROI was changing
+        self._roiChanging = False
+        request = self._roiRequest
+        if request is None or request['stride'] == 1:
+            return
+        self._requestRoiTimeCourse(request['func'], 1, keep=True)
+
+    def _roiTimeCourseFunc(self, image, axes):
+        # Return a function computing the ROI mean of a set of frames from *image*,
+        # or None if the ROI type requires its own getArrayRegion(). The function does
+        # not access any graphics items so that it can run in the worker thread.
+        if type(self.roi).getArrayRegion is not ROI.getArrayRegion:
+            return None
+        shape, vectors, origin = self.roi.getAffineSliceParams(image, self.imageItem, axes)
+        tAxis = self.axes['t']
+        tPos = tAxis - sum(ax < tAxis for ax in axes)  # position of the time axis after averaging
+
+        def timeCourse(frames):
+            # frames are evenly spaced, so they can be selected without copying
+            step = frames[1] - frames[0] if len(frames) > 1 else 1
+            index = [slice(None)] * image.ndim
+            index[tAxis] = slice(frames[0], frames[-1] + 1, step)
+            data = fn.affineSlice(image[tuple(index)], shape=shape, vectors=vectors, origin=origin, axes=axes)
+            return np.moveaxis(data.mean(axis=axes), tPos, 0)
+        timeCourse.samples = int(np.prod(np.ceil(shape)))
+        return timeCourse
+
+    def _requestRoiTimeCourse(self, func, stride, keep=False):
+        # Submit a new time course computation to the worker, superseding the previous
+        # one. If *keep* is True, values already computed remain in the plot until they
+        # are replaced.
+        if self._roiWorker is None:
+            self._roiWorker = _RoiTimeCourseWorker()
+            self._roiWorker.sigChunkReady.connect(self._roiChunkReady)
+        self._roiRequestCount += 1
+        request = {'id': self._roiRequestCount, 'func': func, 'stride': stride, 'values': None, 'mask': None}
+        if keep and self._roiRequest is not None:
+            request['values'] = self._roiRequest['values']
+            request['mask'] = self._roiRequest['mask']
+        self._roiRequest = request
+
+        chunkSize = self._roiOpts['chunkSize']
+        if chunkSize is None:
+            chunkSize = max(1, int(2**22 // max(func.samples, 1)))
+        frames = np.arange(0, self.nframes(), stride)
+        self._roiWorker.submit(request['id'], func, frames, chunkSize)
+
+    def _cancelRoiTimeCourse(self):
+        self._roiRequest = None
+        if self._roiWorker is not None:
+            self._roiWorker.cancel()
+
+    @QtCore.Slot(object, object, object)
+    def _roiChunkReady(self, requestId, frames, values):
+        request = self._roiRequest
+        if request is None or request['id'] != requestId or self.image is None:
+            return  # stale result
+        if request['values'] is None:
+            request['values'] = np.full((self.nframes(),) + values.shape[1:], np.nan)
+            request['mask'] = np.zeros(self.nframes(), dtype=bool)
+        request['values'][frames] = values
+        request['mask'][frames] = True
+        mask = request['mask']
+        self._setRoiPlotData(np.asarray(self.tVals)[mask], request['values'][mask])
+
+    def _setRoiPlotData(self, xvals, data):
         # Handle multi-channel data
         if data.ndim == 1:
             plots = [(xvals, data, 'w')]
@@ -1,3 +1,5 @@
+import asyncio
+
 import jupyter_rfb
 import numpy as np
 
@@ -52,9 +54,17 @@ class GraphicsView(jupyter_rfb.RemoteFrameBuffer):
 
     This class should not be used directly. Its corresponding sub-classes
     :class:`GraphicsLayoutWidget <pyqtgraph.jupyter.GraphicsLayoutWidget>` and
-    :class:`PlotWidget <pyqtgraph.jupyter.PlotWidget>` should be used instead."""
+    :class:`PlotWidget <pyqtgraph.jupyter.PlotWidget>` should be used instead.
 
-    def __init__(self, **kwds):
+    To reduce the traffic to the notebook, draw requests made while handling the
+    same event are merged into one, and frames identical to the previous frame are
+    not sent. While the user is interacting with the view, frames are rendered at
+    ``interaction_scale`` times the full resolution and compressed with
+    ``interaction_quality``; ``idle_delay`` seconds after the last mouse event, a
+    frame is drawn at full resolution and quality again. Set ``interaction_scale``
+    to 1.0 and ``interaction_quality`` to None to always use full quality."""
+
+    def __init__(self, interaction_scale=0.5, interaction_quality=50, idle_delay=0.3, **kwds):
         super().__init__(**kwds)
         self.gfxView = widgets.GraphicsView.GraphicsView()
         self.logical_size = int(self.css_width[:-2]), int(self.css_height[:-2])
@@ -63,20 +73,98 @@ class GraphicsView(jupyter_rfb.RemoteFrameBuffer):
         # self.gfxView.show()
         # self.gfxView.resizeEvent(None)
 
+        self.interaction_scale = interaction_scale
+        self.interaction_quality = interaction_quality
+        self.idle_delay = idle_delay
+        self._interacting = False
+        self._full_quality = None   # quality to restore when interaction ends
+        self._idle_handle = None
+        self._draw_scheduled = False
+        self._force_frame = False
+        self._buffers = []          # the last frame sent and a spare buffer
+
+    def request_draw(self):
+        # a single change usually emits several signals that each request a draw;
+        # they are passed on as one request once control returns to the event loop
+        if self._draw_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # no event loop is running (e.g. data is set before the widget is shown)
+            super().request_draw()
+            return
+        self._draw_scheduled = True
+        loop.call_soon(self._flush_draw_request)
+
+    def _flush_draw_request(self):
+        self._draw_scheduled = False
+        super().request_draw()
+
+    def snapshot(self, *args, **kwds):
+        # a snapshot always gets a full quality frame
+        self._force_frame = True
+        try:
+            return super().snapshot(*args, **kwds)
+        finally:
+            self._force_frame = False
+
     def get_frame(self):
+        force = self._force_frame
+        scale = 1.0 if force or not self._interacting else self.interaction_scale
         w, h = self.logical_size
-        dpr = self.pixel_ratio
-        buf = np.empty((int(h * dpr), int(w * dpr), 4), dtype=np.uint8)
+        dpr = self.pixel_ratio * scale
+        shape = (max(1, int(h * dpr)), max(1, int(w * dpr)), 4)
+
+        # render into the spare buffer, so that the previous frame can be compared;
+        # snapshots are not sent to the view, so they do not replace that frame
+        last = self._buffers[0] if len(self._buffers) > 0 else None
+        if not force and len(self._buffers) > 1 and self._buffers[1].shape == shape:
+            buf = self._buffers[1]
+        else:
+            buf = np.empty(shape, dtype=np.uint8)
         qimg = fn.ndarray_to_qimage(buf, QtGui.QImage.Format.Format_RGBX8888)
         qimg.fill(QtCore.Qt.GlobalColor.transparent)
         qimg.setDevicePixelRatio(dpr)
         painter = QtGui.QPainter(qimg)
         self.gfxView.render(painter, self.gfxView.viewRect(), self.gfxView.rect())
         painter.end()
+
+        if force:
+            return buf
+        if last is not None and last.shape == shape and np.array_equal(buf, last):
+            return None     # nothing changed; no frame is sent
+        self._buffers = [buf] if last is None else [buf, last]
         return buf
+
+    def _begin_interaction(self):
+        # lower the resolution and quality of frames until the view is idle
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # the end of the interaction could not be scheduled
+        if not self._interacting:
+            self._interacting = True
+            if self.interaction_quality is not None:
+                self._full_quality = self.quality
+                self.quality = min(self.quality, self.interaction_quality)
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+        self._idle_handle = loop.call_later(self.idle_delay, self._end_interaction)
+
+    def _end_interaction(self):
+        self._idle_handle = None
+        self._interacting = False
+        if self._full_quality is not None:
+            self.quality = self._full_quality
+            self._full_quality = None
+        self.request_draw()
     
     def handle_event(self, event):
         event_type = event["event_type"]
+        if event_type in ["pointer_down", "pointer_up", "wheel"] or \
+                (event_type == "pointer_move" and len(event["buttons"]) > 0):
+            self._begin_interaction()
 
         if event_type == "resize":
             oldSize = QtCore.QSize(*self.logical_size)
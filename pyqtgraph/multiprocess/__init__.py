@@ -19,6 +19,6 @@ TODO:
     (RemoteGraphicsView class)
 """
 
-from .parallelizer import CanceledError, Parallelize
+from .parallelizer import CanceledError, Parallelize, WorkerPool
 from .processes import *
 from .remoteproxy import ClosedError, NoResultError, proxy
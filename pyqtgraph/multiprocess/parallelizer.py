@@ -1,4 +1,5 @@
 import multiprocessing
+import multiprocessing.connection
 import os
 import re
 import sys
@@ -43,7 +44,7 @@ class Parallelize(object):
     since it is automatically sent via pipe back to the parent process.
     """
 
-    def __init__(self, tasks=None, workers=None, block=True, progressDialog=None, randomReseed=True, **kwds):
+    def __init__(self, tasks=None, workers=None, block=True, progressDialog=None, randomReseed=True, chunkSize=None, **kwds):
         """
         ===============  ===================================================================
         **Arguments:**
@@ -57,6 +58,10 @@ class Parallelize(object):
         randomReseed     If True, each forked process will reseed its random number generator
                          to ensure independent results. Works with the built-in random
                          and numpy.random.
+        chunkSize        number of tasks handed to a worker at a time. Workers request a
+                         new chunk from the parent process whenever they finish one, so
+                         that faster workers process more tasks. By default, chunks are
+                         sized to give each worker about 4 chunks.
         kwds             objects to be shared by proxy with child processes (they will 
                          appear as attributes of the tasker)
         ===============  ===================================================================
@@ -81,8 +86,13 @@ class Parallelize(object):
             tasks = range(workers)
         self.tasks = list(tasks)
         self.reseed = randomReseed
+        if chunkSize is None:
+            chunkSize = max(1, len(self.tasks) // (workers * 4))
+        self.chunkSize = chunkSize
+        self.nextTask = 0
         self.kwds = kwds.copy()
         self.kwds['_taskStarted'] = self._taskStarted
+        self.kwds['_nextChunk'] = self._nextChunk
         
     def __enter__(self):
         self.proc = None
@@ -121,19 +131,13 @@ class Parallelize(object):
     def runParallel(self):
         self.childs = []
         
-        ## break up tasks into one set per worker
-        workers = self.workers
-        chunks = [[] for i in range(workers)]
-        i = 0
-        for i in range(len(self.tasks)):
-            chunks[i%workers].append(self.tasks[i])
-        
-        ## fork and assign tasks to each worker
-        for i in range(workers):
+        ## fork workers; each worker requests chunks of tasks from the parent 
+        ## as it becomes idle (see _nextChunk)
+        for i in range(self.workers):
             proc = ForkedProcess(target=None, preProxy=self.kwds, randomReseed=self.reseed)
             if not proc.isParent:
                 self.proc = proc
-                return Tasker(self, proc, chunks[i], proc.forkedProxies)
+                return Tasker(self, proc, self.tasks, proc.forkedProxies)
             else:
                 self.childs.append(proc)
         
@@ -195,7 +199,8 @@ class Parallelize(object):
                     pollInterval /= 0.7
                 pollInterval = max(min(pollInterval, 0.5), 0.0005) ## but keep it within reasonable limits
                 
-                time.sleep(pollInterval)
+                ## wait for the next message from any worker (such as a request for more tasks)
+                multiprocessing.connection.wait([ch.conn for ch in activeChilds], pollInterval)
         finally:
             if self.showProgress:
                 self.progressDlg.__exit__(None, None, None)
@@ -242,6 +247,13 @@ class Parallelize(object):
                 if self.progressDlg.wasCanceled():
                     raise CanceledError()
         self.progress[pid].append(i)
+        
+    def _nextChunk(self, pid):
+        ## called remotely by tasker to request the next (start, stop) range of tasks
+        start = min(self.nextTask, len(self.tasks))
+        stop = min(start + self.chunkSize, len(self.tasks))
+        self.nextTask = stop
+        return (start, stop)
     
     
 class Tasker(object):
@@ -253,15 +265,29 @@ class Tasker(object):
             setattr(self, k, v)
         
     def __iter__(self):
-        ## we could fix this up such that tasks are retrieved from the parent process one at a time..
-        for i, task in enumerate(self.tasks):
-            self.index = i
-            #print os.getpid(), 'starting task', i
-            self._taskStarted(os.getpid(), i, _callSync='off')
-            yield task
+        if self.proc is None:
+            chunks = [(0, len(self.tasks))]
+        else:
+            chunks = self._chunks()
+        i = 0
+        for start, stop in chunks:
+            for task in self.tasks[start:stop]:
+                self.index = i
+                #print os.getpid(), 'starting task', i
+                self._taskStarted(os.getpid(), i, _callSync='off')
+                i += 1
+                yield task
         if self.proc is not None:
             #print os.getpid(), 'no more tasks'
             self.proc.close()
+            
+    def _chunks(self):
+        ## retrieve chunks of tasks from the parent process until none remain
+        while True:
+            start, stop = self._nextChunk(os.getpid(), _callSync='sync', _returnType='value')
+            if start >= stop:
+                return
+            yield start, stop
     
     def process(self):
         """
@@ -278,6 +304,151 @@ class Tasker(object):
         """
         return self.par.workers
     
+
+def _runTasks(func, tasks):
+    ## executed by WorkerPool workers; returns the results and the time spent computing them
+    start = time.perf_counter()
+    results = [func(task) for task in tasks]
+    return results, time.perf_counter() - start
+
+
+class WorkerPool(object):
+    """
+    Pool of forked worker processes that stay alive between uses.
+    
+    Parallelize forks a new set of workers for every ``with`` block, which is
+    expensive when many short parallel computations are run one after another.
+    A WorkerPool forks its workers once and reuses them for every call to map()::
+    
+        pool = WorkerPool(workers=4)
+        for frame in frames:
+            results = pool.map(analyze, tasks)
+        print(pool.utilization())
+        pool.close()
+    
+    Tasks are handed out in chunks; each worker receives a new chunk as soon as it
+    finishes the previous one, so faster workers process more tasks.
+    
+    Because the workers are forked when the pool is created, functions and tasks
+    passed to map() are sent to the workers by pickling (functions must be defined
+    at module level). Results must also be picklable. On platforms without
+    os.fork, map() runs in the calling process.
+    """
+    def __init__(self, workers=None, randomReseed=True):
+        """
+        ===============  ===================================================================
+        **Arguments:**
+        workers          number of worker processes or None to use number of CPUs in the
+                         system
+        randomReseed     If True, each forked process will reseed its random number generator
+                         to ensure independent results.
+        ===============  ===================================================================
+        """
+        if workers is None:
+            workers = Parallelize.suggestedWorkerCount()
+        self.workers = []
+        self.stats = {}    ## maps {worker pid: {'tasks': n, 'busy': seconds}}
+        self.mapTime = 0.0  ## total time spent in map()
+        if not hasattr(os, 'fork'):
+            return
+        for i in range(workers):
+            proc = ForkedProcess(randomReseed=randomReseed)
+            proc.runTasks = proc._import('pyqtgraph.multiprocess.parallelizer')._runTasks
+            self.workers.append(proc)
+            self.stats[proc.childPid] = {'tasks': 0, 'busy': 0.0}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def numWorkers(self):
+        """Return the number of worker processes."""
+        return len(self.workers)
+    
+    def map(self, func, tasks, chunkSize=None):
+        """
+        Return the list ``[func(task) for task in tasks]``, computed by the workers.
+        
+        *chunkSize* is the number of tasks sent to a worker at a time; by default,
+        chunks are sized to give each worker about 4 chunks. If *func* raises an
+        exception in a worker, it is raised here once all chunks in progress
+        have finished.
+        """
+        tasks = list(tasks)
+        if len(self.workers) == 0:
+            return _runTasks(func, tasks)[0]
+        if chunkSize is None:
+            chunkSize = max(1, len(tasks) // (len(self.workers) * 4))
+        chunks = [(i, tasks[i:i+chunkSize]) for i in range(0, len(tasks), chunkSize)]
+        chunks.reverse()  ## pop() from the end
+        
+        start = time.perf_counter()
+        results = [None] * len(tasks)
+        pending = {}  ## maps {worker: (first task index, request)}
+        error = None
+        try:
+            while len(chunks) > 0 or len(pending) > 0:
+                ## hand out chunks to idle workers
+                for proc in self.workers:
+                    if proc not in pending and len(chunks) > 0 and error is None:
+                        ind, chunk = chunks.pop()
+                        req = proc.runTasks(func, chunk, _callSync='async', _returnType='value')
+                        pending[proc] = (ind, req)
+                if len(pending) == 0:
+                    break
+                
+                ## collect finished chunks
+                multiprocessing.connection.wait([proc.conn for proc in pending], 1.0)
+                for proc, (ind, req) in list(pending.items()):
+                    try:
+                        if not req.hasResult():
+                            continue
+                        chunkResults, busy = req.result()
+                    except ClosedError:
+                        raise
+                    except Exception as exc:
+                        del pending[proc]
+                        if error is None:
+                            error = exc
+                        continue
+                    del pending[proc]
+                    results[ind:ind+len(chunkResults)] = chunkResults
+                    stats = self.stats[proc.childPid]
+                    stats['tasks'] += len(chunkResults)
+                    stats['busy'] += busy
+        finally:
+            self.mapTime += time.perf_counter() - start
+        if error is not None:
+            raise error
+        return results
+    
+    def utilization(self):
+        """
+        Return a dict ``{pid: stats}`` describing the work done by each worker 
+        since the pool was created. Each *stats* is a dict with keys:
+        
+        ===========  ============================================================
+        tasks        number of tasks processed by the worker
+        busy         time in seconds spent processing tasks
+        utilization  fraction of the time spent in map() during which the worker
+                     was busy
+        ===========  ============================================================
+        """
+        report = {}
+        for pid, stats in self.stats.items():
+            report[pid] = dict(stats)
+            report[pid]['utilization'] = stats['busy'] / self.mapTime if self.mapTime > 0 else 0.0
+        return report
+    
+    def close(self):
+        """Shut down all worker processes."""
+        for proc in self.workers:
+            proc.join()
+        self.workers = []
+
+    
 #class Parallelizer:
     #"""
     #Use::
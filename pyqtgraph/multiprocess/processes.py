@@ -20,6 +20,22 @@ from .remoteproxy import (
 
 __all__ = ['Process', 'QtProcess', 'ForkedProcess', 'ClosedError', 'NoResultError']
 
+
+def _resetResourceTracker():
+    ## Called in forked children after their file descriptors have been closed,
+    ## including the connection to the parent's multiprocessing resource tracker.
+    ## Forgetting that connection makes the tracker start a new process the next
+    ## time it is needed (e.g. for shared memory) instead of failing with EBADF.
+    ## This relies on private attributes of CPython's ResourceTracker, so it does
+    ## nothing if they are not present.
+    module = sys.modules.get('multiprocessing.resource_tracker')
+    tracker = getattr(module, '_resource_tracker', None)
+    if tracker is None or not (hasattr(tracker, '_fd') and hasattr(tracker, '_pid')):
+        return
+    tracker._fd = None
+    tracker._pid = None
+
+
 class Process(RemoteEventHandler):
     """
     Bases: RemoteEventHandler
@@ -190,6 +206,7 @@ class Process(RemoteEventHandler):
                     raise Exception('Timed out waiting for remote process to end.')
                 time.sleep(0.05)
         self.conn.close()
+        self.closeSharedMemory()
 
         # Close remote polling threads, otherwise they will spin continuously
         if hasattr(self, "_stdoutForwarder"):
@@ -224,7 +241,7 @@ def startEventLoop(name, port, authkey, ppid, debug=False):
     while True:
         try:
             HANDLER.processRequests()  # exception raised when the loop should exit
-            time.sleep(0.01)
+            HANDLER.waitForRequests(0.01)
         except ClosedError:
             HANDLER.debugMsg('Exiting server loop.')
             sys.exit(0)
@@ -305,6 +322,8 @@ class ForkedProcess(RemoteEventHandler):
             os.closerange(3, fid)
             os.closerange(fid+1, 4096) ## just guessing on the maximum descriptor count..
             
+            _resetResourceTracker()
+            
             ## Override any custom exception hooks
             def excepthook(*args):
                 import traceback
@@ -352,7 +371,7 @@ class ForkedProcess(RemoteEventHandler):
         while True:
             try:
                 self.processRequests()  # exception raised when the loop should exit
-                time.sleep(0.01)
+                self.waitForRequests(0.01)
             except ClosedError:
                 break
             except:
@@ -375,6 +394,7 @@ class ForkedProcess(RemoteEventHandler):
             pass
         
         self.conn.close()  # don't leak file handles!
+        self.closeSharedMemory()
         self.hasJoined = True
 
     def kill(self):
@@ -1,3 +1,5 @@
+import asyncio
+import contextlib
 import os
 import sys
 import threading
@@ -12,6 +14,7 @@ import numpy as np
 
 # color printing for debugging
 from ..util import cprint
+from .sharedmemory import SharedMemoryPool, attachSharedArray
 
 
 class ClosedError(Exception):
@@ -73,6 +76,7 @@ class RemoteEventHandler(object):
             'returnType': 'auto',    ## 'proxy', 'value', 'auto'
             'autoProxy': False,      ## bool
             'deferGetattr': False,   ## True, False
+            'sharedMemThreshold': None,  ## int (bytes) or None
             'noProxyTypes': [
                 type(None), str, bytes, int, float, tuple, list, dict,
                 LocalObjectProxy, ObjectProxy,
@@ -83,10 +87,24 @@ class RemoteEventHandler(object):
         
         self.nextRequestId = 0
         self.exited = False
+
+        ## shared memory blocks holding arrays sent to the remote process (created on first use)
+        self.sharedMemPool = None
+        ## shared memory blocks received from the remote process that are no longer referenced
+        ## and should be released back to the remote process
+        self.releasedSharedMem = []
         
         # Mutexes to help prevent issues when multiple threads access the same RemoteEventHandler
         self.processLock = threading.RLock()
         self.sendLock = threading.RLock()
+        
+        ## requests queued by batch(); kept per thread so that other threads are not affected
+        self.batchState = threading.local()
+        
+        ## asyncio support; see attachEventLoop()
+        self.eventLoop = None
+        self.asyncRequests = {}  ## reqId: [(request, future), ...]; requests being awaited
+        self.asyncLock = threading.Lock()
 
         # parent sent us None as its pid, wants us to exchange pids
         # corresponding code is in:
@@ -134,6 +152,7 @@ class RemoteEventHandler(object):
                 raise ClosedError()
             
             numProcessed = 0
+            self.releaseSharedMemory()
             
             while self.conn.poll():
                 #try:
@@ -163,12 +182,21 @@ class RemoteEventHandler(object):
                     
             if numProcessed > 0:
                 self.debugMsg('processRequests: finished %d requests', numProcessed)
+                self.resolveAsyncRequests()
             return numProcessed
     
+    def waitForRequests(self, timeout):
+        """Block until a request is available from the remote process or *timeout* 
+        seconds have passed. This is used by event loops in place of sleeping, so
+        that requests are handled as soon as they arrive."""
+        try:
+            self.conn.poll(timeout)
+        except (OSError, EOFError):  ## connection closed; processRequests() will raise ClosedError
+            pass
+    
     def handleRequest(self):
         """Handle a single request from the remote process. 
         Blocks until a request is available."""
-        result = None
         while True:
             try:
                 ## args, kwds are double-pickled to ensure this recv() call never fails                
@@ -207,8 +235,27 @@ class RemoteEventHandler(object):
                     else:
                         self.debugMsg("    handleRequest: got IOError while reading byte messages; raise ClosedError.")
                         raise ClosedError()
-            
         
+        if cmd == 'batch':
+            self.handleBatch(byteData, optStr)
+        else:
+            self.executeRequest(cmd, reqId, byteData, optStr)
+            
+    def handleBatch(self, byteData, optStr):
+        """Execute all requests contained in a batch message (see batch()). 
+        Replies generated while executing the requests are batched as well."""
+        requests = pickle.loads(optStr)['requests']
+        self.debugMsg("    handleRequest: executing batch of %d requests", len(requests))
+        with self.batch():
+            ind = 0
+            for cmd, reqId, nByteMsgs, reqOptStr in requests:
+                self.executeRequest(cmd, reqId, byteData[ind:ind+nByteMsgs], reqOptStr)
+                ind += nByteMsgs
+        
+    def executeRequest(self, cmd, reqId, byteData, optStr):
+        """Carry out a single request received from the remote process and send 
+        back its result if one was requested."""
+        result = None
         try:
             if cmd == 'result' or cmd == 'error':
                 resultId = reqId
@@ -233,19 +280,12 @@ class RemoteEventHandler(object):
                 fnargs = opts['args']
                 fnkwds = opts['kwds']
                 
-                ## If arrays were sent as byte messages, they must be re-inserted into the 
-                ## arguments
-                if len(byteData) > 0:
-                    for i,arg in enumerate(fnargs):
-                        if isinstance(arg, tuple) and len(arg) > 0 and arg[0] == '__byte_message__':
-                            ind = arg[1]
-                            dtype, shape = arg[2]
-                            fnargs[i] = np.frombuffer(byteData[ind], dtype=dtype).reshape(shape)
-                    for k,arg in fnkwds.items():
-                        if isinstance(arg, tuple) and len(arg) > 0 and arg[0] == '__byte_message__':
-                            ind = arg[1]
-                            dtype, shape = arg[2]
-                            fnkwds[k] = np.frombuffer(byteData[ind], dtype=dtype).reshape(shape)
+                ## If arrays were sent as byte messages or in shared memory, they must be 
+                ## re-inserted into the arguments
+                for i,arg in enumerate(fnargs):
+                    fnargs[i] = self.unpackArray(arg, byteData)
+                for k,arg in fnkwds.items():
+                    fnkwds[k] = self.unpackArray(arg, byteData)
                 
                 if len(fnkwds) == 0:  ## need to do this because some functions do not allow keyword arguments.
                     try:
@@ -266,6 +306,13 @@ class RemoteEventHandler(object):
                 ## read array data from next message:
                 result = np.frombuffer(byteData[0], dtype=opts['dtype']).reshape(opts['shape'])
                 returnType = 'proxy'
+            elif cmd == 'transferSharedArray':
+                result = self.unpackArray(opts['array'], byteData)
+                returnType = 'proxy'
+            elif cmd == 'releaseSharedMem':
+                if self.sharedMemPool is not None:
+                    for name in opts['names']:
+                        self.sharedMemPool.release(name)
             elif cmd == 'import':
                 name = opts['module']
                 fromlist = opts.get('fromlist', [])
@@ -319,6 +366,7 @@ class RemoteEventHandler(object):
     
         if cmd == 'close':
             if opts.get('noCleanup', False) is True:
+                self.flushBatch()  ## send replies to requests batched with this one
                 os._exit(0)  ## exit immediately, do not pass GO, do not collect $200.
                              ## (more importantly, do not call any code that would
                              ## normally be invoked at exit)
@@ -394,6 +442,21 @@ class RemoteEventHandler(object):
                                       it return a proxy for the new object.
                        obj            The object to transfer.
                        
+        transferArray                 Copy an array to the remote process (as a byte
+                                      message) and request it return a proxy for the
+                                      new array.
+                       dtype          dtype of the array
+                       shape          shape of the array
+                       
+        transferSharedArray           Like transferArray, but the array is placed in
+                                      shared memory.
+                       array          descriptor of the shared array (see packArray)
+                       
+        releaseSharedMem              Inform the remote process that arrays it sent
+                                      in shared memory are no longer referenced, so
+                                      their memory blocks may be reused.
+                       names          list of shared memory block names
+                       
         import                        Request the remote process import new symbols
                                       and return proxy(ies) to the imported objects
                        module         the string name of the module to import
@@ -405,6 +468,12 @@ class RemoteEventHandler(object):
                        proxyId        id of proxy which is no longer referenced by 
                                       remote host
                                       
+        batch                         Several requests sent together in one message (see
+                                      batch()). Byte messages of all requests follow
+                                      the batch message, in order.
+                       requests       list of (request, reqId, nByteMsgs, optStr) for 
+                                      each request in the batch
+                       
         close                         Instruct the remote process to stop its event loop
                                       and exit. Optionally, this request may return a 
                                       confirmation.
@@ -454,20 +523,21 @@ class RemoteEventHandler(object):
                 print("=======================================")
                 raise
             
-            nByteMsgs = 0
-            if byteData is not None:
-                nByteMsgs = len(byteData)
-                
-            ## Send primary request
-            request = (request, reqId, nByteMsgs, optStr)
-            self.debugMsg('send request: cmd=%s nByteMsgs=%d id=%s opts=%s', request[0], nByteMsgs, reqId, opts)
-            self.conn.send(request)
+            if byteData is None:
+                byteData = []
+            nByteMsgs = len(byteData)
             
-            ## follow up by sending byte messages
-            if byteData is not None:
-                for obj in byteData:  ## Remote process _must_ be prepared to read the same number of byte messages!
-                    self.conn.send_bytes(bytes(obj))
-                self.debugMsg('  sent %d byte messages', len(byteData))
+            queue = getattr(self.batchState, 'queue', None)
+            if queue is not None and callSync != 'sync':
+                ## batching; send this request later along with the rest of the batch
+                request = (request, reqId, nByteMsgs, optStr)
+                self.debugMsg('queue request: cmd=%s nByteMsgs=%d id=%s opts=%s', request[0], nByteMsgs, reqId, opts)
+                queue.append((request, byteData))
+            else:
+                self.flushBatch()
+                request = (request, reqId, nByteMsgs, optStr)
+                self.debugMsg('send request: cmd=%s nByteMsgs=%d id=%s opts=%s', request[0], nByteMsgs, reqId, opts)
+                self.sendMessage(request, byteData)
             
             self.debugMsg('  call sync: %s', callSync)
             if callSync == 'off':
@@ -480,6 +550,174 @@ class RemoteEventHandler(object):
         if callSync == 'sync':
             return req.result()
         
+    def sendMessage(self, request, byteData):
+        ## Send primary request
+        self.conn.send(request)
+        
+        ## follow up by sending byte messages
+        for obj in byteData:  ## Remote process _must_ be prepared to read the same number of byte messages!
+            self.conn.send_bytes(bytes(obj))
+        if len(byteData) > 0:
+            self.debugMsg('  sent %d byte messages', len(byteData))
+    
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Context manager that collects requests and sends them to the remote process
+        in a single message when the context exits::
+        
+            with proc.batch():
+                for i in range(200):
+                    remotePlot.plot(data[i], _callSync='off')
+        
+        Only requests made with callSync='off' or 'async' are batched; a
+        synchronous request (or waiting on the result of a batched request)
+        sends all previously batched requests first. Attribute lookups on 
+        proxies are synchronous unless the 'deferGetattr' option is set.
+        Batches may be nested, in which case the requests are sent when the
+        outermost batch exits. Batching only affects requests made from the 
+        calling thread.
+        """
+        state = self.batchState
+        if getattr(state, 'queue', None) is None:
+            state.queue = []
+            state.depth = 0
+        state.depth += 1
+        try:
+            yield self
+        finally:
+            state.depth -= 1
+            if state.depth == 0:
+                try:
+                    self.flushBatch()
+                finally:
+                    state.queue = None
+    
+    def flushBatch(self):
+        """Send all requests queued by batch() in the calling thread."""
+        queue = getattr(self.batchState, 'queue', None)
+        if not queue:
+            return
+        with self.sendLock:
+            requests = queue[:]
+            del queue[:]
+            if self.exited:
+                raise ClosedError()
+            byteData = []
+            for request, reqByteData in requests:
+                byteData.extend(reqByteData)
+            optStr = pickle.dumps(dict(requests=[r[0] for r in requests]))
+            self.debugMsg('send batch: %d requests, nByteMsgs=%d', len(requests), len(byteData))
+            self.sendMessage(('batch', None, len(byteData), optStr), byteData)
+    
+    def gather(self, requests, timeout=None):
+        """
+        Wait for the results of several asynchronous requests and return them as a
+        list, in the same order as *requests*.
+        
+        Results are collected as they arrive, so waiting for N requests costs about
+        one round trip instead of N. If any of the requests raised an exception in 
+        the remote process, the first such exception is raised here after all 
+        results have arrived. If *timeout* seconds (defaults to the largest 
+        timeout of the requests) pass before all results arrive, raise
+        NoResultError.
+        """
+        requests = list(requests)
+        self.flushBatch()
+        if timeout is None:
+            timeout = max([req.timeout for req in requests] + [0])
+        start = time.time()
+        pending = list(requests)
+        while True:
+            try:
+                self.processRequests()
+            except ClosedError:
+                pass
+            with self.resultLock:
+                pending = [req for req in pending if not req.gotResult and req.reqId not in self.results]
+            if len(pending) == 0:
+                break
+            if self.exited:
+                raise ClosedError()
+            if timeout >= 0 and time.time() - start > timeout:
+                raise NoResultError()
+            self.waitForRequests(0.005)
+        
+        results = []
+        error = None
+        for req in requests:
+            try:
+                results.append(req.result(block=False))
+            except NoResultError:
+                raise
+            except Exception as exc:
+                results.append(None)
+                if error is None:
+                    error = exc
+        if error is not None:
+            raise error
+        return results
+    
+    def attachEventLoop(self, loop=None):
+        """
+        Process requests from the remote process in an asyncio event loop.
+        
+        The connection to the remote process is registered with
+        ``loop.add_reader()`` so that incoming requests are handled as soon as 
+        they arrive, and awaited Request objects are resolved without polling::
+        
+            proc.attachEventLoop()
+            result = await remoteObj.method(_callSync='async')
+        
+        If *loop* is None, the running event loop is used. Event loops that do not
+        support add_reader (such as the proactor loop on Windows) raise 
+        NotImplementedError.
+        """
+        if loop is None:
+            loop = asyncio.get_running_loop()
+        if self.eventLoop is not None:
+            self.detachEventLoop()
+        loop.add_reader(self.conn.fileno(), self._eventLoopReadable)
+        self.eventLoop = loop
+        
+    def detachEventLoop(self):
+        """Stop processing requests in the event loop set by attachEventLoop()."""
+        loop = self.eventLoop
+        if loop is None:
+            return
+        self.eventLoop = None
+        try:
+            loop.remove_reader(self.conn.fileno())
+        except (OSError, ValueError):  ## connection already closed
+            pass
+        
+    def _eventLoopReadable(self):
+        try:
+            self.processRequests()
+        except ClosedError:
+            self.detachEventLoop()
+            self.resolveAsyncRequests(closed=True)
+            
+    def resolveAsyncRequests(self, closed=False):
+        """Set the results of awaited requests whose results have arrived.
+        If *closed* is True, requests still waiting for results fail with ClosedError."""
+        if len(self.asyncRequests) == 0:
+            return
+        with self.resultLock:
+            arrived = [reqId for reqId in self.asyncRequests if reqId in self.results]
+        with self.asyncLock:
+            if closed:
+                arrived = list(self.asyncRequests.keys())
+            waiting = [w for reqId in arrived for w in self.asyncRequests.pop(reqId, [])]
+        for req, fut in waiting:
+            try:
+                if closed and not req.gotResult and req.reqId not in self.results:
+                    raise ClosedError()
+                value, exc = req.result(block=False), None
+            except Exception as err:
+                value, exc = None, err
+            fut.get_loop().call_soon_threadsafe(_setFutureResult, fut, value, exc)
+            
     def close(self, callSync='off', noCleanup=False, **kwds):
         try:
             self.send(request='close', opts=dict(noCleanup=noCleanup), callSync=callSync, **kwds)
@@ -558,6 +796,7 @@ class RemoteEventHandler(object):
                 noProxyTypes = self.proxyOptions['noProxyTypes']
                 
             autoProxy = opts.pop('autoProxy', self.proxyOptions['autoProxy'])
+            shmThreshold = opts.pop('sharedMemThreshold', self.proxyOptions['sharedMemThreshold'])
         
         if autoProxy is True:
             args = [self.autoProxy(v, noProxyTypes) for v in args]
@@ -566,19 +805,73 @@ class RemoteEventHandler(object):
         
         byteMsgs = []
         
-        ## If there are arrays in the arguments, send those as byte messages.
+        ## If there are arrays in the arguments, send those as byte messages
+        ## (or in shared memory, if they are large enough).
         ## We do this because pickling arrays is too expensive.
         for i,arg in enumerate(args):
-            if arg.__class__ == np.ndarray:
-                args[i] = ("__byte_message__", len(byteMsgs), (arg.dtype, arg.shape))
-                byteMsgs.append(arg)
+            args[i] = self.packArray(arg, byteMsgs, shmThreshold)
         for k,v in kwds.items():
-            if v.__class__ == np.ndarray:
-                kwds[k] = ("__byte_message__", len(byteMsgs), (v.dtype, v.shape))
-                byteMsgs.append(v)
+            kwds[k] = self.packArray(v, byteMsgs, shmThreshold)
         
         return self.send(request='callObj', opts=dict(obj=obj, args=args, kwds=kwds), byteData=byteMsgs, **opts)
 
+    def packArray(self, arg, byteMsgs, shmThreshold=None):
+        """Return the object that is sent in place of *arg* when it is passed as an
+        argument to a remote call.
+        
+        Arrays are replaced by a descriptor and their data is either appended to
+        *byteMsgs* or, if the array holds at least *shmThreshold* bytes, written to a 
+        shared memory block. Other objects are returned unchanged.
+        """
+        if arg.__class__ != np.ndarray:
+            return arg
+        if shmThreshold is not None and arg.nbytes >= shmThreshold:
+            if self.sharedMemPool is None:
+                self.sharedMemPool = SharedMemoryPool()
+            return ("__shared_memory__",) + self.sharedMemPool.put(arg)
+        byteMsgs.append(arg)
+        return ("__byte_message__", len(byteMsgs)-1, (arg.dtype, arg.shape))
+        
+    def unpackArray(self, arg, byteData):
+        """Inverse of packArray(); return the array described by *arg*."""
+        if not isinstance(arg, tuple) or len(arg) == 0:
+            return arg
+        if arg[0] == '__byte_message__':
+            ind = arg[1]
+            dtype, shape = arg[2]
+            return np.frombuffer(byteData[ind], dtype=dtype).reshape(shape)
+        if arg[0] == '__shared_memory__':
+            name, dtype, shape = arg[1:]
+            return attachSharedArray(name, dtype, shape, self.releasedSharedMem.append)
+        return arg
+        
+    def releaseSharedMemory(self):
+        """Close shared memory blocks received from the remote process that are no 
+        longer referenced and inform the remote process that they may be reused."""
+        if len(self.releasedSharedMem) == 0:
+            return
+        released = []
+        while self.releasedSharedMem:
+            shm = self.releasedSharedMem.pop()
+            try:
+                shm.close()
+            except BufferError:  ## still exported somewhere; try again later
+                self.releasedSharedMem.insert(0, shm)
+                break
+            released.append(shm.name)
+        if released and not self.exited:
+            try:
+                self.send(request='releaseSharedMem', opts=dict(names=released), callSync='off')
+            except ClosedError:
+                pass
+        
+    def closeSharedMemory(self):
+        """Unlink all shared memory blocks used to send arrays to the remote process. 
+        This should only be called once the remote process has handled all requests."""
+        if self.sharedMemPool is not None:
+            self.sharedMemPool.close()
+            self.sharedMemPool = None
+
     def registerProxy(self, proxy):
         with self.proxyLock:
             ref = weakref.ref(proxy, self.deleteProxy)
@@ -602,7 +895,11 @@ class RemoteEventHandler(object):
         Transfer an object by value to the remote host (the object must be picklable) 
         and return a proxy for the new remote object.
         """
-        if obj.__class__ is np.ndarray:
+        shmThreshold = kwds.pop('sharedMemThreshold', self.getProxyOption('sharedMemThreshold'))
+        if obj.__class__ is np.ndarray and shmThreshold is not None and obj.nbytes >= shmThreshold:
+            opts = {'array': self.packArray(obj, [], shmThreshold)}
+            return self.send(request='transferSharedArray', opts=opts, **kwds)
+        elif obj.__class__ is np.ndarray:
             opts = {'dtype': obj.dtype, 'shape': obj.shape}
             return self.send(request='transferArray', opts=opts, byteData=[obj], **kwds)            
         else:
@@ -616,12 +913,23 @@ class RemoteEventHandler(object):
         return LocalObjectProxy(obj)
         
         
+def _setFutureResult(fut, value, exc):
+    if fut.done():
+        return
+    if exc is None:
+        fut.set_result(value)
+    else:
+        fut.set_exception(exc)
+
+
 class Request(object):
     """
     Request objects are returned when calling an ObjectProxy in asynchronous mode
     or if a synchronous call has timed out. Use hasResult() to ask whether
     the result of the call has been returned yet. Use result() to get
     the returned value.
+    
+    Requests may also be awaited from a coroutine (see asyncResult()).
     """
     def __init__(self, process, reqId, description=None, timeout=10):
         self.proc = process
@@ -649,11 +957,12 @@ class Request(object):
             timeout = self.timeout 
         
         if block:
+            self.proc.flushBatch()  ## the request may still be waiting to be sent
             start = time.time()
             while not self.hasResult():
                 if self.proc.exited:
                     raise ClosedError()
-                time.sleep(0.005)
+                self.proc.waitForRequests(0.005)
                 if timeout >= 0 and time.time() - start > timeout:
                     print("Request timed out: %s" % self.description)
                     import traceback
@@ -665,6 +974,54 @@ class Request(object):
             self.gotResult = True
             return self._result
         
+    def __await__(self):
+        return self.asyncResult().__await__()
+    
+    async def asyncResult(self, timeout=None):
+        """
+        Coroutine returning the result for this request; ``await request`` is 
+        equivalent to ``await request.asyncResult()``.
+        
+        If the process has been attached to the running event loop with 
+        RemoteEventHandler.attachEventLoop(), the result is delivered as soon as it 
+        arrives. Otherwise, the process is polled without blocking the event loop.
+        If *timeout* seconds pass (defaults to the timeout of the request; use a 
+        negative value to disable), raise NoResultError.
+        """
+        if self.gotResult:
+            return self._result
+        if timeout is None:
+            timeout = self.timeout
+        if timeout is not None and timeout < 0:
+            timeout = None
+        
+        self.proc.flushBatch()
+        loop = asyncio.get_running_loop()
+        if self.proc.eventLoop is not loop:
+            start = time.time()
+            while not self.hasResult():
+                if self.proc.exited:
+                    raise ClosedError()
+                if timeout is not None and time.time() - start > timeout:
+                    raise NoResultError()
+                await asyncio.sleep(0.005)
+            return self._result
+        
+        fut = loop.create_future()
+        with self.proc.asyncLock:
+            self.proc.asyncRequests.setdefault(self.reqId, []).append((self, fut))
+        self.proc.resolveAsyncRequests()  ## in case the result arrived already
+        try:
+            return await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            raise NoResultError()
+        finally:
+            with self.proc.asyncLock:
+                waiting = self.proc.asyncRequests.get(self.reqId, [])
+                waiting[:] = [w for w in waiting if w[1] is not fut]
+                if len(waiting) == 0:
+                    self.proc.asyncRequests.pop(self.reqId, None)
+    
     def hasResult(self):
         """Returns True if the result for this request has arrived."""
         try:
@@ -809,6 +1166,7 @@ class ObjectProxy(object):
             'deferGetattr': None,  ## True, False, None
             'noProxyTypes': None,  ## list of types to send by value instead of by proxy
             'autoProxy': None,
+            'sharedMemThreshold': None,  ## int (bytes), None
         }
         
         self.__dict__['_handler'] = RemoteEventHandler.getHandler(processId)
@@ -860,6 +1218,15 @@ class ObjectProxy(object):
                        remote process.
         noProxyTypes   List of object types that should _not_ be proxied when
                        sent to the remote process.
+        sharedMemThreshold
+                       int or None. Arrays passed as arguments whose size in bytes
+                       is at least this value are placed in shared memory instead
+                       of being sent through the connection. The remote process
+                       receives an array that maps the shared memory without
+                       copying; the memory is reused once the remote process no
+                       longer references the array. Note that the remote array
+                       is only valid while this process is alive.
+                       If None (the default), shared memory is not used.
         =============  =============================================================
         """
         for k in kwds:
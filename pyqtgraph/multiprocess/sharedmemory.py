@@ -0,0 +1,155 @@
+"""
+Shared memory transport for sending large arrays between processes.
+
+Arrays placed in a :class:`SharedMemoryPool` are written once into a block of
+shared memory; only a small descriptor is sent through the connection. The
+receiving process maps the same block and wraps it in an ndarray without
+copying. When the receiver no longer references the array, it informs the
+sender, which returns the block to the pool for reuse.
+"""
+import os
+import sys
+import threading
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+__all__ = ['SharedMemoryPool', 'attachSharedArray']
+
+## maps {block name: pid} for blocks created by pools; forked children inherit
+## this, so the pid tells whether a block was created by this very process
+_createdBlocks = {}
+
+
+class SharedMemoryPool(object):
+    """
+    Pool of shared memory blocks owned by the sending process.
+
+    Blocks are allocated in power-of-two sizes so that arrays of similar size can
+    reuse the same blocks. Each block holds a single array and is only reused once
+    the remote process has released that array.
+
+    ==============  ==============================================================
+    **Arguments:**
+    maxFree         Maximum number of unused blocks kept for reuse. Blocks released
+                    beyond this number are unlinked immediately.
+    ==============  ==============================================================
+    """
+    def __init__(self, maxFree=8):
+        self.maxFree = maxFree
+        self.lock = threading.Lock()
+        self.free = []    ## unused blocks, available for reuse
+        self.inUse = {}   ## maps {block name: block} for blocks holding an array
+
+    @staticmethod
+    def blockSize(nbytes):
+        """Return the size of the block used to store *nbytes* bytes."""
+        return max(4096, 1 << (int(nbytes) - 1).bit_length())
+
+    def put(self, arr):
+        """
+        Copy *arr* into a shared memory block and return a descriptor
+        ``(name, dtype, shape)`` that can be passed to :func:`attachSharedArray`
+        in another process.
+        """
+        arr = np.ascontiguousarray(arr)
+        size = self.blockSize(arr.nbytes)
+        with self.lock:
+            shm = None
+            for i, block in enumerate(self.free):
+                if block.size == size:
+                    shm = self.free.pop(i)
+                    break
+            if shm is None:
+                shm = shared_memory.SharedMemory(create=True, size=size)
+                _createdBlocks[shm.name] = os.getpid()
+            self.inUse[shm.name] = shm
+        dst = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+        dst[...] = arr
+        del dst
+        return (shm.name, arr.dtype, arr.shape)
+
+    def release(self, name):
+        """Return the named block to the pool once the array it holds has been
+        released by the remote process."""
+        with self.lock:
+            shm = self.inUse.pop(name, None)
+            if shm is None:
+                return
+            if len(self.free) < self.maxFree:
+                self.free.append(shm)
+                return
+        self._unlink(shm)
+
+    def close(self):
+        """Unlink all blocks owned by this pool.
+
+        Arrays already mapped by the remote process remain valid until they are
+        released, but no new arrays can be received from these blocks.
+        """
+        with self.lock:
+            blocks = self.free + list(self.inUse.values())
+            self.free = []
+            self.inUse = {}
+        for shm in blocks:
+            self._unlink(shm)
+
+    @staticmethod
+    def _unlink(shm):
+        _createdBlocks.pop(shm.name, None)
+        try:
+            shm.close()
+        except BufferError:
+            pass
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class _SharedArrayBuffer(object):
+    ## Base object for arrays that map a shared memory block. All views of the
+    ## array keep this object alive, so its finalizer runs only when the block
+    ## is no longer referenced in this process.
+    def __init__(self, shm, dtype, shape):
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        self._raw = np.frombuffer(shm.buf, dtype=np.uint8, count=nbytes)
+        self.__array_interface__ = {
+            'data': (self._raw.ctypes.data, False),
+            'shape': tuple(shape),
+            'typestr': dtype.str,
+            'descr': dtype.descr,
+            'version': 3,
+        }
+
+
+def _openSharedMemory(name):
+    ## Attach to an existing block without letting this process' resource
+    ## tracker take ownership of it (the sending process unlinks its blocks).
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    if os.name == 'posix' and _createdBlocks.get(name) != os.getpid():
+        ## attaching registered the block, so the tracker would unlink it when
+        ## this process exits. Blocks created by this process stay registered.
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+def attachSharedArray(name, dtype, shape, callback):
+    """
+    Map the shared memory block *name* as an array of the given *dtype* and
+    *shape* without copying.
+
+    *callback(shm)* is invoked once the returned array (and every view of it) has
+    been garbage collected. At that point the block may be closed and released
+    back to its owner.
+    """
+    shm = _openSharedMemory(name)
+    base = _SharedArrayBuffer(shm, dtype, shape)
+    arr = np.asarray(base)
+    finalizer = weakref.finalize(base, callback, shm)
+    finalizer.atexit = False
+    return arr
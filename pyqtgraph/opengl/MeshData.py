@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 import numpy as np
 
 from ..Qt import QtGui
@@ -206,17 +208,16 @@ class MeshData(object):
         """
         if self._vertexNormals is None:
             faceNorms = self.faceNormals()
-            vertFaces = self.vertexFaces()
-            self._vertexNormals = np.empty(self._vertexes.shape, dtype=np.float32)
-            for vindex in range(self._vertexes.shape[0]):
-                faces = vertFaces[vindex]
-                if len(faces) == 0:
-                    self._vertexNormals[vindex] = (0,0,0)
-                    continue
-                norms = faceNorms[faces]  ## get all face normals
-                norm = norms.sum(axis=0)       ## sum normals
-                norm /= (norm**2).sum()**0.5  ## and re-normalize
-                self._vertexNormals[vindex] = norm
+            nv = self.vertexes().shape[0]
+            faces = self.faces().ravel()
+            ## sum the normals of all faces that use each vertex
+            norms = np.empty((nv, 3), dtype=np.float64)
+            for axis in range(3):
+                norms[:, axis] = np.bincount(faces, weights=np.repeat(faceNorms[:, axis], 3), minlength=nv)
+            ## and re-normalize; vertexes without faces get (0,0,0)
+            length = np.sqrt((norms**2).sum(axis=1, keepdims=True))
+            np.divide(norms, length, out=norms, where=length > 0)
+            self._vertexNormals = norms.astype(np.float32)
                 
         if indexed is None:
             return self._vertexNormals
@@ -321,27 +322,20 @@ class MeshData(object):
         
         ## I think generally this should be discouraged..
         faces = self._vertexesIndexedByFaces
-        verts = {}  ## used to remember the index of each vertex position
-        self._faces = np.empty(faces.shape[:2], dtype=np.uint32)
-        self._vertexes = []
-        self._vertexFaces = []
+        pts = faces.reshape(-1, 3)
+        ## quantize to be sure that nearly-identical points will be merged
+        quant = np.round(pts.astype(np.float64) * 1e14)
+        quant += 0.0  ## merge -0.0 with 0.0
+        _, first, inverse = np.unique(quant, axis=0, return_index=True, return_inverse=True)
+        ## number unique vertexes in order of their first appearance
+        order = np.argsort(first, kind='stable')
+        rank = np.empty(len(order), dtype=np.uint32)
+        rank[order] = np.arange(len(order), dtype=np.uint32)
+        self._faces = rank[inverse.reshape(-1)].reshape(faces.shape[:2])
+        self._vertexes = np.ascontiguousarray(pts[first[order]], dtype=np.float32)
+        self._vertexFaces = None
         self._faceNormals = None
         self._vertexNormals = None
-        for i in range(faces.shape[0]):
-            face = faces[i]
-            for j in range(face.shape[0]):
-                pt = face[j]
-                pt2 = tuple([round(x*1e14) for x in pt])  ## quantize to be sure that nearly-identical points will be merged
-                index = verts.get(pt2, None)
-                if index is None:
-                    #self._vertexes.append(QtGui.QVector3D(*pt))
-                    self._vertexes.append(pt)
-                    self._vertexFaces.append([])
-                    index = len(self._vertexes)-1
-                    verts[pt2] = index
-                self._vertexFaces[index].append(i)  # keep track of which vertexes belong to which faces
-                self._faces[i,j] = index
-        self._vertexes = np.array(self._vertexes, dtype=np.float32)
     
     #def _setUnindexedFaces(self, faces, vertexes, vertexColors=None, faceColors=None):
         #self._vertexes = vertexes #[QtGui.QVector3D(*v) for v in vertexes]
@@ -358,11 +352,13 @@ class MeshData(object):
         Return list mapping each vertex index to a list of face indexes that use the vertex.
         """
         if self._vertexFaces is None:
-            self._vertexFaces = [[] for i in range(len(self.vertexes()))]
-            for i in range(self._faces.shape[0]):
-                face = self._faces[i]
-                for ind in face:
-                    self._vertexFaces[ind].append(i)
+            nv = len(self.vertexes())
+            verts = self.faces().ravel()
+            order = np.argsort(verts, kind='stable')
+            counts = np.bincount(verts, minlength=nv)
+            faceInds = (order // 3).tolist()
+            bounds = np.concatenate([[0], np.cumsum(counts)]).tolist()
+            self._vertexFaces = [faceInds[bounds[i]:bounds[i+1]] for i in range(nv)]
         return self._vertexFaces
         
     #def reverseNormals(self):
@@ -381,20 +377,18 @@ class MeshData(object):
     def _computeEdges(self):
         if not self.hasFaceIndexedData():
             ## generate self._edges from self._faces
-            nf = len(self._faces)
-            edges = np.empty(nf*3, dtype=[('i', np.uint32, 2)])
-            edges['i'][0:nf] = self._faces[:,:2]
-            edges['i'][nf:2*nf] = self._faces[:,1:3]
-            edges['i'][-nf:,0] = self._faces[:,2]
-            edges['i'][-nf:,1] = self._faces[:,0]
+            faces = self._faces.astype(np.uint64)
+            a = faces.ravel()
+            b = faces[:, [1, 2, 0]].ravel()
             
-            # sort per-edge
-            mask = edges['i'][:,0] > edges['i'][:,1]
-            edges['i'][mask] = edges['i'][mask][:,::-1]
+            # sort per-edge and pack each edge into a single integer
+            keys = (np.minimum(a, b) << np.uint64(32)) | np.maximum(a, b)
             
             # remove duplicate entries
-            self._edges = np.unique(edges)['i']
-            #print self._edges
+            keys = np.unique(keys)
+            self._edges = np.empty((len(keys), 2), dtype=np.uint32)
+            self._edges[:, 0] = keys >> np.uint64(32)
+            self._edges[:, 1] = keys & np.uint64(0xffffffff)
         elif self._vertexesIndexedByFaces is not None:
             verts = self._vertexesIndexedByFaces
             edges = np.empty((verts.shape[0], 3, 2), dtype=np.uint32)
@@ -449,38 +443,12 @@ class MeshData(object):
         """
         Return a MeshData instance with vertexes and faces computed
         for a spherical surface.
+        
+        The vertex and face arrays are cached for the most recently used
+        parameters, so repeatedly creating the same sphere only copies them.
         """
-        verts = np.empty((rows+1, cols, 3), dtype=np.float32)
-        
-        ## compute vertexes
-        phi = (np.arange(rows+1) * np.pi / rows).reshape(rows+1, 1)
-        s = radius * np.sin(phi)
-        verts[...,2] = radius * np.cos(phi)
-        th = ((np.arange(cols) * 2 * np.pi / cols).reshape(1, cols)) 
-        if offset:
-            th = th + ((np.pi / cols) * np.arange(rows+1).reshape(rows+1,1))  ## rotate each row by 1/2 column
-        verts[...,0] = s * np.cos(th)
-        verts[...,1] = s * np.sin(th)
-        verts = verts.reshape((rows+1)*cols, 3)[cols-1:-(cols-1)]  ## remove redundant vertexes from top and bottom
-        
-        ## compute faces
-        faces = np.empty((rows*cols*2, 3), dtype=np.uint32)
-        rowtemplate1 = ((np.arange(cols).reshape(cols, 1) + np.array([[0, 1, 0]])) % cols) + np.array([[0, 0, cols]])
-        rowtemplate2 = ((np.arange(cols).reshape(cols, 1) + np.array([[0, 1, 1]])) % cols) + np.array([[cols, 0, cols]])
-        for row in range(rows):
-            start = row * cols * 2 
-            faces[start:start+cols] = rowtemplate1 + row * cols
-            faces[start+cols:start+(cols*2)] = rowtemplate2 + row * cols
-        faces = faces[cols:-cols]  ## cut off zero-area triangles at top and bottom
-        
-        ## adjust for redundant vertexes that were removed from top and bottom
-        vmin = cols-1
-        faces[faces<vmin] = vmin
-        faces -= vmin  
-        vmax = verts.shape[0]-1
-        faces[faces>vmax] = vmax
-        
-        return MeshData(vertexes=verts, faces=faces)
+        verts, faces = _cachedPrimitive(_sphereArrays, rows, cols, float(radius), bool(offset))
+        return MeshData(vertexes=verts.copy(), faces=faces.copy())
         
     @staticmethod
     def cylinder(rows, cols, radius=[1.0, 1.0], length=1.0, offset=False):
@@ -488,27 +456,92 @@ class MeshData(object):
         Return a MeshData instance with vertexes and faces computed
         for a cylindrical surface.
         The cylinder may be tapered with different radii at each end (truncated cone)
+        
+        The vertex and face arrays are cached for the most recently used
+        parameters, so repeatedly creating the same cylinder only copies them.
         """
-        verts = np.empty((rows+1, cols, 3), dtype=np.float32)
-        if isinstance(radius, int):
+        if isinstance(radius, (int, float)):
             radius = [radius, radius] # convert to list
-        ## compute vertexes
-        th = np.linspace(2 * np.pi, (2 * np.pi)/cols, cols).reshape(1, cols)
-        r = np.linspace(radius[0],radius[1],num=rows+1, endpoint=True).reshape(rows+1, 1) # radius as a function of z
-        verts[...,2] = np.linspace(0, length, num=rows+1, endpoint=True).reshape(rows+1, 1) # z
-        if offset:
-            th = th + ((np.pi / cols) * np.arange(rows+1).reshape(rows+1,1))  ## rotate each row by 1/2 column
-        verts[...,0] = r * np.cos(th) # x = r cos(th)
-        verts[...,1] = r * np.sin(th) # y = r sin(th)
-        verts = verts.reshape((rows+1)*cols, 3) # just reshape: no redundant vertices...
-        ## compute faces
-        faces = np.empty((rows*cols*2, 3), dtype=np.uint32)
-        rowtemplate1 = ((np.arange(cols).reshape(cols, 1) + np.array([[0, 1, 0]])) % cols) + np.array([[0, 0, cols]])
-        rowtemplate2 = ((np.arange(cols).reshape(cols, 1) + np.array([[0, 1, 1]])) % cols) + np.array([[cols, 0, cols]])
-        for row in range(rows):
-            start = row * cols * 2 
-            faces[start:start+cols] = rowtemplate1 + row * cols
-            faces[start+cols:start+(cols*2)] = rowtemplate2 + row * cols
-        
-        return MeshData(vertexes=verts, faces=faces)
-        
+        radius = (float(radius[0]), float(radius[1]))
+        verts, faces = _cachedPrimitive(_cylinderArrays, rows, cols, radius, float(length), bool(offset))
+        return MeshData(vertexes=verts.copy(), faces=faces.copy())
+
+    @staticmethod
+    def clearPrimitiveCache():
+        """Discard the cached arrays used by sphere() and cylinder()."""
+        _primitiveCache.clear()
+
+
+## LRU cache of primitive mesh arrays; maps {(function, args): (verts, faces)}
+_primitiveCache = OrderedDict()
+_primitiveCacheSize = 16
+
+
+def _cachedPrimitive(func, *args):
+    key = (func, args)
+    try:
+        _primitiveCache.move_to_end(key)
+        return _primitiveCache[key]
+    except KeyError:
+        pass
+    verts, faces = func(*args)
+    verts.flags.writeable = False
+    faces.flags.writeable = False
+    _primitiveCache[key] = (verts, faces)
+    while len(_primitiveCache) > _primitiveCacheSize:
+        _primitiveCache.popitem(last=False)
+    return verts, faces
+
+
+def _gridFaces(rows, cols):
+    ## faces of a grid of (rows+1, cols) vertexes that wraps around in the column direction
+    rowtemplate1 = ((np.arange(cols).reshape(cols, 1) + np.array([[0, 1, 0]])) % cols) + np.array([[0, 0, cols]])
+    rowtemplate2 = ((np.arange(cols).reshape(cols, 1) + np.array([[0, 1, 1]])) % cols) + np.array([[cols, 0, cols]])
+    template = np.concatenate([rowtemplate1, rowtemplate2]).astype(np.uint32)
+    faces = template[np.newaxis] + (np.arange(rows, dtype=np.uint32) * cols).reshape(rows, 1, 1)
+    return faces.reshape(rows*cols*2, 3)
+
+
+def _sphereArrays(rows, cols, radius, offset):
+    verts = np.empty((rows+1, cols, 3), dtype=np.float32)
+    
+    ## compute vertexes
+    phi = (np.arange(rows+1) * np.pi / rows).reshape(rows+1, 1)
+    s = radius * np.sin(phi)
+    verts[...,2] = radius * np.cos(phi)
+    th = ((np.arange(cols) * 2 * np.pi / cols).reshape(1, cols)) 
+    if offset:
+        th = th + ((np.pi / cols) * np.arange(rows+1).reshape(rows+1,1))  ## rotate each row by 1/2 column
+    verts[...,0] = s * np.cos(th)
+    verts[...,1] = s * np.sin(th)
+    verts = verts.reshape((rows+1)*cols, 3)[cols-1:-(cols-1)]  ## remove redundant vertexes from top and bottom
+    
+    ## compute faces
+    faces = _gridFaces(rows, cols)
+    faces = faces[cols:-cols]  ## cut off zero-area triangles at top and bottom
+    
+    ## adjust for redundant vertexes that were removed from top and bottom
+    vmin = cols-1
+    faces[faces<vmin] = vmin
+    faces -= vmin  
+    vmax = verts.shape[0]-1
+    faces[faces>vmax] = vmax
+    
+    return np.ascontiguousarray(verts), np.ascontiguousarray(faces)
+
+
+def _cylinderArrays(rows, cols, radius, length, offset):
+    verts = np.empty((rows+1, cols, 3), dtype=np.float32)
+    ## compute vertexes
+    th = np.linspace(2 * np.pi, (2 * np.pi)/cols, cols).reshape(1, cols)
+    r = np.linspace(radius[0],radius[1],num=rows+1, endpoint=True).reshape(rows+1, 1) # radius as a function of z
+    verts[...,2] = np.linspace(0, length, num=rows+1, endpoint=True).reshape(rows+1, 1) # z
+    if offset:
+        th = th + ((np.pi / cols) * np.arange(rows+1).reshape(rows+1,1))  ## rotate each row by 1/2 column
+    verts[...,0] = r * np.cos(th) # x = r cos(th)
+    verts[...,1] = r * np.sin(th) # y = r sin(th)
+    verts = verts.reshape((rows+1)*cols, 3) # just reshape: no redundant vertices...
+    ## compute faces
+    faces = _gridFaces(rows, cols)
+    
+    return verts, faces
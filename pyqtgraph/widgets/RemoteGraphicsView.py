@@ -1,14 +1,18 @@
 from ..Qt import QT_LIB, QtCore, QtGui, QtWidgets
 
 import atexit
+import collections
 import enum
 import mmap
 import os
 import sys
 import tempfile
 
+import numpy as np
+
 from .. import Qt
 from .. import CONFIG_OPTIONS
+from .. import functions as fn
 from .. import multiprocess as mp
 from .GraphicsView import GraphicsView
 
@@ -142,7 +146,15 @@ class RemoteGraphicsView(QtWidgets.QWidget):
     def __init__(self, parent=None, *args, **kwds):
         """
         The keyword arguments 'useOpenGL' and 'backgound', if specified, are passed to the remote
-        GraphicsView.__init__(). All other keyword arguments are passed to multiprocess.QtProcess.__init__().
+        GraphicsView.__init__(). All other keyword arguments are passed to multiprocess.QtProcess.__init__(),
+        except for the following:
+
+        ==============  ================================================================
+        buffers         Number of frames held in shared memory (default 2). With more
+                        than one buffer, the remote process renders the next frame
+                        while this widget copies the previous one.
+        maxFrameRate    Maximum number of frames rendered per second (default 60).
+        ==============  ================================================================
         """
         self._img = None
         self._imgReq = None
@@ -152,7 +164,7 @@ class RemoteGraphicsView(QtWidgets.QWidget):
 
         # separate local keyword arguments from remote.
         remoteKwds = {}
-        for kwd in ['useOpenGL', 'background']:
+        for kwd in ['useOpenGL', 'background', 'buffers', 'maxFrameRate']:
             if kwd in kwds:
                 remoteKwds[kwd] = kwds.pop(kwd)
 
@@ -174,11 +186,13 @@ class RemoteGraphicsView(QtWidgets.QWidget):
             opener = None
         self.shmFile = open(shmFileName, 'rb', opener=opener)
         
-        self._view.sceneRendered.connect(mp.proxy(self.remoteSceneChanged)) #, callSync='off'))
-                                                                            ## Note: we need synchronous signals
-                                                                            ## even though there is no return value--
-                                                                            ## this informs the renderer that it is 
-                                                                            ## safe to begin rendering again. 
+        ## frames are announced asynchronously; the renderer waits for
+        ## frameDisplayed() before reusing the buffer of a frame
+        self._frame = None        ## latest frame not yet displayed
+        self._frameRects = []     ## regions changed since the displayed frame
+        self._frameStats = {'rendered': 0, 'displayed': 0, 'dropped': 0, 'stalled': 0}
+        self._view.sceneRendered.connect(mp.proxy(self.remoteSceneChanged, callSync='off'))
+        self._view.frameDisplayed(0, _callSync='off')  ## start rendering
         
         for method in ['scene', 'setCentralItem']:
             setattr(self, method, getattr(self._view, method))
@@ -191,20 +205,81 @@ class RemoteGraphicsView(QtWidgets.QWidget):
     def sizeHint(self):
         return QtCore.QSize(*self._sizeHint)
         
-    def remoteSceneChanged(self, data):
-        w, h, size = data
-        if self.shm is None or self.shm.size != size:
+    def setMaxFrameRate(self, fps):
+        """Set the maximum number of frames per second rendered by the remote process."""
+        self._view.setMaxFrameRate(fps, _callSync='off')
+
+    def frameStats(self):
+        """
+        Return a dict of frame statistics:
+
+        =========  ================================================================
+        rendered   Number of frames rendered by the remote process.
+        displayed  Number of frames copied into this widget.
+        dropped    Number of frames skipped because a newer frame arrived before
+                   they could be displayed.
+        stalled    Number of times the remote process delayed a frame because all
+                   of its buffers were still in use by this widget.
+        =========  ================================================================
+        """
+        return dict(self._frameStats)
+
+    def remoteSceneChanged(self, frame):
+        ## Frames are displayed from the event loop; when several frames arrive
+        ## at once, only the latest one is copied, along with the regions that
+        ## changed in all of them.
+        self._frameStats['rendered'] = frame['seq']
+        self._frameStats['stalled'] = frame['stalled']
+        if self._frame is None:
+            QtCore.QTimer.singleShot(0, self._displayFrame)
+        else:
+            self._frameStats['dropped'] += 1
+        self._frame = frame
+        if frame['rects'] is None or self._frameRects is None:
+            self._frameRects = None
+        else:
+            self._frameRects.extend(frame['rects'])
+
+    def _displayFrame(self):
+        frame, rects = self._frame, self._frameRects
+        self._frame = None
+        self._frameRects = []
+        if frame is None:
+            return
+        w, h, size = frame['width'], frame['height'], frame['size']
+        if self.shm is None or len(self.shm) != size:
             if self.shm is not None:
                 self.shm.close()
             self.shm = mmap.mmap(self.shmFile.fileno(), size, access=mmap.ACCESS_READ)
-        self._img = QtGui.QImage(self.shm, w, h, QtGui.QImage.Format.Format_RGB32).copy()
-        self.update()
+        src = np.frombuffer(self.shm, dtype=np.ubyte, count=w * h * 4, offset=frame['offset']).reshape(h, w, 4)
+
+        if rects is None or self._img is None or self._img.size() != QtCore.QSize(w, h):
+            self._img = QtGui.QImage(w, h, QtGui.QImage.Format.Format_RGB32)
+            self._imgData = fn.ndarray_from_qimage(self._img)
+            self._imgData[...] = src
+            self.update()
+        else:
+            ## only the regions that were rendered again are copied from shared memory
+            ## and repainted
+            sx = self.width() / w
+            sy = self.height() / h
+            for x, y, rw, rh in rects:
+                self._imgData[y:y+rh, x:x+rw] = src[y:y+rh, x:x+rw]
+                self.update(QtCore.QRectF(x * sx, y * sy, rw * sx, rh * sy).toAlignedRect())
+        del src
+        self._frameStats['displayed'] += 1
+        self._view.frameDisplayed(frame['seq'], _callSync='off')
         
     def paintEvent(self, ev):
         if self._img is None:
             return
         p = QtGui.QPainter(self)
-        p.drawImage(self.rect(), self._img, self._img.rect())
+        ## draw only the exposed part of the (scaled) image
+        sx = self._img.width() / max(1, self.width())
+        sy = self._img.height() / max(1, self.height())
+        target = QtCore.QRectF(ev.rect())
+        source = QtCore.QRectF(target.x() * sx, target.y() * sy, target.width() * sx, target.height() * sy)
+        p.drawImage(target, self._img, source)
         p.end()
 
     def mousePressEvent(self, ev):
@@ -242,15 +317,43 @@ class RemoteGraphicsView(QtWidgets.QWidget):
     def close(self):
         """Close the remote process. After this call, the widget will no longer be updated."""
         self._view.sceneRendered.disconnect()
+        self._frame = None
         self._proc.close()
 
 
 class Renderer(GraphicsView):
-    ## Created by the remote process to handle render requests
+    ## Created by the remote process to handle render requests.
+    ##
+    ## Frames are rendered into a ring of *buffers* slots in shared memory, so that
+    ## a new frame can be rendered while the client is still copying an older one.
+    ## Each frame is announced asynchronously by sceneRendered with a dict:
+    ##
+    ##   seq       frame sequence number, starting at 1
+    ##   offset    byte offset of the frame's slot in shared memory
+    ##   width, height   image size in pixels
+    ##   size      total size of the shared memory
+    ##   rects     list of (x, y, w, h) image regions that changed since the
+    ##             previous frame, or None if the whole image changed
+    ##   stalled   number of frames delayed so far because no slot was free
+    ##
+    ## Rendering starts once the client has connected to sceneRendered and called
+    ## frameDisplayed(0). Then, the client calls frameDisplayed(seq) once it has
+    ## copied a frame. A slot is only rendered into again after the client has
+    ## acknowledged the frame it held (or a later one), so frames are never
+    ## overwritten while being read.
+    ##
+    ## After the first frame, only the parts of the view reported by the scene's
+    ## changed signal are rendered again, together with the changes of the other
+    ## frames rendered since the slot was last used.
     
     sceneRendered = QtCore.Signal(object)
+
+    ## render the whole frame instead when the dirty regions cover more than this
+    ## fraction of the view, or consist of more rects than maxDirtyRects
+    maxDirtyFraction = 0.5
+    maxDirtyRects = 32
     
-    def __init__(self, *args, **kwds):
+    def __init__(self, *args, buffers=2, maxFrameRate=60, **kwds):
         ## Create shared memory for rendered image
         self.shmFile = tempfile.NamedTemporaryFile(prefix='pyqtgraph_shmem_')
         size = mmap.PAGESIZE
@@ -258,24 +361,61 @@ class Renderer(GraphicsView):
         self.shmFile.flush()
         self.shm = mmap.mmap(self.shmFile.fileno(), size, access=mmap.ACCESS_WRITE)
         atexit.register(self.close)
+        self.numBuffers = max(1, int(buffers))
+        self.images = None        ## one QImage per slot, mapping the shared memory
+        self.imageBuffers = []    ## buffers exported by the shared memory for the images
+        self.slotSize = 0
+        self.slotValid = []       ## whether each slot holds a complete frame
+        self.history = collections.deque(maxlen=self.numBuffers - 1)  ## rects of recent frames
+        self.frameSeq = 0         ## last frame rendered
+        self.ackSeq = None        ## last frame acknowledged by the client, None until
+                                  ## the client is ready to receive frames
+        self.stalled = 0
+        self.fullUpdate = True
+        self.dirtyRects = []
         
         GraphicsView.__init__(self, *args, **kwds)
-        self.scene().changed.connect(self.update)
-        self.img = None
+        self.scene().changed.connect(self.sceneChanged)
+        self.sigDeviceTransformChanged.connect(self.update)
         self.renderTimer = QtCore.QTimer()
         self.renderTimer.timeout.connect(self.renderView)
-        self.renderTimer.start(16)
+        self.setMaxFrameRate(maxFrameRate)
         
     def close(self):
+        self._releaseImages()
         self.shm.close()
         self.shmFile.close()
 
     def shmFileName(self):
         return self.shmFile.name
+
+    def setMaxFrameRate(self, fps):
+        """Set the maximum number of frames rendered per second."""
+        self.maxFrameRate = fps
+        self.renderTimer.start(max(1, int(1000 / fps)))
+
+    def frameDisplayed(self, seq):
+        ## called by the client when it no longer reads frame *seq* or any earlier frame
+        self.ackSeq = seq if self.ackSeq is None else max(self.ackSeq, seq)
         
     def update(self):
-        self.img = None
+        ## the whole view is rendered again
+        self.fullUpdate = True
+        self.dirtyRects = []
         return super().update()
+
+    def sceneChanged(self, rects):
+        ## accumulate the changed scene areas, in view coordinates
+        if self.fullUpdate:
+            return
+        tr = self.viewportTransform()
+        for rect in rects:
+            ## grow rects slightly to cover antialiased edges
+            self.dirtyRects.append(tr.mapRect(rect).toAlignedRect().adjusted(-2, -2, 2, 2))
+
+    def setBackground(self, background):
+        super().setBackground(background)
+        self.update()
         
     def resize(self, size):
         oldSize = self.size()
@@ -284,40 +424,142 @@ class Renderer(GraphicsView):
         self.update()
         
     def renderView(self):
-        if self.img is None:
-            ## make sure shm is large enough and get its address
-            if self.width() == 0 or self.height() == 0:
+        if not self.fullUpdate and len(self.dirtyRects) == 0:
+            return
+        if self.width() == 0 or self.height() == 0 or self.ackSeq is None:
+            return
+        if self.frameSeq - self.ackSeq >= self.numBuffers:
+            ## every slot holds a frame that the client may still be reading
+            self.stalled += 1
+            return
+
+        dpr = self.devicePixelRatioF()
+        iwidth = int(self.width() * dpr)
+        iheight = int(self.height() * dpr)
+        img = None if self.images is None else self.images[0]
+        if img is None or (img.width(), img.height(), img.devicePixelRatio()) != (iwidth, iheight, dpr):
+            if self.frameSeq != self.ackSeq:
+                ## frames in flight still use the previous layout of the slots
+                self.stalled += 1
                 return
-            dpr = self.devicePixelRatioF()
-            iwidth = int(self.width() * dpr)
-            iheight = int(self.height() * dpr)
-            size = iwidth * iheight * 4
-            if size > self.shm.size():
-                try:
-                    self.shm.resize(size)
-                except SystemError:
-                    # actually, the platforms on which resize() _does_ work
-                    # can also take this codepath
-                    self.shm.close()
-                    fd = self.shmFile.fileno()
-                    os.ftruncate(fd, size)
-                    self.shm = mmap.mmap(fd, size, access=mmap.ACCESS_WRITE)
-            
-            ## render the scene directly to shared memory
+            self._allocateImages(iwidth, iheight, dpr)
+            self.fullUpdate = True
+
+        viewRect = self.rect()
+        if self.fullUpdate:
+            rects = None
+        else:
+            rects = self._dirtyRects([r & viewRect for r in self.dirtyRects])
+            if rects is not None and len(rects) == 0:
+                self.dirtyRects = []
+                return
+        self.fullUpdate = False
+        self.dirtyRects = []
+
+        seq = self.frameSeq + 1
+        slot = seq % self.numBuffers
+        ## the slot still holds an older frame, so the changes of the frames
+        ## rendered since then are rendered as well
+        renderRects = rects
+        if renderRects is not None:
+            if not self.slotValid[slot] or None in self.history:
+                renderRects = None
+            else:
+                renderRects = self._dirtyRects(rects + [r for h in self.history for r in h])
 
+        img = self.images[slot]
+        p = QtGui.QPainter(img)
+        if renderRects is None:
+            img.fill(0xffffffff)
+            self.render(p, self.viewRect(), self.rect())
+        else:
+            for rect in renderRects:
+                p.setClipRect(rect)
+                p.fillRect(rect, QtGui.QColor(255, 255, 255))
+                self.render(p, QtCore.QRectF(rect), rect)
+        p.end()
+        self.slotValid[slot] = True
+        self.history.append(rects)
+        self.frameSeq = seq
+
+        if rects is not None:
+            imgRects = []
+            for rect in rects:
+                r = QtCore.QRectF(rect.x() * dpr, rect.y() * dpr, rect.width() * dpr, rect.height() * dpr)
+                r = r.toAlignedRect() & img.rect()
+                imgRects.append((r.x(), r.y(), r.width(), r.height()))
+            rects = imgRects
+        self.sceneRendered.emit(dict(seq=seq, offset=slot * self.slotSize, width=iwidth, height=iheight,
+                                     size=self.shm.size(), rects=rects, stalled=self.stalled))
+
+    def _dirtyRects(self, rects):
+        ## merge dirty rects, or return None if the whole view should be rendered;
+        ## rendering regions is only done when the view maps 1:1 onto the image
+        viewRect = self.rect()
+        rects = _mergeRects(rects)
+        area = sum(r.width() * r.height() for r in rects)
+        if (area > self.maxDirtyFraction * viewRect.width() * viewRect.height() or
+                len(rects) > self.maxDirtyRects or
+                self.viewRect() != QtCore.QRectF(viewRect)):
+            return None
+        return rects
+
+    def _allocateImages(self, iwidth, iheight, dpr):
+        ## make sure shm is large enough for all slots and map one image onto each
+        self._releaseImages()
+        nbytes = iwidth * iheight * 4
+        self.slotSize = -(-nbytes // mmap.PAGESIZE) * mmap.PAGESIZE
+        size = self.slotSize * self.numBuffers
+        if size > self.shm.size():
+            try:
+                self.shm.resize(size)
+            except SystemError:
+                # actually, the platforms on which resize() _does_ work
+                # can also take this codepath
+                self.shm.close()
+                fd = self.shmFile.fileno()
+                os.ftruncate(fd, size)
+                self.shm = mmap.mmap(fd, size, access=mmap.ACCESS_WRITE)
+
+        ## render the scene directly to shared memory
+        self.images = []
+        for slot in range(self.numBuffers):
+            offset = slot * self.slotSize
             # see functions.py::ndarray_to_qimage() for rationale
             if QT_LIB.startswith('PyQt'):
                 # PyQt5, PyQt6 >= 6.0.1
-                img_ptr = int(Qt.sip.voidptr(self.shm))
+                img_ptr = int(Qt.sip.voidptr(self.shm)) + offset
             else:
                 # PySide2, PySide6
-                img_ptr = self.shm
-
-            self.img = QtGui.QImage(img_ptr, iwidth, iheight, QtGui.QImage.Format.Format_RGB32)
-            self.img.setDevicePixelRatio(dpr)
-
-            self.img.fill(0xffffffff)
-            p = QtGui.QPainter(self.img)
-            self.render(p, self.viewRect(), self.rect())
-            p.end()
-            self.sceneRendered.emit((iwidth, iheight, self.shm.size()))
+                img_ptr = memoryview(self.shm)[offset:offset+nbytes]
+                self.imageBuffers.append(img_ptr)
+            img = QtGui.QImage(img_ptr, iwidth, iheight, QtGui.QImage.Format.Format_RGB32)
+            img.setDevicePixelRatio(dpr)
+            self.images.append(img)
+        self.slotValid = [False] * self.numBuffers
+        self.history.clear()
+
+    def _releaseImages(self):
+        ## the shared memory can only be resized or closed once no buffers are exported
+        self.images = None
+        for buf in self.imageBuffers:
+            buf.release()
+        self.imageBuffers = []
+
+
+def _mergeRects(rects):
+    ## merge overlapping QRects into their bounding rects, so that no area is
+    ## rendered twice; empty rects are dropped
+    merged = []
+    for rect in rects:
+        if rect.isEmpty():
+            continue
+        i = 0
+        while i < len(merged):
+            if merged[i].intersects(rect):
+                rect = rect.united(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
@@ -1,5 +1,6 @@
 
 import csv
+import io
 import math
 import tempfile
 
@@ -80,3 +81,51 @@ def test_CSVExporter_with_ErrorBarItem():
         assert pytest.approx(float(values[1])) == y[i]
         assert pytest.approx(float(values[2])) == bottom_error[i]
         assert pytest.approx(float(values[3])) == top_error[i]
+
+
+@pytest.mark.parametrize('precision', [0, 3, 10])
+def test_CSVExporter_blocks(precision):
+    plt = pg.PlotWidget()
+    x1 = np.arange(25) * 0.5
+    y1 = np.linspace(-1, 1, 25)
+    y1[:6] = [1e15 / 3, 1e-12, 1.5e-5, 1e20, 0.125, 0.30000000000000004]
+    x2 = np.array([0, 1, 2**53 + 1, 2**60 + 1, -7, 3, 4], dtype=np.int64)
+    y2 = np.array([0.0, -0.0, 1e-9, 123.4567, np.nan, np.inf, -np.inf])
+    plt.plot(x=x1, y=y1)
+    plt.plot(x=x2, y=y2)
+    ex = pg.exporters.CSVExporter(plt.plotItem)
+    ex.params['separator'] = 'tab'
+    ex.params['precision'] = precision
+    ## ragged columns and row blocks that do not line up with the column lengths
+    ex.blockSize = 4
+    with tempfile.NamedTemporaryFile(mode="w+t", suffix='.tsv', encoding="utf-8", delete=False) as tf:
+        ex.export(fileName=tf.name)
+        lines = list(csv.reader(tf, delimiter='\t'))
+    assert lines.pop(0) == ['x0000', 'y0000', 'x0001', 'y0001']
+    assert len(lines) == len(x1)
+
+    ## the block formatter writes the same text as the generic row formatter
+    header, columns = ex._collectColumns()
+    assert [c.dtype.kind for c in columns] == ['f', 'f', 'i', 'f']
+    buf = io.StringIO(newline='')
+    ex._writeRows(csv.writer(buf, delimiter='\t'), columns)
+    buf.seek(0)
+    assert lines == list(csv.reader(buf, delimiter='\t'))
+    assert lines[len(y2)][2:] == ['', '']
+
+
+@pytest.mark.parametrize('dtype', [np.float16, np.float32])
+def test_CSVExporter_float32(dtype):
+    ## values are written with the shortest representation of their own type
+    plt = pg.PlotWidget()
+    x = np.array([0.1, 1/3, 2.5], dtype=dtype)
+    plt.plot(x=x, y=x)
+    ex = pg.exporters.CSVExporter(plt.plotItem)
+    with tempfile.NamedTemporaryFile(mode="w+t", suffix='.csv', encoding="utf-8", delete=False) as tf:
+        ex.export(fileName=tf.name)
+        lines = list(csv.reader(tf))
+    assert lines.pop(0) == ['x0000', 'y0000']
+    expected = [np.format_float_positional(v, precision=10) for v in x]
+    assert lines == [[v, v] for v in expected]
+    if dtype is np.float32:
+        assert expected[:2] == ['0.1', '0.33333334']
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+import pyqtgraph as pg
+from pyqtgraph.exporters import (CSVExporter, ImageExporter, NumpyExporter,
+                                 SVGExporter, exportMany)
+from pyqtgraph.Qt import QtGui
+
+app = pg.mkQApp()
+
+
+def makePlots(n):
+    plots = []
+    for i in range(n):
+        plt = pg.PlotWidget(title='plot %d' % i)
+        plt.resize(200, 150)
+        plt.plot(np.random.normal(size=50), pen='y', symbol='o', name='curve')
+        plt.show()
+        plots.append(plt)
+    app.processEvents()
+    return plots
+
+
+def test_exportMany_image(tmp_path):
+    plots = makePlots(3)
+    fileNames = [tmp_path / ('plot%d.png' % i) for i in range(3)]
+    result = exportMany([p.plotItem for p in plots], fileNames, ImageExporter,
+                        workers=2, progress=False, antialias=False)
+    assert result == [str(f) for f in fileNames]
+
+    for plt, fileName in zip(plots, fileNames):
+        ex = ImageExporter(plt.plotItem)
+        ex.parameters()['antialias'] = False
+        ## keep references to the images; the arrays do not own their buffers
+        refImg = ex.export(toBytes=True).convertToFormat(QtGui.QImage.Format.Format_ARGB32)
+        img = QtGui.QImage(str(fileName)).convertToFormat(QtGui.QImage.Format.Format_ARGB32)
+        expected = pg.functions.ndarray_from_qimage(refImg)
+        assert np.all(pg.functions.ndarray_from_qimage(img) == expected)
+        plt.close()
+
+
+def test_exportMany_data(tmp_path):
+    plots = makePlots(2)
+    items = [p.plotItem for p in plots]
+    csvNames = [tmp_path / ('plot%d.csv' % i) for i in range(2)]
+    exportMany(items, csvNames, CSVExporter, progress=False, precision=3)
+    x, y = plots[1].plotItem.dataItems[0].getData()
+    data = np.loadtxt(csvNames[1], delimiter=',', skiprows=1)
+    assert np.allclose(data[:, 1], y, atol=1e-3)
+
+    ## data is captured when prepared, not when written
+    ex = NumpyExporter(items[0])
+    write = ex.prepareExport(str(tmp_path / 'data.npz'))
+    y0 = items[0].dataItems[0].getOriginalDataset()[1].copy()
+    items[0].dataItems[0].yData[:] = 0
+    write()
+    with np.load(tmp_path / 'data.npz') as npz:
+        assert np.all(npz['curve_y'] == y0)
+
+    ## exporters without prepareExport run on the GUI thread
+    svgNames = [tmp_path / ('plot%d.svg' % i) for i in range(2)]
+    assert exportMany(items, svgNames, SVGExporter, progress=False) == [str(f) for f in svgNames]
+    assert all(f.stat().st_size > 0 for f in svgNames)
+    for plt in plots:
+        plt.close()
+
+
+def test_exportMany_errors(tmp_path):
+    plots = makePlots(2)
+    items = [p.plotItem for p in plots]
+    with pytest.raises(ValueError):
+        exportMany(items, [tmp_path / 'a.png'], ImageExporter)
+    with pytest.raises(IOError):
+        exportMany(items, [tmp_path / 'a.png', tmp_path / 'missing' / 'b.png'],
+                   ImageExporter, progress=False)
+    for plt in plots:
+        plt.close()
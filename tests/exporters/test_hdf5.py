@@ -71,3 +71,92 @@ def test_HDF5Exporter_unequal_lengths(tmp_h5):
         # should be a dataset under the group with a default name that's the
         # index of the curve in the PlotItem
         assert_equal(np.array([x2, y2]), group['1'])
+
+
+@pytest.mark.parametrize("compression", ['gzip', 'lzf'])
+def test_HDF5Exporter_append(tmp_h5, compression):
+    # Periodic exports of the same plot are appended along the sample axis
+    x = np.arange(50)
+    y = np.arange(50) ** 2
+
+    plt = pg.PlotWidget()
+    curve = plt.plot(x=x, y=y)
+
+    ex = HDF5Exporter(plt.plotItem)
+    ex.parameters()['compression'] = compression
+    ex.parameters()['append'] = True
+    ex.export(fileName=tmp_h5)
+    curve.setData(x=x[:10] + 50, y=y[:10])
+    ex.export(fileName=tmp_h5)
+
+    with h5py.File(tmp_h5, 'r') as f:
+        dset = f[ex.parameters()['Name']]
+        assert dset.compression == compression
+        assert dset.chunks is not None
+        assert dset.maxshape == (2, None)
+        assert_equal(dset, np.array([np.arange(60), np.concatenate([y, y[:10]])]))
+
+    # datasets that were not created in append mode cannot grow
+    ex.parameters()['Name'] = 'fixed'
+    ex.parameters()['append'] = False
+    ex.parameters()['compression'] = 'none'
+    ex.export(fileName=tmp_h5)
+    ex.parameters()['append'] = True
+    with pytest.raises(ValueError):
+        ex.export(fileName=tmp_h5)
+
+
+def test_HDF5Exporter_append_unequal_lengths(tmp_h5):
+    plt = pg.PlotWidget()
+    plt.plot(x=np.arange(3), y=np.ones(3), name='plot0')
+    plt.plot(x=np.arange(5), y=np.zeros(5))
+
+    ex = HDF5Exporter(plt.plotItem)
+    ex.parameters()['append'] = True
+    ex.export(fileName=tmp_h5)
+    ex.export(fileName=tmp_h5)
+
+    with h5py.File(tmp_h5, 'r') as f:
+        group = f[ex.parameters()['Name']]
+        assert group['plot0'].shape == (2, 6)
+        assert group['1'].shape == (2, 10)
+
+
+def test_HDF5Exporter_image(tmp_h5):
+    img = np.random.randint(0, 1000, size=(8, 10), dtype=np.uint16)
+    item = pg.ImageItem(img)
+
+    ex = HDF5Exporter(item)
+    ex.export(fileName=tmp_h5)
+    ex.parameters()['Name'] = 'frames'
+    ex.parameters()['append'] = True
+    ex.export(fileName=tmp_h5)
+    item.setImage(img + 1)
+    ex.export(fileName=tmp_h5)
+
+    with h5py.File(tmp_h5, 'r') as f:
+        assert f['Export'].dtype == np.uint16
+        assert_equal(f['Export'], img)
+        assert f['frames'].shape == (2, 8, 10)
+        assert_equal(f['frames'][1], img + 1)
+
+
+def test_HDF5Exporter_imageview(tmp_h5):
+    stack = np.random.normal(size=(4, 6, 5)).astype(np.float32)
+    iv = pg.ImageView()
+    iv.setImage(stack, xvals=np.arange(4) * 0.5)
+
+    ex = HDF5Exporter(iv)
+    ex.parameters()['compression'] = 'gzip'
+    ex.parameters()['append'] = True
+    ex.export(fileName=tmp_h5)
+    ex.export(fileName=tmp_h5)
+
+    with h5py.File(tmp_h5, 'r') as f:
+        dset = f['Export']
+        assert dset.dtype == np.float32
+        assert dset.shape == (8, 6, 5)
+        assert_equal(dset[4:], stack)
+        assert_equal(f['Export_t'], np.concatenate([np.arange(4) * 0.5] * 2))
+        assert dset.dims[0][0].name == '/Export_t'
+    iv.close()
@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 
 import pyqtgraph as pg
 import pyqtgraph.functions as fn
@@ -30,3 +31,63 @@ def test_ImageExporter_toBytes():
     data = fn.ndarray_from_qimage(qimg)
     black = (0, 0, 0, 255)
     assert np.all(data == black), "Exported image should be entirely black."
+
+
+def _neighborDiff(a, b):
+    ## for each pixel of *a*, the smallest color difference to the pixels of *b*
+    ## in the surrounding 3x3 neighborhood
+    a = a.astype(int)
+    h, w = a.shape[:2]
+    b = np.pad(b.astype(int), ((1, 1), (1, 1), (0, 0)), mode='edge')
+    diff = np.full((h, w), 255)
+    for dy in range(3):
+        for dx in range(3):
+            diff = np.minimum(diff, np.abs(a - b[dy:dy+h, dx:dx+w]).max(axis=2))
+    return diff
+
+
+@pytest.mark.parametrize('antialias', [False, True])
+@pytest.mark.parametrize('ext', ['png', 'tif', 'npy'])
+def test_ImageExporter_tiled(tmp_path, ext, antialias):
+    p = pg.PlotWidget()
+    p.resize(300, 200)
+    p.show()
+    p.plot(np.sin(np.linspace(0, 10, 200)), pen='y', symbol='o', symbolSize=4)
+    ## many steep lines crossing tile borders
+    p.plot(np.random.default_rng(0).normal(size=500), pen='c')
+    exp = ImageExporter(p.getPlotItem())
+    exp.parameters()['width'] = 1037
+    exp.parameters()['antialias'] = antialias
+    refImg = exp.export(toBytes=True).convertToFormat(QtGui.QImage.Format.Format_RGBA8888)
+    expected = fn.ndarray_from_qimage(refImg)
+
+    ## tiles that do not divide the image size evenly
+    exp.parameters()['tileSize'] = 128
+    fileName = str(tmp_path / ('tiled.' + ext))
+    assert exp.export(fileName=fileName)
+    if ext == 'npy':
+        data = np.load(fileName)
+    else:
+        qimg = QtGui.QImage(fileName)
+        assert not qimg.isNull()
+        qimg = qimg.convertToFormat(QtGui.QImage.Format.Format_RGBA8888)
+        data = fn.ndarray_from_qimage(qimg)
+    assert data.shape == expected.shape
+
+    ## lines clipped at tile borders are rasterized slightly differently
+    ## (see ImageExporter.renderBands)
+    if antialias:
+        assert np.abs(data.astype(int) - expected).max() <= 8
+    else:
+        assert np.any(data != expected, axis=2).mean() < 1e-3
+        assert _neighborDiff(data, expected).max() == 0
+        assert _neighborDiff(expected, data).max() == 0
+
+
+def test_ImageExporter_tiled_format():
+    p = pg.PlotWidget()
+    p.show()
+    exp = ImageExporter(p.getPlotItem())
+    exp.parameters()['tileSize'] = 128
+    with pytest.raises(ValueError):
+        exp.export(fileName='image.jpg')
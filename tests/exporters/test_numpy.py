@@ -0,0 +1,57 @@
+import json
+
+import numpy as np
+from numpy.testing import assert_equal
+
+import pyqtgraph as pg
+from pyqtgraph.exporters import NumpyExporter
+
+app = pg.mkQApp()
+
+
+def makePlot():
+    plt = pg.PlotWidget()
+    x1 = np.arange(10, dtype=np.float32)
+    y1 = np.arange(10, dtype=np.int16) ** 2
+    y2 = np.linspace(0, 1, 25)
+    plt.plotItem.addItem(pg.PlotDataItem(x=x1, y=y1, name='a/b'), params={'trial': 3})
+    plt.plot(y=y2)
+    plt.plot(y=y2, name='a/b')
+    return plt, x1, y1, y2
+
+
+def test_NumpyExporter_npz(tmp_path):
+    plt, x1, y1, y2 = makePlot()
+    ex = NumpyExporter(plt.plotItem)
+    fileName = tmp_path / 'data.npz'
+    ex.export(fileName=str(fileName))
+
+    with np.load(fileName, allow_pickle=False) as npz:
+        assert sorted(npz.files) == ['a_b__x', 'a_b__y', 'a_b_x', 'a_b_y', 'curve0001_x', 'curve0001_y', 'metadata']
+        assert npz['a_b_x'].dtype == np.float32
+        assert npz['a_b_y'].dtype == np.int16
+        assert_equal(npz['a_b_x'], x1)
+        assert_equal(npz['a_b_y'], y1)
+        assert_equal(npz['curve0001_y'], y2)
+        assert_equal(npz['a_b__y'], y2)
+        meta = json.loads(str(npz['metadata']))
+
+    curves = meta['curves']
+    assert [c['key'] for c in curves] == ['a_b', 'curve0001', 'a_b_']
+    assert [c['name'] for c in curves] == ['a/b', None, 'a/b']
+    assert curves[0]['meta'] == {'trial': 3}
+    assert curves[0]['y'] == {'dtype': np.dtype(np.int16).str, 'shape': [10]}
+
+
+def test_NumpyExporter_npy(tmp_path):
+    plt, x1, y1, y2 = makePlot()
+    ex = NumpyExporter(plt.plotItem)
+    ex.parameters()['format'] = 'npy'
+    dirName = tmp_path / 'data'
+    ex.export(fileName=str(dirName))
+
+    assert_equal(np.load(dirName / 'a_b_y.npy', mmap_mode='r'), y1)
+    assert_equal(np.load(dirName / 'curve0001_x.npy'), np.arange(25))
+    with open(dirName / 'metadata.json') as fh:
+        meta = json.load(fh)
+    assert len(meta['curves']) == 3
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+import pyqtgraph as pg
+from pyqtgraph.exporters import PlotRenderer, renderMany
+from pyqtgraph.Qt import QtGui
+
+app = pg.mkQApp()
+
+
+def curveTemplate(layout):
+    plt = layout.addPlot()
+    plt.hideAxis('left')
+    plt.hideAxis('bottom')
+    curve = plt.plot(pen='r')
+    return curve.setData
+
+
+def redPixels(rgba):
+    return (rgba[..., 0] == 255) & (rgba[..., 1] == 0)
+
+
+def test_PlotRenderer():
+    calls = []
+
+    def template(layout):
+        calls.append(layout)
+        return curveTemplate(layout)
+
+    renderer = PlotRenderer(template, size=(120, 80), background='k')
+    assert len(calls) == 1
+    curve = renderer.layout.getItem(0, 0).listDataItems()[0]
+
+    img1 = renderer.render(np.array([0, 0, 1, 1.]))
+    assert img1.shape == (80, 120, 4)
+    assert np.all(img1[..., 3] == 255)
+    red = redPixels(img1)
+    assert red.any()
+    ## the autoranged step fills the view box, from the bottom left to the top right
+    assert red[60:, :40].any() and red[:20, 80:].any()
+    assert not red[:20, :40].any()
+
+    ## the same items are reused for new data
+    img2 = renderer.render(np.array([1, 1, 0, 0.]))
+    assert renderer.layout.getItem(0, 0).listDataItems() == [curve]
+    assert len(calls) == 1
+    red = redPixels(img2)
+    assert red[:20, :40].any() and not red[60:, :40].any()
+
+    view = renderer.render(copy=False)
+    assert np.all(view == img2)
+
+    png = renderer.renderToBytes()
+    assert png.startswith(b'\x89PNG')
+    qimg = QtGui.QImage.fromData(png)
+    assert (qimg.width(), qimg.height()) == (120, 80)
+
+    renderer.setSize(60, 40)
+    assert renderer.render().shape == (40, 60, 4)
+    with pytest.raises(ValueError):
+        renderer.setSize(0, 40)
+
+
+def test_PlotRenderer_axes():
+    def template(layout):
+        return layout.addPlot().plot(pen='r').setData
+
+    renderer = PlotRenderer(template, size=(200, 150), background='k')
+    img = renderer.render(np.linspace(0, 10, 50))
+    plt = renderer.layout.getItem(0, 0)
+    drawn = img[..., :3].sum(axis=2) > 0
+
+    ## tick labels and axis lines are drawn next to the view box
+    view = plt.vb.sceneBoundingRect()
+    left = plt.getAxis('left').sceneBoundingRect()
+    bottom = plt.getAxis('bottom').sceneBoundingRect()
+    assert left.width() > 10 and bottom.height() > 10
+    labels = drawn[int(view.top()):int(view.bottom()), :int(view.left()) - 2]
+    assert labels.sum() > 50
+    ticks = drawn[int(view.bottom()) + 2:, int(view.left()):int(view.right())]
+    assert ticks.sum() > 50
+    ## the left axis line runs along the whole height of the view box
+    column = drawn[int(view.top()) + 2:int(view.bottom()) - 2, int(round(view.left())) - 1]
+    assert column.all()
+    assert not redPixels(img[:, :int(view.left()) - 1]).any()
+
+
+def test_PlotRenderer_noBinder():
+    renderer = PlotRenderer(size=(20, 10), background=(0, 0, 255))
+    img = renderer.render()
+    assert np.all(img == [0, 0, 255, 255])
+    with pytest.raises(TypeError):
+        renderer.render([1, 2, 3])
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_renderMany(tmp_path, workers):
+    datasets = [np.arange(10) * (i - 1) for i in range(3)]
+    expected = [PlotRenderer(curveTemplate, size=(50, 40), background='k').render(d) for d in datasets]
+
+    images = renderMany(curveTemplate, datasets, size=(50, 40), background='k', workers=workers)
+    assert len(images) == 3
+    for img, exp in zip(images, expected):
+        assert np.all(img == exp)
+
+    fileNames = [tmp_path / ('plot%d.png' % i) for i in range(3)]
+    result = renderMany(curveTemplate, datasets, fileNames, size=(50, 40), background='k', workers=workers)
+    assert result == [str(f) for f in fileNames]
+    for fileName in fileNames:
+        assert QtGui.QImage(str(fileName)).width() == 50
+
+    with pytest.raises(ValueError):
+        renderMany(curveTemplate, datasets, fileNames[:1])
+
+
+def test_renderMany_pool():
+    pool = pg.multiprocess.WorkerPool(workers=2)
+    try:
+        datasets = [np.random.normal(size=20) for i in range(6)]
+        images = renderMany(curveTemplate, datasets, size=(40, 30), pool=pool)
+        images2 = renderMany(curveTemplate, datasets, size=(40, 30), pool=pool)
+        for img, img2 in zip(images, images2):
+            assert img.shape == (30, 40, 4)
+            assert np.all(img == img2)
+    finally:
+        pool.close()
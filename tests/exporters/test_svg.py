@@ -1,3 +1,7 @@
+import xml.dom.minidom
+
+import numpy as np
+
 import pyqtgraph as pg
 
 app = pg.mkQApp()
@@ -68,3 +72,29 @@ def test_simple(tmpdir):
     ex = pg.exporters.SVGExporter(scene)
     tf = tmpdir.join("export.svg")
     ex.export(fileName=tf)
+
+
+def test_decimate(tmpdir):
+    plt = pg.PlotWidget()
+    plt.resize(400, 300)
+    plt.show()
+    x = np.linspace(0, 100, 100000)
+    y = np.sin(x) + np.random.normal(scale=0.1, size=len(x))
+    y[500] = np.nan
+    plt.plot(x, y, connect='finite', fillLevel=0, brush=(0, 0, 255, 50))
+    plt.setXRange(20, 40)
+    app.processEvents()
+
+    ex = pg.exporters.SVGExporter(plt.plotItem)
+    full = ex.export(toBytes=True)
+    ex.parameters()['decimate'] = True
+    ex.parameters()['compact'] = True
+    small = ex.export(toBytes=True)
+    assert len(small) < len(full) / 10
+
+    ## compact output has no indentation, and is still a valid document
+    body = small.decode('utf-8').split('</defs>')[1]
+    assert '\n    ' not in body
+    doc = xml.dom.minidom.parseString(small)
+    assert len(doc.getElementsByTagName('path')) > 0
+    plt.close()
@@ -0,0 +1,282 @@
+import threading
+
+import numpy as np
+import pytest
+
+import pyqtgraph as pg
+from pyqtgraph.flowchart import Flowchart, Node
+
+pg.mkQApp()
+
+
+class CountingNode(Node):
+    nodeName = 'CountingNode'
+    threadSafe = True
+
+    def __init__(self, name, barrier=None):
+        Node.__init__(self, name, terminals={
+            'In': {'io': 'in'},
+            'Out': {'io': 'out'},
+        })
+        self.offset = 1
+        self.calls = 0
+        self.threads = set()
+        self.barrier = barrier
+
+    def process(self, In, display=True):
+        self.calls += 1
+        self.threads.add(threading.get_ident())
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        return {'Out': In + self.offset}
+
+
+def makeChart(nBranches, barrier=None):
+    ## Input -> n parallel CountingNodes -> one output terminal each
+    fc = Flowchart(terminals={'dataIn': {'io': 'in'}})
+    nodes = []
+    for i in range(nBranches):
+        node = CountingNode('branch%d' % i, barrier=barrier)
+        fc.addNode(node, node.name())
+        fc.addTerminal('out%d' % i, io='out')
+        fc.connectTerminals(fc['dataIn'], node['In'])
+        fc.connectTerminals(node['Out'], fc['out%d' % i])
+        nodes.append(node)
+    return fc, nodes
+
+
+def test_process_serial():
+    fc, nodes = makeChart(3)
+    data = np.arange(5)
+    out = fc.process(dataIn=data)
+    for i in range(3):
+        assert np.all(out['out%d' % i] == data + 1)
+    fc.process(dataIn=data)
+    assert [n.calls for n in nodes] == [2, 2, 2]
+
+
+def test_process_cache():
+    fc, nodes = makeChart(2)
+    fc.setProcessOptions(cache=True)
+    data = np.arange(5)
+    out1 = fc.process(dataIn=data)
+    out2 = fc.process(dataIn=data)
+    assert [n.calls for n in nodes] == [1, 1]
+    assert out2['out0'] is out1['out0']
+
+    ## updating a node invalidates only its own result
+    nodes[0].offset = 2
+    nodes[0].update()
+    calls = [n.calls for n in nodes]
+    out3 = fc.process(dataIn=data)
+    assert nodes[0].calls == calls[0] + 1
+    assert nodes[1].calls == calls[1]
+    assert np.all(out3['out0'] == data + 2)
+
+    ## new input objects are processed again
+    fc.process(dataIn=data.copy())
+    assert nodes[1].calls == calls[1] + 1
+
+    fc.clearProcessCache()
+    fc.process(dataIn=data)
+    assert nodes[1].calls == calls[1] + 2
+
+
+def test_process_cache_chain():
+    fc = Flowchart(terminals={'a': {'io': 'in'}, 'b': {'io': 'in'}, 'outA': {'io': 'out'}, 'outB': {'io': 'out'}})
+    a1, a2, b1 = CountingNode('a1'), CountingNode('a2'), CountingNode('b1')
+    for node in (a1, a2, b1):
+        fc.addNode(node, node.name())
+    fc.connectTerminals(fc['a'], a1['In'])
+    fc.connectTerminals(a1['Out'], a2['In'])
+    fc.connectTerminals(a2['Out'], fc['outA'])
+    fc.connectTerminals(fc['b'], b1['In'])
+    fc.connectTerminals(b1['Out'], fc['outB'])
+    fc.setProcessOptions(cache=True)
+
+    a = np.zeros(3)
+    out = fc.process(a=a, b=np.ones(3))
+    assert np.all(out['outA'] == 2) and np.all(out['outB'] == 2)
+    out = fc.process(a=a, b=np.ones(3))
+    assert (a1.calls, a2.calls, b1.calls) == (1, 1, 2)
+
+
+@pytest.mark.parametrize('cache', [False, True])
+def test_process_concurrent(cache):
+    nBranches = 3
+    barrier = threading.Barrier(nBranches)
+    fc, nodes = makeChart(nBranches, barrier=barrier)
+    fc.setProcessOptions(cache=cache, workers=nBranches)
+    data = np.arange(5)
+    ## the barrier only releases if all branches are processed at the same time
+    out = fc.process(dataIn=data)
+    for i in range(nBranches):
+        assert np.all(out['out%d' % i] == data + 1)
+    assert len(set.union(*[n.threads for n in nodes])) == nBranches
+
+    out = fc.process(dataIn=data)
+    assert [n.calls for n in nodes] == [1 if cache else 2] * nBranches
+
+
+def test_process_concurrent_error():
+    fc, nodes = makeChart(2)
+    fc.setProcessOptions(workers=2)
+    with pytest.raises(TypeError):
+        fc.process(dataIn='text')
+
+
+def test_process_concurrent_library_nodes():
+    ## nodes that read their control widgets or modify their input are
+    ## processed in the calling thread, giving the same result as serial processing
+    fc = Flowchart(terminals={'dataIn': {'io': 'in'}})
+    nodes = []
+    for i, nodeType in enumerate(['MeanFilter', 'IntegralFilter', 'DerivativeFilter', 'Abs']):
+        node = fc.createNode(nodeType)
+        fc.addTerminal('out%d' % i, io='out')
+        fc.connectTerminals(fc['dataIn'], node['In'])
+        fc.connectTerminals(node['Out'], fc['out%d' % i])
+        nodes.append(node)
+    nodes[0].ctrls['n'].setValue(3)
+
+    threads = {}
+    for node in nodes[:3]:
+        def processData(data, node=node, processData=node.processData):
+            threads[node.name()] = threading.get_ident()
+            return processData(data)
+        node.processData = processData
+
+    data = np.random.normal(size=100)
+    expected = fc.process(dataIn=data.copy())
+    fc.setProcessOptions(workers=4)
+    for i in range(5):
+        out = fc.process(dataIn=data.copy())
+        for k in expected:
+            np.testing.assert_array_equal(out[k], expected[k])
+    assert set(threads.values()) == {threading.get_ident()}
+
+
+def makeChain(nodeTypes):
+    ## Input -> node1 -> node2 -> ... -> Output
+    fc = Flowchart(terminals={'dataIn': {'io': 'in'}, 'dataOut': {'io': 'out'}})
+    nodes = [fc.createNode(t) for t in nodeTypes]
+    terms = [fc['dataIn']] + [t for n in nodes for t in (n['In'], n['Out'])] + [fc['dataOut']]
+    for i in range(0, len(terms), 2):
+        fc.connectTerminals(terms[i], terms[i+1])
+    return fc, nodes
+
+
+def streamChunks(fc, data, sizes):
+    chunks = []
+    start = 0
+    for size in sizes:
+        chunks.append({'dataIn': data[start:start+size]})
+        start += size
+    chunks.append({'dataIn': data[start:]})
+    return np.concatenate([out['dataOut'] for out in fc.processStream(chunks)])
+
+
+def test_processChunk():
+    pytest.importorskip('scipy')
+    fc, (ds, bessel, mean, deriv) = makeChain(['Downsample', 'BesselFilter', 'MeanFilter', 'DerivativeFilter'])
+    ds.ctrls['n'].setValue(3)
+    bessel.ctrls['bidir'].setChecked(False)
+    bessel.ctrls['cutoff'].setValue(0.05)
+    mean.ctrls['n'].setValue(5)
+
+    data = np.random.normal(size=1000)
+    whole = streamChunks(fc, data, [])
+    assert len(whole) == 1000 // 3 - 4 - 1
+
+    ## uneven chunks, including chunks smaller than the filter windows
+    chunked = streamChunks(fc, data, [100, 1, 2, 7, 250, 0, 13])
+    assert np.allclose(chunked, whole)
+
+    ## the stream starts over after a reset
+    assert np.allclose(streamChunks(fc, data, [500]), whole)
+
+
+def test_processChunk_mean():
+    fc, (mean,) = makeChain(['MeanFilter'])
+    mean.ctrls['n'].setValue(5)
+    data = np.random.normal(size=100)
+    expected = np.convolve(data, np.ones(5) / 5, mode='valid')
+    assert np.allclose(fc.process(dataIn=data)['dataOut'], expected)
+    assert np.allclose(streamChunks(fc, data, [3, 1, 20]), expected)
+
+
+def test_processChunk_median():
+    ndimage = pytest.importorskip('scipy.ndimage')
+    fc, (med, sub) = makeChain(['MedianFilter', 'Subsample'])
+    n = 7
+    med.ctrls['n'].setValue(n)
+    sub.ctrls['n'].setValue(2)
+    data = np.random.normal(size=300)
+    expected = ndimage.median_filter(data, n)
+    ## the output delayed by the window is emitted with the last chunk
+    assert np.allclose(streamChunks(fc, data, [10, 3, 50, 1]), expected[::2])
+    assert np.allclose(streamChunks(fc, data, [0, 100, 200]), expected[::2])
+
+    ## until then, output is delayed by n-1-n//2 samples
+    fc.resetChunks()
+    out = [fc.processChunk(dataIn=data[i:i+30])['dataOut'] for i in range(0, len(data), 30)]
+    assert np.allclose(np.concatenate(out), expected[:len(data) - (n - 1 - n//2)][::2])
+    out.append(fc.processLastChunk(dataIn=data[:0])['dataOut'])
+    assert np.allclose(np.concatenate(out), expected[::2])
+
+
+def test_processChunk_unsupported():
+    pytest.importorskip('scipy')
+    fc, (detrend,) = makeChain(['DetrendFilter'])
+    with pytest.raises(Exception, match='chunked'):
+        fc.processChunk(dataIn=np.zeros(10))
+
+    ## bypassed nodes pass chunks through
+    detrend.bypass(True)
+    assert np.all(fc.processChunk(dataIn=np.ones(10))['dataOut'] == 1)
+
+    fc, (bessel,) = makeChain(['BesselFilter'])
+    with pytest.raises(Exception, match='bidirectional'):
+        fc.processChunk(dataIn=np.zeros(10))
+
+
+def test_profileReport():
+    fc, nodes = makeChart(2)
+    nodes[1].process = lambda In, display=True: {'Out': np.zeros(100)}
+    fc.setProfiling(True, badge=True)
+    data = np.arange(5)
+    fc.process(dataIn=data)
+    fc.process(dataIn=data)
+
+    report = fc.profileReport()
+    assert sorted(r['name'] for r in report) == ['branch0', 'branch1']
+    for r in report:
+        assert r['calls'] == 2
+        assert r['totalTime'] >= r['maxTime'] >= r['meanTime'] > 0
+    assert np.isclose(sum(r['timeFraction'] for r in report), 1)
+    stats = dict((r['name'], r) for r in report)
+    assert stats['branch0']['outputBytes'] == data.nbytes
+    assert stats['branch1']['outputBytes'] == 800
+
+    item = nodes[0].graphicsItem()
+    assert item.profileItem is not None and '×2' in item.profileItem.text()
+
+    ## cached results and updates are recorded too
+    fc.setProcessOptions(cache=True)
+    fc.process(dataIn=data)
+    fc.process(dataIn=data)
+    assert nodes[0].profileStats()['cacheHits'] == 1
+    nodes[0].setInput(In=data)
+    assert nodes[0].profileStats()['calls'] == 4
+
+    ## nodes added later are profiled as well
+    node = CountingNode('late')
+    fc.addNode(node, 'late')
+    assert node.isProfiling()
+    fc.removeNode(node)
+
+    fc.resetProfile()
+    assert all(r['calls'] == 0 for r in fc.profileReport())
+    fc.setProfiling(False)
+    assert item.profileItem is None
+    fc.process(dataIn=data.copy())
+    assert nodes[0].profileStats()['calls'] == 0
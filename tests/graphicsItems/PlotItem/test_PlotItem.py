@@ -141,3 +141,47 @@ def test_plotitem_menu_initialize():
     assert viewbox is not None
     assert viewbox.menu is None
     assert viewbox.menuEnabled() is False
+
+
+def _average_curve(item):
+    assert len(item.avgCurves) == 1
+    return next(iter(item.avgCurves.values())).plot
+
+
+def test_PlotItem_average_mean():
+    item = pg.PlotItem()
+    item.ctrl.averageGroup.setChecked(True)
+    data = rng.normal(size=(5, 20))
+    data[2, 3] = np.nan
+    for y in data:
+        item.plot(y)
+    avg = _average_curve(item)
+    np.testing.assert_allclose(avg.yData, np.nanmean(data, axis=0))
+
+    # the average buffer is updated in place rather than reallocated
+    buf = avg.yData
+    item.plot(data[0])
+    assert np.shares_memory(avg.yData, buf)
+
+
+def test_PlotItem_average_window_and_ema():
+    item = pg.PlotItem()
+    item.ctrl.averageGroup.setChecked(True)
+    data = rng.normal(size=(6, 20))
+    for y in data:
+        item.plot(y)
+
+    item.setAverageMode('window', window=3)
+    np.testing.assert_allclose(_average_curve(item).yData, data[-3:].mean(axis=0))
+
+    item.setAverageMode('ema', alpha=0.5)
+    expected = data[0]
+    for y in data[1:]:
+        expected = expected + 0.5 * (y - expected)
+    np.testing.assert_allclose(_average_curve(item).yData, expected)
+
+    assert item.averageMode() == {'mode': 'ema', 'window': None, 'alpha': 0.5}
+    with pytest.raises(ValueError):
+        item.setAverageMode('window')
+    with pytest.raises(ValueError):
+        item.setAverageMode('median')
@@ -0,0 +1,35 @@
+import numpy as np
+
+import pyqtgraph as pg
+
+app = pg.mkQApp()
+
+
+def test_ContourItem_cache():
+    x, y = np.mgrid[-1:1:30j, -1:1:20j]
+    data = np.sin(4 * x) * np.cos(3 * y)
+    item = pg.ContourItem(data, levels=[-0.5, 0.0], axisOrder='col-major')
+    paths = {lv: item.path(lv) for lv in item.levels()}
+
+    iso = pg.IsocurveItem(data, level=0.5, axisOrder='col-major')
+    iso.generatePath()
+
+    # existing levels are reused, new levels are generated
+    item.setLevels([0.0, 0.5])
+    assert item.levels() == [0.0, 0.5]
+    assert item.path(0.0) is paths[0.0]
+    assert item.path(0.5).boundingRect() == iso.path.boundingRect()
+    assert -0.5 not in item._paths
+
+    # new data discards the cache
+    item.setData(-data)
+    assert item.path(0.0) is not paths[0.0]
+
+    assert item.boundingRect().contains(item.path(0.5).boundingRect())
+
+    item.setLevelPen(0.5, 'r')
+    view = pg.GraphicsView()
+    view.addItem(item)
+    view.show()
+    app.processEvents()
+    view.close()
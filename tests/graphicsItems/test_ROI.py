@@ -469,3 +469,59 @@ def test_LineROI_coords(p1, p2):
         got = lineroi.mapSceneToParent(scenepos)
         assert math.isclose(got.x(), expected[0])
         assert math.isclose(got.y(), expected[1])
+
+
+@pytest.mark.parametrize("axisOrder", ['col-major', 'row-major'])
+def test_roiStatistics(axisOrder):
+    rng = np.random.default_rng(0)
+    frames = rng.random((3, 40, 30))
+    view = pg.ViewBox()
+    img = pg.ImageItem(frames[0], axisOrder=axisOrder)
+    view.addItem(img)
+    rects = [((2, 3), (5, 4)), ((10, 0), (8, 12)), ((4, 2), (20, 6)), ((50, 50), (3, 3))]
+    rois = [pg.RectROI(pos, size) for pos, size in rects]
+    ellipse = pg.EllipseROI((5, 5), (10, 10))
+    for roi in rois + [ellipse]:
+        view.addItem(roi)
+
+    def region(data, pos, size):
+        (x, y), (w, h) = pos, size
+        if axisOrder == 'row-major':
+            return data[..., y:y+h, x:x+w]
+        return data[..., x:x+w, y:y+h]
+
+    axes = (1, 2)
+    stats = pg.ROIStatistics(rois + [ellipse], img=img, axes=axes)
+    result = stats.compute(frames, ('mean', 'sum', 'min', 'max', 'std', 'count'))
+    for i, (pos, size) in enumerate(rects[:3]):
+        sub = region(frames, pos, size)
+        np.testing.assert_allclose(result['mean'][i], sub.mean(axis=axes))
+        np.testing.assert_allclose(result['sum'][i], sub.sum(axis=axes))
+        np.testing.assert_allclose(result['min'][i], sub.min(axis=axes))
+        np.testing.assert_allclose(result['max'][i], sub.max(axis=axes))
+        np.testing.assert_allclose(result['std'][i], sub.std(axis=axes))
+        assert result['count'][i] == size[0] * size[1]
+
+    # ROI outside of the data
+    assert result['count'][3] == 0
+    assert np.isnan(result['mean'][3]).all()
+    assert (result['sum'][3] == 0).all()
+
+    # pixel centers inside the ellipse
+    assert abs(result['count'][4] - math.pi * 25) < 10
+
+    # single frames match the one-shot function
+    single = pg.roiStatistics(frames[1], rois, img=img, stats=('mean',))
+    np.testing.assert_allclose(single['mean'], result['mean'][:4, 1])
+
+    # only changed ROIs are recomputed
+    before = [stats.indexes(frames, roi) for roi in rois]
+    rois[1].setPos((12, 1))
+    after = [stats.indexes(frames, roi) for roi in rois]
+    assert after[0] is before[0]
+    assert after[1] is not before[1]
+    result = stats.compute(frames, ('mean',))
+    np.testing.assert_allclose(result['mean'][1], region(frames, (12, 1), (8, 12)).mean(axis=axes))
+
+    with pytest.raises(ValueError):
+        stats.compute(frames, ('median',))
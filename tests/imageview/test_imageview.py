@@ -45,3 +45,101 @@ def test_init_with_mode_and_imageitem():
     imgitem = pg.ImageItem(data)
     pg.ImageView(imageItem=imgitem, levelMode="rgba")
     assert(pg.image is not None)
+
+
+def _roiPlotData(iv):
+    if len(iv.roiCurves) == 0:
+        return np.array([]), np.array([])
+    return iv.roiCurves[0].getData()
+
+
+def test_roi_timecourse_threaded(qtbot):
+    rng = np.random.default_rng(0)
+    frames = rng.random((40, 30, 20))
+    iv = pg.ImageView()
+    iv.setRoiTimeCourseOptions(chunkSize=7)
+    iv.setImage(frames)
+    iv.ui.roiBtn.setChecked(True)
+    iv.roiClicked()
+    iv.roi.setPos((3, 4))
+    iv.roi.setSize((6, 5))
+
+    expected = frames[:, 3:9, 4:9].mean(axis=(1, 2))
+    def complete():
+        x, y = _roiPlotData(iv)
+        return len(x) == len(frames) and np.allclose(y, expected)
+    qtbot.waitUntil(complete, timeout=5000)
+
+    # matches the synchronous computation
+    iv.setRoiTimeCourseOptions(threaded=False)
+    x, y = _roiPlotData(iv)
+    np.testing.assert_allclose(y, expected)
+    iv.close()
+
+
+def test_roi_timecourse_drag_stride(qtbot):
+    frames = np.arange(50, dtype=float)[:, np.newaxis, np.newaxis] * np.ones((50, 12, 12))
+    iv = pg.ImageView()
+    iv.setRoiTimeCourseOptions(chunkSize=100, dragStride=5)
+    iv.setImage(frames)
+    iv.ui.roiBtn.setChecked(True)
+    iv.roiClicked()
+    iv.roi.setSize((5, 5))
+
+    # only every 5th frame is computed while the ROI is changing
+    iv.roi.setPos((1, 1), finish=False)
+    qtbot.waitUntil(lambda: len(_roiPlotData(iv)[0]) == 10, timeout=5000)
+    np.testing.assert_array_equal(_roiPlotData(iv)[1], np.arange(0, 50, 5))
+
+    # stale requests are superseded; finishing computes all frames
+    iv.roi.setPos((2, 2), finish=False)
+    iv.roi.setPos((2, 3))
+    qtbot.waitUntil(lambda: len(_roiPlotData(iv)[0]) == 50, timeout=5000)
+    np.testing.assert_array_equal(_roiPlotData(iv)[1], np.arange(50))
+
+    # changes that do not come from the ROI compute all frames
+    iv.setRoiTimeCourseOptions(dragStride=4)
+    qtbot.waitUntil(lambda: len(_roiPlotData(iv)[0]) == 50, timeout=5000)
+    iv.setImage(frames * 2)
+    qtbot.waitUntil(lambda: np.array_equal(_roiPlotData(iv)[1], np.arange(0, 100, 2)), timeout=5000)
+
+    # closing stops the worker thread
+    thread = iv._roiWorker._thread
+    iv.close()
+    assert iv._roiWorker is None
+    assert not thread.is_alive()
+
+
+def test_roi_timecourse_concurrent_regions(qtbot, monkeypatch):
+    ## the worker and the GUI thread slice arrays at the same time, with more
+    ## distinct ROI shapes than fit in the affineSlice cache
+    errors = []
+    monkeypatch.setattr(pg.debug, 'printExc', lambda *args, **kwds: errors.append(args))
+    rng = np.random.default_rng(1)
+    frames = rng.random((200, 40, 40))
+    iv = pg.ImageView()
+    iv.setRoiTimeCourseOptions(chunkSize=5)
+    iv.setImage(frames)
+    iv.ui.roiBtn.setChecked(True)
+    iv.roiClicked()
+    iv.roi.setAngle(30)
+
+    other = pg.ROI((10, 10), (2, 2), angle=15)
+    iv.addItem(other)
+    nShapes = 3 * pg.functions._affineGridCacheSize
+    for i in range(nShapes):
+        iv.roi.setSize((4 + i, 3 + i % 5))
+        for j in range(nShapes):
+            other.setSize((2 + j, 5 + j % 3))
+            region = other.getArrayRegion(frames[:2], iv.imageItem, axes=(1, 2))
+            assert region.shape[0] == 2
+    iv.roi.setSize((6, 5))
+    iv.roi.setAngle(0)
+
+    expected = iv.roi.getArrayRegion(frames, iv.imageItem, axes=(1, 2)).mean(axis=(1, 2))
+    def complete():
+        x, y = _roiPlotData(iv)
+        return len(x) == len(frames) and np.allclose(y, expected)
+    qtbot.waitUntil(complete, timeout=10000)
+    assert errors == []
+    iv.close()
@@ -0,0 +1,75 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+jupyter_rfb = pytest.importorskip('jupyter_rfb')
+
+import pyqtgraph as pg
+from pyqtgraph.jupyter import PlotWidget
+
+pg.mkQApp()
+
+
+def pointerEvent(eventType, x=10, y=10, buttons=(1,)):
+    return {'event_type': eventType, 'x': x, 'y': y, 'button': 1, 'buttons': list(buttons), 'modifiers': []}
+
+
+def test_request_draw_coalesced(monkeypatch):
+    calls = []
+    monkeypatch.setattr(jupyter_rfb.RemoteFrameBuffer, 'request_draw', lambda self: calls.append(self))
+    w = PlotWidget()
+
+    ## without a running event loop, requests are passed on directly
+    calls.clear()
+    w.request_draw()
+    assert len(calls) == 1
+
+    ## requests made while handling one event are passed on once
+    async def run():
+        calls.clear()
+        w.request_draw()
+        w.plot(np.arange(10))
+        w.setXRange(0, 5)
+        w.request_draw()
+        assert calls == []
+        await asyncio.sleep(0)
+        assert len(calls) == 1
+        w.request_draw()
+        await asyncio.sleep(0)
+        assert len(calls) == 2
+    asyncio.run(run())
+
+
+def test_identical_frames_skipped():
+    w = PlotWidget(css_width='200px', css_height='100px')
+    w.plot(np.sin(np.linspace(0, 10, 100)))
+    frame = w.get_frame()
+    assert frame is not None and frame.shape == (100, 200, 4)
+    frame = frame.copy()
+    assert w.get_frame() is None
+
+    w.setXRange(0, 50)
+    frame2 = w.get_frame()
+    assert frame2 is not None and not np.array_equal(frame2, frame)
+    assert w.get_frame() is None
+
+
+def test_interaction_quality():
+    w = PlotWidget(css_width='200px', css_height='100px', interaction_quality=30, idle_delay=0.01)
+    w.quality = 80
+
+    ## without a running event loop, frames stay at full quality
+    w.handle_event(pointerEvent('pointer_down'))
+    w.handle_event(pointerEvent('pointer_up', buttons=()))
+    assert w.quality == 80
+    assert w.get_frame().shape == (100, 200, 4)
+
+    async def run():
+        w.handle_event(pointerEvent('pointer_down'))
+        assert w.quality == 30
+        assert w.get_frame().shape == (50, 100, 4)
+        await asyncio.sleep(0.1)
+        assert w.quality == 80
+        assert w.get_frame().shape == (100, 200, 4)
+    asyncio.run(run())
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+import pyqtgraph.multiprocess as mp
+from pyqtgraph.multiprocess.remoteproxy import RemoteExceptionWarning
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason="requires os.fork")
+
+
+def square(x):
+    return x * x
+
+
+def fail_on_three(x):
+    if x == 3:
+        raise ValueError("task failed")
+    return x
+
+
+def test_parallelize_chunks():
+    tasks = list(range(23))
+    results = [None] * len(tasks)
+    with mp.Parallelize(enumerate(tasks), workers=3, chunkSize=2, results=results) as tasker:
+        for i, x in tasker:
+            tasker.results[i] = square(x)
+    assert results == [square(x) for x in tasks]
+
+
+def test_worker_pool(capsys):
+    with mp.WorkerPool(workers=2) as pool:
+        assert pool.numWorkers() == 2
+        pids = [proc.childPid for proc in pool.workers]
+        for n in (10, 3, 0):
+            assert pool.map(square, range(n), chunkSize=2) == [square(x) for x in range(n)]
+        # the same workers are reused for every map() call
+        assert [proc.childPid for proc in pool.workers] == pids
+
+        report = pool.utilization()
+        assert sorted(report) == sorted(pids)
+        assert sum(stats['tasks'] for stats in report.values()) == 13
+
+        # capsys gives the forked workers a writable sys.stdout for their error report
+        with capsys.disabled(), pytest.raises(ValueError), pytest.warns(RemoteExceptionWarning):
+            pool.map(fail_on_three, range(6), chunkSize=1)
+        assert pool.map(square, [4]) == [16]
+    assert pool.numWorkers() == 0
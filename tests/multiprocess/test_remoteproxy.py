@@ -0,0 +1,75 @@
+import asyncio
+import os
+
+import pytest
+
+import pyqtgraph.multiprocess as mp
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason="requires os.fork")
+
+
+@pytest.fixture
+def proc():
+    proc = mp.ForkedProcess()
+    yield proc
+    proc.join()
+
+
+def test_batch_and_gather(proc):
+    rops = proc._import('operator')
+    rops._setProxyOptions(deferGetattr=True)
+    rlist = proc.transfer([])
+    rlist._setProxyOptions(deferGetattr=True)
+
+    with proc.batch():
+        requests = [rops.add(i, 1, _callSync='async', _returnType='value') for i in range(50)]
+        for i in range(5):
+            rlist.append(i, _callSync='off')
+        # nothing has been sent yet
+        assert not requests[0].hasResult()
+
+    assert proc.gather(requests) == list(range(1, 51))
+    assert rlist._getValue() == list(range(5))
+
+
+def test_gather_raises_remote_error(proc):
+    rops = proc._import('operator')
+    rops._setProxyOptions(deferGetattr=True)
+    with proc.batch():
+        requests = [
+            rops.add(1, 1, _callSync='async'),
+            rops.missingFunction(_callSync='async'),
+        ]
+    with pytest.raises(AttributeError):
+        proc.gather(requests)
+
+
+def test_batched_request_result_flushes(proc):
+    rops = proc._import('operator')
+    with proc.batch():
+        req = rops.mul(6, 7, _callSync='async', _returnType='value')
+        assert req.result() == 42
+
+
+@pytest.mark.parametrize('attach', [True, False])
+def test_await_request(proc, attach):
+    rops = proc._import('operator')
+    rops._setProxyOptions(deferGetattr=True)
+
+    async def run():
+        if attach:
+            proc.attachEventLoop()
+        try:
+            single = await rops.add(1, 2, _callSync='async', _returnType='value')
+            many = await asyncio.gather(
+                *[rops.mul(i, 2, _callSync='async', _returnType='value') for i in range(10)]
+            )
+            with pytest.raises(AttributeError):
+                await rops.missingFunction(_callSync='async')
+        finally:
+            proc.detachEventLoop()
+        return single, many
+
+    single, many = asyncio.run(run())
+    assert single == 3
+    assert many == [i * 2 for i in range(10)]
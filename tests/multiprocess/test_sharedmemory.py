@@ -0,0 +1,81 @@
+import gc
+import os
+import subprocess
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+import pyqtgraph as pg
+import pyqtgraph.multiprocess as mp
+from pyqtgraph.multiprocess.sharedmemory import SharedMemoryPool, attachSharedArray
+
+
+def test_pool_reuses_released_blocks():
+    pool = SharedMemoryPool()
+    data = np.arange(10000, dtype=np.float32).reshape(100, 100)
+    released = []
+    try:
+        name, dtype, shape = pool.put(data)
+        arr = attachSharedArray(name, dtype, shape, released.append)
+        np.testing.assert_array_equal(arr, data)
+
+        view = arr[10:20]
+        del arr
+        gc.collect()
+        assert released == [], "block released while a view still exists"
+        del view
+        gc.collect()
+        assert len(released) == 1
+        released[0].close()
+
+        pool.release(name)
+        assert name not in pool.inUse
+        assert pool.put(data * 2)[0] == name, "released block was not reused"
+    finally:
+        pool.close()
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="requires os.fork")
+def test_forked_process_shared_memory():
+    proc = mp.ForkedProcess()
+    try:
+        proc.setProxyOptions(sharedMemThreshold=1024)
+        rnp = proc._import('numpy')
+        data = np.random.normal(size=10000)
+        assert rnp.sum(data, _returnType='value') == pytest.approx(data.sum())
+        assert len(proc.sharedMemPool.inUse) + len(proc.sharedMemPool.free) == 1
+
+        small = np.arange(10)
+        assert rnp.sum(small, _returnType='value') == small.sum()
+        assert len(proc.sharedMemPool.inUse) + len(proc.sharedMemPool.free) == 1
+    finally:
+        proc.join()
+
+
+def test_remote_exit_keeps_blocks():
+    ## a process that attached to a block must not unlink it when it exits
+    pool = SharedMemoryPool()
+    data = np.arange(10000, dtype=np.float64)
+    try:
+        name, dtype, shape = pool.put(data)
+        code = (
+            "import gc, numpy as np\n"
+            "from pyqtgraph.multiprocess.sharedmemory import attachSharedArray\n"
+            "released = []\n"
+            "arr = attachSharedArray(%r, %r, %r, released.append)\n"
+            "assert arr.sum() == %r\n"
+            "del arr\n"
+            "gc.collect()\n"
+            "released[0].close()\n"
+        ) % (name, dtype.str, shape, float(data.sum()))
+        path = os.path.dirname(os.path.dirname(os.path.abspath(pg.__file__)))
+        env = dict(os.environ, PYTHONPATH=path)
+        subprocess.run([sys.executable, '-c', code], env=env, check=True)
+        time.sleep(0.5)  ## the remote resource tracker exits after the process
+        shm = shared_memory.SharedMemory(name=name)
+        shm.close()
+    finally:
+        pool.close()
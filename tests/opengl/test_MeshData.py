@@ -0,0 +1,66 @@
+import pytest
+pytest.importorskip('OpenGL')
+
+import numpy as np
+
+from pyqtgraph.opengl import MeshData
+
+
+def test_vertexNormals():
+    md = MeshData.sphere(6, 8)
+    verts, faces = md.vertexes(), md.faces()
+    faceNorms = np.cross(verts[faces[:,1]] - verts[faces[:,0]], verts[faces[:,2]] - verts[faces[:,0]])
+    expected = np.zeros(verts.shape)
+    for i, face in enumerate(faces):
+        expected[face] += faceNorms[i]
+    expected /= np.linalg.norm(expected, axis=1, keepdims=True)
+    assert np.allclose(md.vertexNormals(), expected, atol=1e-6)
+    assert md.vertexNormals(indexed='faces').shape == (len(faces), 3, 3)
+
+    ## vertexes not used by any face get a zero normal
+    md = MeshData(vertexes=np.vstack([verts, [[5, 5, 5]]]), faces=faces)
+    assert np.all(md.vertexNormals()[-1] == 0)
+
+    vertFaces = md.vertexFaces()
+    for i, face in enumerate(faces):
+        for v in face:
+            assert i in vertFaces[v]
+    assert len(vertFaces[-1]) == 0
+
+
+def test_edges():
+    md = MeshData.cylinder(3, 5)
+    expected = set()
+    for face in md.faces():
+        for a, b in [(face[0], face[1]), (face[1], face[2]), (face[2], face[0])]:
+            expected.add((min(a, b), max(a, b)))
+    edges = md.edges()
+    assert edges.dtype == np.uint32
+    assert [tuple(e) for e in edges] == sorted(expected)
+
+
+def test_unindexedVertexes():
+    md = MeshData.sphere(5, 6)
+    indexed = MeshData(vertexes=md.vertexes(indexed='faces'))
+    verts = indexed.vertexes()
+    faces = indexed.faces()
+    assert len(verts) == len(md.vertexes())
+    assert np.array_equal(verts[faces], md.vertexes(indexed='faces'))
+    ## vertexes are numbered in order of first appearance
+    first = np.unique(faces.ravel(), return_index=True)[1]
+    assert np.all(np.diff(first) > 0)
+
+
+def test_primitiveCache():
+    md1 = MeshData.sphere(10, 12, radius=2)
+    md2 = MeshData.sphere(10, 12, radius=2)
+    assert np.array_equal(md1.vertexes(), md2.vertexes())
+    ## each mesh gets its own writable copy of the cached arrays
+    md1.vertexes()[:] = 0
+    assert not np.all(md2.vertexes() == 0)
+    assert not np.all(MeshData.sphere(10, 12, radius=2).vertexes() == 0)
+
+    md3 = MeshData.cylinder(4, 6, radius=[1, 2], length=3)
+    assert np.isclose(md3.vertexes()[:, 2].max(), 3)
+    MeshData.clearPrimitiveCache()
+    assert np.array_equal(MeshData.cylinder(4, 6, radius=[1, 2], length=3).faces(), md3.faces())
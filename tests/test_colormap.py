@@ -92,3 +92,55 @@ def test_round_trip():
     cmap = pg.ColorMap(None, zebra)
     lut = cmap.getLookupTable(nPts=nPts)
     assert np.all(lut == zebra)
+
+
+def test_lookupTable_cache(monkeypatch):
+    cm1 = pg.ColorMap(pos, int_tuples)
+    cm2 = pg.ColorMap(pos, qcols)
+    calls = []
+    makeLookupTable = pg.ColorMap._makeLookupTable
+    monkeypatch.setattr(pg.ColorMap, '_makeLookupTable',
+                        lambda self, *args: calls.append(args) or makeLookupTable(self, *args))
+    lut1 = cm1.getLookupTable(nPts=64)
+    ## color maps with the same stops share their tables, but each caller
+    ## receives its own copy
+    lut2 = cm2.getLookupTable(nPts=64)
+    assert len(calls) == 1
+    assert lut2 is not lut1 and np.array_equal(lut2, lut1)
+    lut2[0] = 0
+    lut2[:, 0] = 7
+    assert np.array_equal(cm1.getLookupTable(nPts=64), lut1)
+    assert lut1.shape == (64, 3)
+    assert np.array_equal(lut1, cm1.map(np.linspace(0, 1, 64))[:, :3])
+
+    assert cm1.getLookupTable(nPts=64, alpha=True).shape == (64, 4)
+    assert cm1.getLookupTable(0.2, 0.8, nPts=64) is not lut1
+    cm1.reverse()
+    assert not np.array_equal(cm1.getLookupTable(nPts=64), lut1)
+    assert len(cm2.getLookupTable(nPts=8, mode=pg.ColorMap.QCOLOR)) == 8
+
+    pg.colormap.setLookupTableCacheSize(0)
+    try:
+        nCalls = len(calls)
+        lut3 = cm2.getLookupTable(nPts=64)
+        assert len(calls) == nCalls + 1
+        assert np.array_equal(lut3, lut1)
+    finally:
+        pg.colormap.setLookupTableCacheSize(64)
+
+
+def test_gradient_lookupTable_copy():
+    grad = pg.GradientEditorItem()
+    grad.loadPreset('thermal')
+    lut = grad.getLookupTable(32, alpha=True)
+    ## the returned table may be modified without affecting later calls
+    lut[:, 3] = 0
+    expected = [grad.getColor(i / 31, toQColor=False) for i in range(32)]
+    assert np.array_equal(grad.getLookupTable(32, alpha=True), np.array(expected, dtype=np.ubyte))
+
+
+def test_preloadMaps():
+    names = pg.colormap.listMaps()
+    assert 'viridis' in names
+    pg.colormap.preloadMaps(['viridis'])
+    assert pg.colormap.get('viridis') is pg.colormap.get('viridis')
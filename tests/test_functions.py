@@ -1,3 +1,5 @@
+import threading
+import time
 from collections import OrderedDict
 from copy import deepcopy
 
@@ -548,4 +550,179 @@ def test_signal_block_unconnected():
 ])
 def test_siFormat(x, precision, suffix, power, expected):
     result = pg.siFormat(x, precision=precision, suffix=suffix, power=power)
-    assert result == expected
\ No newline at end of file
+    assert result == expected
+
+@pytest.mark.parametrize("chunkSize", [1, 4, 100])
+def test_isosurface_chunked(chunkSize):
+    x, y, z = np.mgrid[-1:1:15j, -1:1:12j, -1:1:10j]
+    data = np.sin(4 * x) * np.cos(3 * y) + z ** 2
+    verts, faces = pg.isosurface(data, 0.3)
+    cverts, cfaces = pg.isosurface(data, 0.3, chunkSize=chunkSize, workers=2)
+    assert cverts.shape == verts.shape
+    assert cfaces.shape == faces.shape
+    assert cfaces.dtype == faces.dtype
+
+    # match each chunked vertex to its counterpart from the single-pass result
+    dist = np.linalg.norm(cverts[:, np.newaxis] - verts[np.newaxis], axis=2)
+    match = dist.argmin(axis=1)
+    assert dist.min(axis=1).max() < 1e-4
+    assert len(np.unique(match)) == len(match)
+
+    def sortedFaces(f):
+        f = np.sort(f, axis=1)
+        return f[np.lexsort(f.T[::-1])]
+
+    np.testing.assert_array_equal(sortedFaces(match[cfaces]), sortedFaces(faces))
+
+@pytest.mark.parametrize("extendToEdge", [False, True])
+def test_isocurves(extendToEdge):
+    x, y = np.mgrid[-1:1:40j, -1:1:30j]
+    data = np.sin(5 * x) * np.cos(4 * y) + 0.3 * x
+    levels = [-0.5, 0.0, 0.25, 0.7]
+    segments = pg.isocurves(data, levels, extendToEdge=extendToEdge)
+    lines = pg.isocurves(data, levels, connected=True, extendToEdge=extendToEdge)
+    assert len(segments) == len(lines) == len(levels)
+
+    for level, segs, conn in zip(levels, segments, lines):
+        assert segs == pg.isocurve(data, level, extendToEdge=extendToEdge)
+
+        # every point interpolates to the level along a grid edge
+        pts = np.array(segs).reshape(-1, 2)
+        if not extendToEdge:
+            p = pts - 0.5
+            i0 = np.floor(p).astype(int)
+            frac = p - i0
+            onX = frac[:, 1] < 1e-9
+            v0 = data[i0[:, 0], i0[:, 1]]
+            v1 = np.where(onX, data[np.minimum(i0[:, 0] + 1, data.shape[0] - 1), i0[:, 1]],
+                          data[i0[:, 0], np.minimum(i0[:, 1] + 1, data.shape[1] - 1)])
+            f = np.where(onX, frac[:, 0], frac[:, 1])
+            np.testing.assert_allclose(v0 * (1 - f) + v1 * f, level, atol=1e-9)
+
+        # connected lines consist of exactly the same segments; points shared by
+        # neighboring cells may differ by rounding
+        def key(p):
+            return tuple(np.round(p, 9))
+        segSet = {frozenset((key(a), key(b))) for a, b in segs}
+        connSet = set()
+        for line in conn:
+            assert len(line) >= 2
+            for a, b in zip(line[:-1], line[1:]):
+                connSet.add(frozenset((key(a), key(b))))
+        assert len(connSet) == len(segs)
+        assert connSet == segSet
+
+def test_isocurves_loop():
+    x, y = np.mgrid[-1:1:25j, -1:1:25j]
+    data = np.exp(-(x**2 + y**2) * 4)
+    lines = pg.isocurves(data, [0.5], connected=True)[0]
+    assert len(lines) == 1
+    assert lines[0][0] == lines[0][-1]
+    path = pg.isocurves(data, [0.5], path=True)[0]
+    assert path.elementCount() == len(lines[0])
+    assert pg.isocurves(data, [2.0], path=True)[0].isEmpty()
+
+@pytest.mark.parametrize("order", [0, 1])
+@pytest.mark.parametrize("dtype", [np.float64, np.uint16])
+@pytest.mark.parametrize("shape, origin, vectors, axes", [
+    ((4, 5), (2, 3), ((1, 0), (0, 1)), (1, 2)),         # integer, in bounds
+    ((4, 5), (6, 7), ((-1, 0), (0, -1)), (1, 2)),       # reversed
+    ((3, 2), (1, 0), ((0, 2), (3, 0)), (0, 2)),         # strided, transposed
+    ((4, 5), (2.3, 3.6), ((1, 0), (0, 1)), (1, 2)),     # fractional origin
+    ((6, 4), (-1.5, 2.5), ((0.5, 0), (0, 1.5)), (1, 2)),  # scaled, partly outside
+    ((5,), (1.2, 4), ((1, 0),), (1, 2)),                # 1D line along one axis
+    ((5,), (3, 0.5), ((0, 1.2),), (0, 1)),
+])
+def test_affineSlice_aligned(monkeypatch, order, dtype, shape, origin, vectors, axes):
+    data = (np.random.random((8, 9, 10, 2)) * 1000).astype(dtype)
+    result, coords = pg.affineSlice(data, shape, origin, vectors, axes, order=order, returnCoords=True)
+
+    # compare against the general interpolation path
+    monkeypatch.setattr(pg.functions, '_affineSliceAligned', lambda *args: None)
+    expected, expectedCoords = pg.affineSlice(data, shape, origin, vectors, axes, order=order, returnCoords=True)
+    assert result.shape == expected.shape
+    assert result.dtype == expected.dtype
+    np.testing.assert_allclose(result, expected)
+    np.testing.assert_array_equal(coords, expectedCoords)
+
+def test_affineSlice_view():
+    data = np.random.random((8, 9, 10))
+    result = pg.affineSlice(data, (4, 3), (2, 3), ((1, 0), (0, 2)), (1, 2))
+    assert np.shares_memory(result, data)
+    np.testing.assert_array_equal(result, data[:, 2:6, 3:9:2])
+
+    # integer data interpolated linearly is returned as float
+    result = pg.affineSlice(data.astype(int), (4, 5), (2, 3), ((1, 0), (0, 1)), (1, 2))
+    assert result.dtype == np.float64
+
+def test_affineSliceCoords_cache():
+    vectors = ((0.8, 0.6), (-0.6, 0.8))
+    c1 = pg.affineSliceCoords((6, 4), (1, 2), vectors, (0, 1))
+    c2 = pg.affineSliceCoords((6, 4), (3, 5), vectors, (0, 1))
+    np.testing.assert_allclose(c2 - c1, np.broadcast_to(np.array([2, 3]).reshape(2, 1, 1), c1.shape))
+    grid = np.mgrid[0:6, 0:4]
+    expected = (grid[np.newaxis] * np.array(vectors).T[..., np.newaxis, np.newaxis]).sum(axis=1)
+    np.testing.assert_allclose(c1, expected + np.array([1, 2]).reshape(2, 1, 1))
+    # returned coordinates are independent of the cache
+    c1[:] = 0
+    np.testing.assert_allclose(pg.affineSliceCoords((6, 4), (3, 5), vectors, (0, 1)), c2)
+
+
+class _SlowCache(OrderedDict):
+    ## lets other threads run between looking up an entry and using it
+    def get(self, key, default=None):
+        value = OrderedDict.get(self, key, default)
+        time.sleep(0.001)
+        return value
+
+def test_affineSliceCoords_cache_threads(monkeypatch):
+    # the cache is shared by threads evicting each other's entries
+    monkeypatch.setattr(pg.functions, '_affineGridCache', _SlowCache())
+    monkeypatch.setattr(pg.functions, '_affineGridCacheSize', 2)
+    vectors = ((0.8, 0.6), (-0.6, 0.8))
+    shapes = [(3 + i, 2 + i % 3) for i in range(2 * pg.functions._affineGridCacheSize)]
+    expected = {shape: pg.affineSliceCoords(shape, (1, 2), vectors, (0, 1)) for shape in shapes}
+    errors = []
+
+    def work(offset):
+        try:
+            for i in range(50):
+                shape = shapes[(i + offset) % len(shapes)]
+                coords = pg.affineSliceCoords(shape, (1, 2), vectors, (0, 1))
+                np.testing.assert_allclose(coords, expected[shape])
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len(pg.functions._affineGridCache) <= pg.functions._affineGridCacheSize
+
+
+def test_simplifyPolyline():
+    ## points on a straight line reduce to the end points
+    x = np.linspace(0, 500, 10000)
+    np.testing.assert_array_equal(pg.simplifyPolyline(x, 2 * x + 1, tolerance=0.1), [0, 9999])
+
+    ## without tolerance, every pixel column keeps its first, last, lowest and highest point
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 50, 5000)
+    y = rng.normal(size=5000)
+    y[2000] = np.nan
+    inds = pg.simplifyPolyline(x, y, tolerance=0)
+    assert np.all(np.diff(inds) > 0)
+    assert 2000 in inds
+    cols = np.floor(x)
+    for c in range(50):
+        run = np.flatnonzero((cols == c) & np.isfinite(y))
+        kept = np.intersect1d(inds, run)
+        assert len(kept) <= 4
+        assert y[kept].max() == y[run].max() and y[kept].min() == y[run].min()
+
+    ## points outside of the visible range are dropped, except for their neighbours
+    inds = pg.simplifyPolyline(x[::-1], y[::-1], tolerance=0, xRange=(10, 20))
+    assert inds.min() == np.flatnonzero(x[::-1] <= 20)[0] - 1
+    assert inds.max() == np.flatnonzero(x[::-1] >= 10)[-1] + 1
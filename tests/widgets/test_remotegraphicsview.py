@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+import pyqtgraph as pg
+from pyqtgraph.Qt import QtCore, QtWidgets
+from pyqtgraph.widgets.RemoteGraphicsView import Renderer
+
+app = pg.mkQApp()
+
+
+def renderedFrame(renderer, frame):
+    w, h = frame['width'], frame['height']
+    data = np.frombuffer(renderer.shm, dtype=np.ubyte, count=w * h * 4, offset=frame['offset'])
+    return data.reshape(h, w, 4).copy()
+
+
+def makeRenderer(buffers):
+    renderer = Renderer(background='k', buffers=buffers)
+    frames = []
+    renderer.sceneRendered.connect(frames.append)
+    renderer.renderTimer.stop()
+    renderer.frameDisplayed(0)
+    renderer.resize(QtCore.QSize(400, 300))
+
+    big = QtWidgets.QGraphicsRectItem(50, 50, 200, 100)
+    big.setBrush(pg.mkBrush('g'))
+    cursor = QtWidgets.QGraphicsRectItem(10, 10, 5, 5)
+    cursor.setBrush(pg.mkBrush('r'))
+    renderer.scene().addItem(big)
+    renderer.scene().addItem(cursor)
+    return renderer, frames, big, cursor
+
+
+def render(renderer, frames, ack=True):
+    ## deliver scene changes, then render and acknowledge a frame
+    app.processEvents()
+    n = len(frames)
+    renderer.renderView()
+    if len(frames) == n:
+        return None
+    if ack:
+        renderer.frameDisplayed(frames[-1]['seq'])
+    return frames[-1]
+
+
+@pytest.mark.parametrize('buffers', [1, 2, 3])
+def test_Renderer_dirtyRegions(buffers):
+    renderer, frames, big, cursor = makeRenderer(buffers)
+    frame = render(renderer, frames)
+    assert frame['rects'] is None and frame['seq'] == 1
+    w, h = frame['width'], frame['height']
+
+    ## moving a small item renders only the rects around its old and new position
+    for i in range(4):
+        cursor.setPos(300 - 20 * i, 200)
+        frame = render(renderer, frames)
+        rects = frame['rects']
+        assert rects is not None and len(rects) > 0
+        assert sum(rw * rh for x, y, rw, rh in rects) < 0.05 * w * h
+        for x, y, rw, rh in rects:
+            assert 0 <= x and x + rw <= w and 0 <= y and y + rh <= h
+
+    ## the partially updated frame is identical to a full render
+    partial = renderedFrame(renderer, frame)
+    renderer.update()
+    frame = render(renderer, frames)
+    assert frame['rects'] is None
+    assert np.all(partial == renderedFrame(renderer, frame))
+
+    ## nothing is rendered when the scene did not change
+    assert render(renderer, frames) is None
+
+    ## large changes render the whole frame
+    big.setRect(0, 0, 400, 300)
+    assert render(renderer, frames)['rects'] is None
+    renderer.close()
+
+
+@pytest.mark.parametrize('buffers', [1, 2])
+def test_Renderer_buffers(buffers):
+    renderer, frames, big, cursor = makeRenderer(buffers)
+    render(renderer, frames)
+
+    ## frames are rendered into successive slots until all slots are in flight
+    for i in range(buffers + 2):
+        cursor.setPos(10 * i, 0)
+        render(renderer, frames, ack=False)
+    assert [f['seq'] for f in frames] == list(range(1, buffers + 2))
+    assert len(set(f['offset'] for f in frames[-buffers:])) == buffers
+    assert renderer.stalled == 1
+    assert frames[-1]['stalled'] == 0
+
+    ## acknowledging frees the slots
+    renderer.frameDisplayed(frames[-1]['seq'])
+    frame = render(renderer, frames)
+    assert frame['seq'] == buffers + 2
+    assert frame['stalled'] == 1
+    renderer.close()
+
+
+def test_Renderer_maxFrameRate():
+    renderer = Renderer(maxFrameRate=20)
+    assert renderer.renderTimer.interval() == 50
+    renderer.setMaxFrameRate(100)
+    assert renderer.renderTimer.interval() == 10
+    renderer.close()